@@ -6,11 +6,14 @@ import os
 from dotenv import load_dotenv
 from flask import Flask, request
 from flask_cors import CORS
+from flask_migrate import Migrate
 from werkzeug.middleware.proxy_fix import ProxyFix
 
 from backend.config import Config, get_config
 from backend.models.models import db
 from backend.routes import register_routes  # blueprints mounted under "/api"
+from backend.utils.json_provider import install_json_provider
+from backend.utils.settings import reset_settings_snapshot
 
 # Optional but handy during local/dev
 try:
@@ -20,6 +23,10 @@ except Exception:  # pragma: no cover
 
 load_dotenv()
 
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "migrations")
+
+migrate = Migrate()
+
 
 # ------------------------------- helpers ------------------------------------- #
 def _as_bool(val: str | None, default: bool = False) -> bool:
@@ -55,6 +62,9 @@ def create_app() -> Flask:
     # Load env-specific config
     app.config.from_object(get_config())
 
+    # Fast JSON (orjson) with native Decimal/date/Enum; JSON_PROVIDER=stdlib opts out
+    install_json_provider(app)
+
     # Keep the key present but unset (don’t force a host:port)
     app.config["SERVER_NAME"] = None
 
@@ -70,8 +80,13 @@ def create_app() -> Flask:
 
     # DB + routes
     db.init_app(app)
+    # `flask db upgrade` applies backend/migrations (batch mode for SQLite ALTERs)
+    migrate.init_app(app, db, directory=MIGRATIONS_DIR, render_as_batch=True)
     register_routes(app)  # blueprints define endpoints; mounted under "/api" inside
 
+    # Settings are read once per request (utils.settings.settings_snapshot)
+    app.teardown_request(reset_settings_snapshot)
+
     # Startup info + optional route print
     with app.app_context():
         print("[DB]", getattr(Config, "EFFECTIVE_DB_URL_SAFE", "<unknown>"))
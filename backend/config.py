@@ -89,6 +89,20 @@ class Config:
         "on",
     }
 
+    # PHEV daily trip lengths as JSON, e.g. '{"histogram": {"edges": [0, 10, 40,
+    # 120], "counts": [5, 12, 3]}}' (see utils.trips); unset -> fixed commute
+    PHEV_TRIP_DISTRIBUTION = os.getenv("PHEV_TRIP_DISTRIBUTION") or None
+
+    # EV/PHEV electricity: "flat" (el_price_ore_kwh) or "spot" (cheapest
+    # overnight hours from SPOT_PRICE_FILE, a CSV/Parquet year of hourly
+    # öre/kWh with timestamp + SE1..SE4 columns; see utils.spot_prices)
+    ENERGY_MODE = (os.getenv("ENERGY_MODE") or "flat").lower()
+    SPOT_PRICE_FILE = os.getenv("SPOT_PRICE_FILE") or None
+    SPOT_PRICE_ZONE = (os.getenv("SPOT_PRICE_ZONE") or "SE3").upper()
+
+    # JSON encoder: "fast" (orjson when installed) or "stdlib" (utils.json_provider)
+    JSON_PROVIDER = (os.getenv("JSON_PROVIDER") or "fast").lower()
+
     # Helpful for startup logs (password redacted)
     EFFECTIVE_DB_URL_SAFE = _safe_url(SQLALCHEMY_DATABASE_URI)
 
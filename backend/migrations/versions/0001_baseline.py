@@ -0,0 +1,257 @@
+"""Baseline schema
+
+Revision ID: 0001_baseline
+Revises: None
+Create Date: 2026-10-17 09:00:00
+
+Every table the app created with db.create_all() before migrations were
+introduced. Existing databases are stamped at this revision by
+tools/bootstrap_schema.py instead of running it.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0001_baseline"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "acc_info",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("person", sa.String(), nullable=False),
+        sa.Column("bank", sa.String(), nullable=True),
+        sa.Column("acc_number", sa.String(), nullable=True),
+        sa.Column("country", sa.String(), nullable=True),
+        sa.Column("value", sa.Numeric(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_table(
+        "app_settings",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("electricity_price_ore_kwh", sa.Integer(), nullable=False),
+        sa.Column(
+            "bensin_price_sek_litre", sa.Numeric(precision=10, scale=2), nullable=False
+        ),
+        sa.Column(
+            "diesel_price_sek_litre", sa.Numeric(precision=10, scale=2), nullable=False
+        ),
+        sa.Column("yearly_driving_km", sa.Integer(), nullable=False),
+        sa.Column("daily_commute_km", sa.Integer(), nullable=False),
+        sa.Column(
+            "tire_change_price_year", sa.Numeric(precision=10, scale=2), nullable=False
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_table(
+        "cars",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("model", sa.String(length=255), nullable=False),
+        sa.Column("year", sa.Integer(), nullable=False),
+        sa.Column("estimated_purchase_price", sa.Integer(), nullable=True),
+        sa.Column("summer_tires_price", sa.Integer(), nullable=True),
+        sa.Column("winter_tires_price", sa.Integer(), nullable=True),
+        sa.Column(
+            "tire_replacement_interval_years",
+            sa.Numeric(precision=4, scale=2),
+            nullable=True,
+        ),
+        sa.Column(
+            "consumption_kwh_per_100km", sa.Numeric(precision=6, scale=2), nullable=True
+        ),
+        sa.Column("consumption_l_per_100km", sa.Float(), nullable=True),
+        sa.Column(
+            "type_of_vehicle",
+            sa.Enum("EV", "Bensin", "Diesel", "PHEV", name="vehicle_type"),
+            server_default="EV",
+            nullable=False,
+        ),
+        sa.Column(
+            "battery_capacity_kwh", sa.Numeric(precision=6, scale=2), nullable=True
+        ),
+        sa.Column("acceleration_0_100", sa.Float(), nullable=True),
+        sa.Column("range_km", sa.Integer(), nullable=True),
+        sa.Column("driven_km", sa.Integer(), nullable=True),
+        sa.Column("battery_aviloo_score", sa.Integer(), nullable=True),
+        sa.Column("trunk_size_litre", sa.Integer(), nullable=True),
+        sa.Column("full_insurance_year", sa.Integer(), nullable=True),
+        sa.Column("half_insurance_year", sa.Integer(), nullable=True),
+        sa.Column("car_tax_year", sa.Integer(), nullable=True),
+        sa.Column("repairs_year", sa.Integer(), nullable=True),
+        sa.Column("body_style", sa.String(length=20), nullable=True),
+        sa.Column("eu_segment", sa.String(length=2), nullable=True),
+        sa.Column("suv_tier", sa.String(length=12), nullable=True),
+        sa.Column("dc_peak_kw", sa.Float(), nullable=True),
+        sa.Column("dc_time_min_10_80", sa.Float(), nullable=True),
+        sa.Column("dc_time_source", sa.Text(), nullable=True),
+        sa.Column("ac_onboard_kw", sa.Float(), nullable=True),
+        sa.Column("ac_time_h_0_100", sa.Float(), nullable=True),
+        sa.Column("ac_time_source", sa.Text(), nullable=True),
+        sa.Column("tco_3_years", sa.Numeric(precision=12, scale=2), nullable=True),
+        sa.Column("tco_5_years", sa.Numeric(precision=12, scale=2), nullable=True),
+        sa.Column("tco_8_years", sa.Numeric(precision=12, scale=2), nullable=True),
+        sa.Column("insurance_cost", sa.Numeric(precision=12, scale=2), nullable=True),
+        sa.Column("tire_cost", sa.Numeric(precision=12, scale=2), nullable=True),
+        sa.Column("car_tax", sa.Numeric(precision=12, scale=2), nullable=True),
+        sa.Column("consumption_cost", sa.Numeric(precision=12, scale=2), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    with op.batch_alter_table("cars", schema=None) as batch_op:
+        batch_op.create_index(
+            batch_op.f("ix_cars_body_style"), ["body_style"], unique=False
+        )
+        batch_op.create_index(
+            batch_op.f("ix_cars_eu_segment"), ["eu_segment"], unique=False
+        )
+        batch_op.create_index(
+            batch_op.f("ix_cars_suv_tier"), ["suv_tier"], unique=False
+        )
+
+    op.create_table(
+        "financing",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(length=100), nullable=False),
+        sa.Column("value", sa.Numeric(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_table(
+        "house_costs",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(length=128), nullable=False),
+        sa.Column("amount", sa.Numeric(), nullable=False),
+        sa.Column(
+            "status", sa.Enum("done", "todo", name="cost_status"), nullable=False
+        ),
+        sa.Column(
+            "created_at", sa.DateTime(), server_default=sa.func.now(), nullable=True
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_table(
+        "investments",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(length=128), nullable=False),
+        sa.Column("value", sa.Integer(), nullable=False),
+        sa.Column("paid", sa.Integer(), nullable=False),
+        sa.Column("rent", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_table(
+        "land_costs",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.Text(), nullable=False),
+        sa.Column("amount", sa.Numeric(), nullable=False),
+        sa.Column("status", sa.String(length=10), nullable=False),
+        sa.Column(
+            "created_at", sa.DateTime(), server_default=sa.func.now(), nullable=True
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_table(
+        "months",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(length=64), nullable=False),
+        sa.Column("starting_funds", sa.Numeric(), nullable=True),
+        sa.Column("ending_funds", sa.Numeric(), nullable=True),
+        sa.Column("surplus", sa.Numeric(), nullable=True),
+        sa.Column("loan_remaining", sa.Numeric(), nullable=True),
+        sa.Column("is_current", sa.Boolean(), nullable=True),
+        sa.Column("month_date", sa.Date(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_table(
+        "planned_purchases",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("item", sa.String(), nullable=False),
+        sa.Column("amount", sa.Float(), nullable=False),
+        sa.Column("date", sa.Date(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_table(
+        "price_settings",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("el_price_ore_kwh", sa.Float(), nullable=False),
+        sa.Column("diesel_price_sek_litre", sa.Float(), nullable=False),
+        sa.Column("bensin_price_sek_litre", sa.Float(), nullable=False),
+        sa.Column("yearly_km", sa.Integer(), nullable=False),
+        sa.Column("daily_commute_km", sa.Integer(), nullable=False),
+        sa.Column("downpayment_sek", sa.Float(), nullable=False),
+        sa.Column("interest_rate_pct", sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_table(
+        "expenses",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("category", sa.String(length=64), nullable=False),
+        sa.Column("month_id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.Text(), nullable=True),
+        sa.Column("amount", sa.Numeric(), nullable=False),
+        sa.Column(
+            "created_at", sa.DateTime(), server_default=sa.func.now(), nullable=True
+        ),
+        sa.ForeignKeyConstraint(
+            ["month_id"],
+            ["months.id"],
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_table(
+        "incomes",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("month_id", sa.Integer(), nullable=False),
+        sa.Column("source", sa.Text(), nullable=True),
+        sa.Column("amount", sa.Numeric(), nullable=False),
+        sa.Column(
+            "created_at", sa.DateTime(), server_default=sa.func.now(), nullable=True
+        ),
+        sa.ForeignKeyConstraint(
+            ["month_id"],
+            ["months.id"],
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_table(
+        "loan_adjustments",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("month_id", sa.Integer(), nullable=True),
+        sa.Column("name", sa.String(length=100), nullable=False),
+        sa.Column("type", sa.String(length=32), nullable=True),
+        sa.Column("amount", sa.Numeric(), nullable=True),
+        sa.Column("note", sa.String(length=128), nullable=True),
+        sa.ForeignKeyConstraint(
+            ["month_id"],
+            ["months.id"],
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+
+
+def downgrade():
+    op.drop_table("loan_adjustments")
+    op.drop_table("incomes")
+    op.drop_table("expenses")
+    op.drop_table("price_settings")
+    op.drop_table("planned_purchases")
+    op.drop_table("months")
+    op.drop_table("land_costs")
+    op.drop_table("investments")
+    op.drop_table("house_costs")
+    op.drop_table("financing")
+    with op.batch_alter_table("cars", schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f("ix_cars_suv_tier"))
+        batch_op.drop_index(batch_op.f("ix_cars_eu_segment"))
+        batch_op.drop_index(batch_op.f("ix_cars_body_style"))
+
+    op.drop_table("cars")
+    op.drop_table("app_settings")
+    op.drop_table("acc_info")
+    # Postgres keeps native enum types after their tables are dropped
+    bind = op.get_bind()
+    sa.Enum(name="vehicle_type").drop(bind, checkfirst=True)
+    sa.Enum(name="cost_status").drop(bind, checkfirst=True)
@@ -0,0 +1,52 @@
+"""Data versions and TCO jobs
+
+Revision ID: 0002_versions_and_jobs
+Revises: 0001_baseline
+Create Date: 2026-10-17 09:01:00
+
+data_versions: per-dataset counters the response caches key on.
+tco_jobs: background recompute of the persisted Car.tco_* columns.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0002_versions_and_jobs"
+down_revision = "0001_baseline"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "data_versions",
+        sa.Column("key", sa.String(length=64), nullable=False),
+        sa.Column("version", sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint("key"),
+    )
+    op.create_table(
+        "tco_jobs",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("status", sa.String(length=16), nullable=False),
+        sa.Column("prices_version", sa.BigInteger(), nullable=False),
+        sa.Column("total", sa.Integer(), nullable=False),
+        sa.Column("done", sa.Integer(), nullable=False),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("started_at", sa.DateTime(), nullable=True),
+        sa.Column("finished_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    with op.batch_alter_table("tco_jobs", schema=None) as batch_op:
+        batch_op.create_index(
+            batch_op.f("ix_tco_jobs_status"), ["status"], unique=False
+        )
+
+
+def downgrade():
+    with op.batch_alter_table("tco_jobs", schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f("ix_tco_jobs_status"))
+
+    op.drop_table("tco_jobs")
+    op.drop_table("data_versions")
@@ -0,0 +1,67 @@
+"""Scheduled loans
+
+Revision ID: 0003_loans
+Revises: 0002_versions_and_jobs
+Create Date: 2026-10-17 09:02:00
+
+loans and loan_rate_resets for utils.loans, plus loan_adjustments.loan_id
+linking an adjustment to the loan it pays down or draws on.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0003_loans"
+down_revision = "0002_versions_and_jobs"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "loans",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(length=100), nullable=False),
+        sa.Column("principal", sa.Numeric(), nullable=False),
+        sa.Column("start_date", sa.Date(), nullable=False),
+        sa.Column("rate_pct", sa.Numeric(precision=6, scale=3), nullable=False),
+        sa.Column("property_value", sa.Numeric(), nullable=True),
+        sa.Column("amortization_monthly", sa.Numeric(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_table(
+        "loan_rate_resets",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("loan_id", sa.Integer(), nullable=False),
+        sa.Column("effective_date", sa.Date(), nullable=False),
+        sa.Column("rate_pct", sa.Numeric(precision=6, scale=3), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["loan_id"],
+            ["loans.id"],
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    with op.batch_alter_table("loan_rate_resets", schema=None) as batch_op:
+        batch_op.create_index(
+            batch_op.f("ix_loan_rate_resets_loan_id"), ["loan_id"], unique=False
+        )
+
+    with op.batch_alter_table("loan_adjustments", schema=None) as batch_op:
+        batch_op.add_column(sa.Column("loan_id", sa.Integer(), nullable=True))
+        batch_op.create_foreign_key(
+            "fk_loan_adjustments_loan_id", "loans", ["loan_id"], ["id"]
+        )
+
+
+def downgrade():
+    with op.batch_alter_table("loan_adjustments", schema=None) as batch_op:
+        batch_op.drop_constraint("fk_loan_adjustments_loan_id", type_="foreignkey")
+        batch_op.drop_column("loan_id")
+
+    with op.batch_alter_table("loan_rate_resets", schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f("ix_loan_rate_resets_loan_id"))
+
+    op.drop_table("loan_rate_resets")
+    op.drop_table("loans")
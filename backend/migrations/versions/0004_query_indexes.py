@@ -0,0 +1,108 @@
+"""Indexes for the ledger queries and upsert keys
+
+Revision ID: 0004_query_indexes
+Revises: 0003_loans
+Create Date: 2026-10-17 09:03:00
+
+Composite indexes matching the hot query shapes:
+
+- months(month_date, id): MONTH_ORDER and the month_date window filters
+- incomes(month_id, source), expenses(month_id, category): per-month GROUP BY
+  sums and the analytics pivots (the leading month_id also serves the joins)
+- loan_adjustments(month_id, type), loan_adjustments(loan_id)
+
+Unique keys for the upserts: financing(name), acc_info(person, bank,
+acc_number, country) and loan_rate_resets(loan_id, effective_date), which
+replaces the plain loan_id index.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0004_query_indexes"
+down_revision = "0003_loans"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Unique keys the upserts rely on; drop duplicates first (newest wins for
+    # financing values and rate resets, the first row for accounts). UNIQUE
+    # treats NULLs as distinct, so accounts with a NULL key column are kept.
+    op.execute(
+        "DELETE FROM financing WHERE id NOT IN "
+        "(SELECT MAX(id) FROM financing GROUP BY name)"
+    )
+    account_key = "bank IS NOT NULL AND acc_number IS NOT NULL AND country IS NOT NULL"
+    op.execute(
+        f"DELETE FROM acc_info WHERE {account_key} AND id NOT IN "
+        f"(SELECT MIN(id) FROM acc_info WHERE {account_key} "
+        "GROUP BY person, bank, acc_number, country)"
+    )
+    op.execute(
+        "DELETE FROM loan_rate_resets WHERE id NOT IN "
+        "(SELECT MAX(id) FROM loan_rate_resets GROUP BY loan_id, effective_date)"
+    )
+
+    with op.batch_alter_table("acc_info", schema=None) as batch_op:
+        batch_op.create_unique_constraint(
+            "uq_acc_info_account", ["person", "bank", "acc_number", "country"]
+        )
+
+    with op.batch_alter_table("expenses", schema=None) as batch_op:
+        batch_op.create_index(
+            "ix_expenses_month_id_category", ["month_id", "category"], unique=False
+        )
+
+    with op.batch_alter_table("financing", schema=None) as batch_op:
+        batch_op.create_unique_constraint("uq_financing_name", ["name"])
+
+    with op.batch_alter_table("incomes", schema=None) as batch_op:
+        batch_op.create_index(
+            "ix_incomes_month_id_source", ["month_id", "source"], unique=False
+        )
+
+    with op.batch_alter_table("loan_adjustments", schema=None) as batch_op:
+        batch_op.create_index("ix_loan_adjustments_loan_id", ["loan_id"], unique=False)
+        batch_op.create_index(
+            "ix_loan_adjustments_month_id_type", ["month_id", "type"], unique=False
+        )
+
+    with op.batch_alter_table("loan_rate_resets", schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f("ix_loan_rate_resets_loan_id"))
+        batch_op.create_unique_constraint(
+            "uq_loan_rate_resets_loan_id_date", ["loan_id", "effective_date"]
+        )
+
+    with op.batch_alter_table("months", schema=None) as batch_op:
+        batch_op.create_index(
+            "ix_months_month_date_id", ["month_date", "id"], unique=False
+        )
+
+
+def downgrade():
+    with op.batch_alter_table("months", schema=None) as batch_op:
+        batch_op.drop_index("ix_months_month_date_id")
+
+    with op.batch_alter_table("loan_rate_resets", schema=None) as batch_op:
+        batch_op.drop_constraint("uq_loan_rate_resets_loan_id_date", type_="unique")
+        batch_op.create_index(
+            batch_op.f("ix_loan_rate_resets_loan_id"), ["loan_id"], unique=False
+        )
+
+    with op.batch_alter_table("loan_adjustments", schema=None) as batch_op:
+        batch_op.drop_index("ix_loan_adjustments_month_id_type")
+        batch_op.drop_index("ix_loan_adjustments_loan_id")
+
+    with op.batch_alter_table("incomes", schema=None) as batch_op:
+        batch_op.drop_index("ix_incomes_month_id_source")
+
+    with op.batch_alter_table("financing", schema=None) as batch_op:
+        batch_op.drop_constraint("uq_financing_name", type_="unique")
+
+    with op.batch_alter_table("expenses", schema=None) as batch_op:
+        batch_op.drop_index("ix_expenses_month_id_category")
+
+    with op.batch_alter_table("acc_info", schema=None) as batch_op:
+        batch_op.drop_constraint("uq_acc_info_account", type_="unique")
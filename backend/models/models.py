@@ -28,6 +28,8 @@ def _as_float(v):
 # =============================== Core ===============================
 class Month(db.Model):
     __tablename__ = "months"
+    # MONTH_ORDER (month_date, id) and the month_date window filters
+    __table_args__ = (db.Index("ix_months_month_date_id", "month_date", "id"),)
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(64), nullable=False)
     starting_funds = db.Column(db.Numeric, default=0)
@@ -57,6 +59,8 @@ class Month(db.Model):
 
 class Income(db.Model):
     __tablename__ = "incomes"
+    # per-month sums, optionally grouped by source
+    __table_args__ = (db.Index("ix_incomes_month_id_source", "month_id", "source"),)
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String, nullable=False)
     month_id = db.Column(db.Integer, db.ForeignKey("months.id"), nullable=False)
@@ -75,6 +79,10 @@ class Income(db.Model):
 
 class Expense(db.Model):
     __tablename__ = "expenses"
+    # per-month sums, optionally grouped by category
+    __table_args__ = (
+        db.Index("ix_expenses_month_id_category", "month_id", "category"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     category = db.Column(db.String(64), nullable=False)
@@ -87,12 +95,22 @@ class Expense(db.Model):
 
 class LoanAdjustment(db.Model):
     __tablename__ = "loan_adjustments"
+    __table_args__ = (
+        db.Index("ix_loan_adjustments_month_id_type", "month_id", "type"),
+        db.Index("ix_loan_adjustments_loan_id", "loan_id"),
+    )
     id = db.Column(db.Integer, primary_key=True)
     month_id = db.Column(db.Integer, db.ForeignKey("months.id"))
     name = db.Column(db.String(100), nullable=False)
     type = db.Column(db.String(32))
     amount = db.Column(db.Numeric)
     note = db.Column(db.String(128))
+    # Set: an extra payment / disbursement on a scheduled Loan (utils.loans)
+    loan_id = db.Column(
+        db.Integer,
+        db.ForeignKey("loans.id", name="fk_loan_adjustments_loan_id"),
+        nullable=True,
+    )
 
     def to_dict(self):
         return {
@@ -101,6 +119,67 @@ class LoanAdjustment(db.Model):
             "type": self.type,
             "amount": float(self.amount or 0),
             "note": self.note,
+            "loan_id": self.loan_id,
+        }
+
+
+class Loan(db.Model):
+    """A mortgage/loan amortized month by month by utils.loans.schedule()."""
+
+    __tablename__ = "loans"
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), nullable=False)
+    principal = db.Column(db.Numeric, nullable=False)
+    start_date = db.Column(db.Date, nullable=False)  # disbursed; pays from next month
+    rate_pct = db.Column(db.Numeric(6, 3), nullable=False, default=0)  # nominal/year
+    # LTV basis for the Swedish amortization requirement (None: no requirement)
+    property_value = db.Column(db.Numeric)
+    # Fixed monthly amortization; the requirement still applies as a floor
+    amortization_monthly = db.Column(db.Numeric)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    rate_resets = db.relationship(
+        "LoanRateReset",
+        backref="loan",
+        lazy=True,
+        cascade="all, delete-orphan",
+        order_by="LoanRateReset.effective_date",
+    )
+    adjustments = db.relationship("LoanAdjustment", backref="loan", lazy=True)
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "name": self.name,
+            "principal": float(self.principal or 0),
+            "start_date": self.start_date.isoformat() if self.start_date else None,
+            "rate_pct": float(self.rate_pct or 0),
+            "property_value": _as_float(self.property_value),
+            "amortization_monthly": _as_float(self.amortization_monthly),
+            "rate_resets": [r.to_dict() for r in self.rate_resets],
+        }
+
+
+class LoanRateReset(db.Model):
+    """New nominal rate from effective_date on (end of a fixed-rate period)."""
+
+    __tablename__ = "loan_rate_resets"
+    # one rate per loan and date: POST .../resets upserts on it
+    __table_args__ = (
+        db.UniqueConstraint(
+            "loan_id", "effective_date", name="uq_loan_rate_resets_loan_id_date"
+        ),
+    )
+    id = db.Column(db.Integer, primary_key=True)
+    loan_id = db.Column(db.Integer, db.ForeignKey("loans.id"), nullable=False)
+    effective_date = db.Column(db.Date, nullable=False)
+    rate_pct = db.Column(db.Numeric(6, 3), nullable=False)
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "effective_date": self.effective_date.isoformat(),
+            "rate_pct": float(self.rate_pct),
         }
 
 
@@ -153,6 +232,12 @@ class Investment(db.Model):
 
 class AccInfo(db.Model):
     __tablename__ = "acc_info"
+    # natural key of the bulk insert's "already exists" check
+    __table_args__ = (
+        db.UniqueConstraint(
+            "person", "bank", "acc_number", "country", name="uq_acc_info_account"
+        ),
+    )
     id = db.Column(db.Integer, primary_key=True)
     person = db.Column(db.String, nullable=False)
     bank = db.Column(db.String)
@@ -163,6 +248,8 @@ class AccInfo(db.Model):
 
 class Financing(db.Model):
     __tablename__ = "financing"
+    # POST /api/financing upserts by name
+    __table_args__ = (db.UniqueConstraint("name", name="uq_financing_name"),)
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
     value = db.Column(db.Numeric, nullable=False)
@@ -293,11 +380,10 @@ class Car(db.Model):
         try:
             change_fee = tire_change_price_year
             if change_fee is None:
-                # Safe fallback: read AppSettings(1) if present; otherwise 0
-                app = AppSettings.query.get(1)
-                change_fee = (
-                    Decimal(str(app.tire_change_price_year or 0)) if app else Decimal(0)
-                )
+                # Safe fallback: the request's settings snapshot (loaded once)
+                from backend.utils.settings import settings_snapshot
+
+                change_fee = settings_snapshot().tire_change_price_year
             d["tires_year_effective"] = float(
                 self.annual_tire_cost(Decimal(str(change_fee or 0)))
             )
@@ -352,3 +438,43 @@ class AppSettings(db.Model):
             db.session.add(inst)
             db.session.commit()
         return inst
+
+
+# ============================ Versions =============================
+class DataVersion(db.Model):
+    """Monotonic per-dataset counters; writers bump them, caches key on them."""
+
+    __tablename__ = "data_versions"
+    key = db.Column(db.String(64), primary_key=True)  # e.g. 'cars', 'prices'
+    version = db.Column(db.BigInteger, nullable=False, default=0)
+
+
+# ============================ Jobs =============================
+class TcoJob(db.Model):
+    """Background recompute of the persisted Car.tco_* columns (one generation)."""
+
+    __tablename__ = "tco_jobs"
+    id = db.Column(db.Integer, primary_key=True)
+    # queued -> running -> done | failed | superseded
+    status = db.Column(db.String(16), nullable=False, default="queued", index=True)
+    prices_version = db.Column(db.BigInteger, nullable=False, default=0)
+    total = db.Column(db.Integer, nullable=False, default=0)
+    done = db.Column(db.Integer, nullable=False, default=0)
+    error = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "status": self.status,
+            "prices_version": self.prices_version,
+            "total": self.total,
+            "done": self.done,
+            "progress": round(self.done / self.total, 4) if self.total else 0.0,
+            "error": self.error,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+        }
@@ -3,15 +3,18 @@ from backend.routes.cars import cars_bp
 from backend.routes.debug import debug_bp
 
 from .acc_info import acc_info_bp
+from .analytics import analytics_bp
 from .expenses import expenses_bp
 from .file_upload_routes import file_upload_bp
 from .financing import financing_bp
+from .forecast import forecast_bp
 from .health import health_bp
 from .house import house_bp
 from .incomes import incomes_bp
 from .investments import investments_bp
 from .loans import loans_bp
 from .months import months_bp
+from .mortgages import mortgages_bp
 from .my_new_tab import my_new_tab_bp
 from .planned_purchases import planned_purchases_bp
 from .settings import settings_bp
@@ -22,7 +25,10 @@ def register_routes(app):
     app.register_blueprint(months_bp)
     app.register_blueprint(incomes_bp)
     app.register_blueprint(expenses_bp)
+    app.register_blueprint(analytics_bp)
+    app.register_blueprint(forecast_bp)
     app.register_blueprint(loans_bp)
+    app.register_blueprint(mortgages_bp)
     app.register_blueprint(house_bp)
     app.register_blueprint(acc_info_bp)
     app.register_blueprint(financing_bp)
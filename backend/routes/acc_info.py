@@ -2,10 +2,26 @@
 from flask import Blueprint, current_app, jsonify, request
 
 from backend.models.models import AccInfo, db
+from backend.utils.pagination import ListQuery, ListSpec, SortKey
 
 # Final paths: /api/acc_info/...
 acc_info_bp = Blueprint("acc_info", __name__, url_prefix="/api/acc_info")
 
+ACC_INFO_LIST = ListSpec(
+    AccInfo,
+    sort_keys={
+        "id": SortKey(AccInfo.id),
+        "person": SortKey(AccInfo.person),
+        "bank": SortKey(AccInfo.bank, ""),
+        "value": SortKey(AccInfo.value, 0),
+    },
+    filters={
+        "person": AccInfo.person,
+        "bank": AccInfo.bank,
+        "country": AccInfo.country,
+    },
+)
+
 
 def _to_float(v, default=0.0):
     try:
@@ -15,33 +31,41 @@ def _to_float(v, default=0.0):
         return float(default)
 
 
+def _acc_info_row(r: AccInfo) -> dict:
+    return {
+        "id": r.id,
+        "person": r.person,
+        "bank": r.bank,
+        "acc_number": r.acc_number,
+        "country": r.country,
+        # return as string to match prior API, but always defined
+        "value": str(r.value) if r.value is not None else "0",
+    }
+
+
 @acc_info_bp.get("")
 @acc_info_bp.get("/")
 def list_acc_info():
     """
-    Return all account info rows.
+    Return account info rows. Filters: person, bank, country (comma lists);
+    sort=[-]key; limit/cursor/total switch to a keyset page envelope
+    (see utils.pagination).
     Be resilient in CI: if the table isn't created yet, return an empty list (200).
     """
     try:
-        rows = AccInfo.query.order_by(AccInfo.id.asc()).all()
-        data = [
-            {
-                "id": r.id,
-                "person": r.person,
-                "bank": r.bank,
-                "acc_number": r.acc_number,
-                "country": r.country,
-                # return as string to match prior API, but always defined
-                "value": str(r.value) if r.value is not None else "0",
-            }
-            for r in rows
-        ]
-        return jsonify(data), 200
+        lq = ListQuery.from_args(request.args, ACC_INFO_LIST)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    try:
+        return jsonify(lq.payload(_acc_info_row)), 200
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         current_app.logger.warning(
             "GET /api/acc_info failed, returning empty list: %s", e
         )
-        return jsonify([]), 200
+        db.session.rollback()
+        return jsonify(lq.empty()), 200
 
 
 @acc_info_bp.post("/value")
@@ -0,0 +1,187 @@
+# backend/routes/analytics.py
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date
+from typing import Any
+
+from flask import Blueprint, current_app, jsonify, request
+from sqlalchemy import func
+
+from backend.models.models import Month, db
+from backend.utils.analytics import (
+    LEDGERS,
+    add_months,
+    ledger_sums,
+    lookback_months,
+    month_pivot,
+)
+from backend.utils.versions import get_versions
+
+analytics_bp = Blueprint("analytics", __name__, url_prefix="/api/analytics")
+
+MAX_ROLLING = 24
+MAX_ENTRIES = 32
+
+_lock = threading.Lock()
+_entries: OrderedDict[str, bytes] = OrderedDict()
+
+_TRUE = {"1", "true", "yes", "on"}
+
+
+def _ym(raw: str | None, name: str) -> date | None:
+    if not raw:
+        return None
+    try:
+        s = str(raw).strip()
+        return date(int(s[0:4]), int(s[5:7]), 1)
+    except (ValueError, IndexError):
+        raise ValueError(f"{name} must be YYYY-MM") from None
+
+
+@dataclass(frozen=True)
+class PivotArgs:
+    kind: str
+    by: str
+    start: date | None
+    end: date | None
+    keys: tuple[str, ...]
+    rolling: int | None
+    yoy: bool
+
+    @classmethod
+    def from_args(cls, kind: str, args) -> PivotArgs:
+        """Raises ValueError on malformed parameters."""
+        dims = LEDGERS[kind][1]
+        by = (args.get("by") or next(iter(dims))).strip().lower()
+        if by not in dims:
+            raise ValueError(f"by must be one of: {', '.join(dims)}")
+        start, end = _ym(args.get("from"), "from"), _ym(args.get("to"), "to")
+        if start and end and end < start:
+            raise ValueError("to must not be before from")
+        rolling = None
+        if args.get("rolling"):
+            try:
+                rolling = int(args["rolling"])
+            except ValueError:
+                rolling = 0
+            if not 2 <= rolling <= MAX_ROLLING:
+                raise ValueError(f"rolling must be 2..{MAX_ROLLING}")
+        keys = tuple(
+            sorted(
+                {k.strip() for k in (args.get("keys") or "").split(",") if k.strip()}
+            )
+        )
+        yoy = str(args.get("yoy") or "").strip().lower() in _TRUE
+        return cls(kind, by, start, end, keys, rolling, yoy)
+
+
+def _etag(pa: PivotArgs) -> str | None:
+    """
+    Keyed by the ledger's data version, a cheap (count, max id) fingerprint of
+    the ledger and months tables (catches seeds/imports) and the parameters.
+    None when versions are unavailable (no caching).
+    """
+    versions = get_versions(pa.kind)
+    if versions is None:
+        return None
+    model = LEDGERS[pa.kind][0]
+    try:
+        ledger = db.session.query(func.count(model.id), func.max(model.id)).one()
+        months = db.session.query(func.count(Month.id), func.max(Month.id)).one()
+    except Exception:
+        db.session.rollback()
+        return None
+    key = repr((versions, tuple(ledger), tuple(months), pa))
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+
+def _cache_get(etag: str) -> bytes | None:
+    with _lock:
+        body = _entries.get(etag)
+        if body is not None:
+            _entries.move_to_end(etag)
+        return body
+
+
+def _cache_put(etag: str, body: bytes) -> None:
+    with _lock:
+        _entries[etag] = body
+        _entries.move_to_end(etag)
+        while len(_entries) > MAX_ENTRIES:
+            _entries.popitem(last=False)
+
+
+def build_pivot(pa: PivotArgs) -> dict[str, Any]:
+    lookback = lookback_months(pa.rolling, pa.yoy)
+    months, rows = ledger_sums(
+        pa.kind,
+        pa.by,
+        start=add_months(pa.start, -lookback) if pa.start else None,
+        before=add_months(pa.end, 1) if pa.end else None,
+        keys=pa.keys,
+    )
+    pivot = month_pivot(
+        months,
+        rows,
+        start=pa.start,
+        end=pa.end,
+        rolling=pa.rolling,
+        yoy=pa.yoy,
+        null_key=LEDGERS[pa.kind][2],
+    )
+    return {"kind": pa.kind, "by": pa.by, "rolling": pa.rolling, **pivot}
+
+
+def _pivot_response(kind: str):
+    try:
+        pa = PivotArgs.from_args(kind, request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    etag = _etag(pa)
+    if etag is not None:
+        if etag in request.if_none_match:
+            resp = current_app.response_class(status=304)
+            return _with_etag(resp, etag), 304
+        body = _cache_get(etag)
+        if body is not None:
+            resp = current_app.response_class(body, mimetype="application/json")
+            return _with_etag(resp, etag), 200
+
+    try:
+        resp = jsonify(build_pivot(pa))
+    except Exception as e:
+        current_app.logger.warning("GET /api/analytics/%s failed: %s", kind, e)
+        db.session.rollback()
+        return jsonify({"error": "Internal Server Error"}), 500
+    if etag is not None:
+        _cache_put(etag, resp.get_data())
+        _with_etag(resp, etag)
+    return resp, 200
+
+
+def _with_etag(resp, etag: str):
+    resp.set_etag(etag)
+    resp.headers["Cache-Control"] = "no-cache"
+    return resp
+
+
+@analytics_bp.get("/expenses/pivot")
+def expense_pivot():
+    """
+    Category × month sums of Expense.amount.
+    Query: from/to (YYYY-MM, inclusive), keys (comma list of categories),
+    rolling (2..24 month rolling mean), yoy=1 (delta vs 12 months earlier).
+    Cached per 'expenses' data version with a strong ETag.
+    """
+    return _pivot_response("expenses")
+
+
+@analytics_bp.get("/incomes/pivot")
+def income_pivot():
+    """Source (or by=name) × month sums of Income.amount; same query as above."""
+    return _pivot_response("incomes")
@@ -0,0 +1,66 @@
+# batch.py
+from __future__ import annotations
+
+from collections.abc import Sequence
+from typing import Any
+
+from backend.models.models import PriceSettings
+from backend.utils.tco_kernel import HORIZONS, derive_arrays, load_columns, round2
+
+from .pricing import normalize_prices
+
+
+# ---------- public ----------
+def compute_derived_batch(
+    cars: Sequence[Any], ps: PriceSettings | None
+) -> list[dict[str, float]]:
+    """
+    The kernel's outputs for a whole list of cars, rounded and keyed the way the
+    /api/cars payload has always been (serialize.compute_derived is this on one car).
+    """
+    if not cars:
+        return []
+
+    arrs = derive_arrays(load_columns(cars), normalize_prices(ps))
+    energy = arrs["energy_fuel_year"]
+    tco = {y: arrs[f"tco_total_{y}y"] for y in HORIZONS}
+
+    # Column order == key order of serialize.compute_derived
+    columns: dict[str, list[float]] = {
+        "energy_fuel_year": round2(energy),
+        "energy_cost_month": round2(energy / 12.0),
+        "recurring_year": round2(arrs["recurring_year"]),
+    }
+    for y in HORIZONS:
+        columns[f"expected_value_after_{y}y"] = round2(
+            arrs[f"expected_value_after_{y}y"]
+        )
+    for y in HORIZONS:
+        columns[f"interest_{y}y"] = round2(arrs[f"interest_{y}y"])
+    rounded_tco = {y: round2(tco[y]) for y in HORIZONS}
+    for y in HORIZONS:
+        columns[f"tco_total_{y}y"] = rounded_tco[y]
+    # back-compat aliases
+    for y in HORIZONS:
+        columns[f"tco_{y}_years"] = rounded_tco[y]
+    for y in HORIZONS:
+        columns[f"tco_per_month_{y}y"] = round2(tco[y] / (y * 12.0))
+
+    keys = tuple(columns)
+    return [
+        dict(zip(keys, vals, strict=True))
+        for vals in zip(*columns.values(), strict=True)
+    ]
+
+
+def compute_tco_batch(
+    cars: Sequence[Any], ps: PriceSettings | None
+) -> dict[str, list[float]]:
+    """
+    Just the persisted totals (tco_3_years/5/8, rounded like compute_derived),
+    as one list per column aligned with `cars`.
+    """
+    if not cars:
+        return {f"tco_{y}_years": [] for y in HORIZONS}
+    arrs = derive_arrays(load_columns(cars), normalize_prices(ps))
+    return {f"tco_{y}_years": round2(arrs[f"tco_total_{y}y"]) for y in HORIZONS}
@@ -0,0 +1,145 @@
+# bulk.py
+from __future__ import annotations
+
+from collections.abc import Iterator, Sequence
+from types import SimpleNamespace
+from typing import Any
+
+from flask import current_app
+from sqlalchemy import select, update
+
+from backend.models.models import Car, PriceSettings, db
+from backend.utils.tco_kernel import NUMERIC_FIELDS
+
+from .batch import compute_tco_batch
+
+# Rows per IN (...) lookup and per executemany UPDATE batch
+BULK_CHUNK = 1000
+
+TEXT_FIELDS = (
+    "body_style",
+    "eu_segment",
+    "suv_tier",
+    "dc_time_source",
+    "ac_time_source",
+)
+FLOAT_FIELDS = (
+    "consumption_l_per_100km",
+    "estimated_purchase_price",
+    "summer_tires_price",
+    "winter_tires_price",
+    "acceleration_0_100",
+    "battery_capacity_kwh",
+    "trunk_size_litre",
+    "full_insurance_year",
+    "half_insurance_year",
+    "car_tax_year",
+    "repairs_year",
+    "dc_peak_kw",
+    "dc_time_min_10_80",
+    "ac_onboard_kw",
+    "ac_time_h_0_100",
+)
+
+# Columns the TCO model reads; the only ones we need to load
+_TCO_INPUTS = ("id", "type_of_vehicle", *NUMERIC_FIELDS)
+
+
+def _chunks(seq: Sequence[Any], size: int = BULK_CHUNK) -> Iterator[Sequence[Any]]:
+    for i in range(0, len(seq), size):
+        yield seq[i : i + size]
+
+
+def _load_tco_inputs(ids: list[int] | None) -> dict[int, dict[str, Any]]:
+    """TCO input columns keyed by id: one IN query per chunk (or one scan for all)."""
+    cols = [Car.__table__.c[name] for name in _TCO_INPUTS]
+    if ids is None:
+        rows = db.session.execute(select(*cols)).mappings().all()
+    else:
+        rows = []
+        for chunk in _chunks(ids):
+            stmt = select(*cols).where(Car.id.in_(chunk))
+            rows.extend(db.session.execute(stmt).mappings().all())
+    return {r["id"]: dict(r) for r in rows}
+
+
+def _coerce(p: dict[str, Any]) -> dict[str, Any]:
+    """Payload item -> column values, with the same coercions update_cars always had."""
+    vals: dict[str, Any] = {}
+    if p.get("model"):
+        vals["model"] = p["model"]
+    if p.get("year") is not None:
+        vals["year"] = int(p["year"])
+    if p.get("type_of_vehicle"):
+        vals["type_of_vehicle"] = p["type_of_vehicle"]
+    for k in TEXT_FIELDS:
+        if p.get(k):
+            vals[k] = p[k]
+
+    # consumption: accept either key
+    if "consumption_kwh_100km" in p or "consumption_kwh_per_100km" in p:
+        raw = p.get("consumption_kwh_100km", p.get("consumption_kwh_per_100km"))
+        vals["consumption_kwh_per_100km"] = float(raw or 0)
+    for k in FLOAT_FIELDS:
+        if k in p:
+            vals[k] = float(p[k] or 0)
+
+    if "range_km" in p:
+        vals["range_km"] = int(p["range_km"] or 0)
+    return vals
+
+
+def _payload_id(p: Any) -> int | None:
+    try:
+        return int(p.get("id"))
+    except Exception:
+        return None
+
+
+def bulk_update_cars(
+    payload: list[dict[str, Any]] | None, ps: PriceSettings | None
+) -> int:
+    """
+    Apply `payload` field updates and re-persist TCO totals, set-based:
+      1) load the targets' TCO inputs in chunked IN queries (no per-car SELECT),
+      2) apply coercions in memory,
+      3) price every touched car in one batch pass,
+      4) write back with chunked executemany UPDATEs.
+    `payload=None` recomputes TCO for every car. Returns the number of items applied.
+    Does not commit.
+    """
+    if payload is None:
+        rows = _load_tco_inputs(None)
+        changes: dict[int, dict[str, Any]] = {cid: {} for cid in rows}
+        updated = len(rows)
+    else:
+        items = [(_payload_id(p), p) for p in payload if isinstance(p, dict)]
+        rows = _load_tco_inputs(sorted({cid for cid, _ in items if cid is not None}))
+        changes = {}
+        updated = 0
+        for cid, p in items:
+            row = rows.get(cid)
+            if row is None:
+                continue
+            vals = _coerce(p)
+            row.update((k, v) for k, v in vals.items() if k in row)
+            changes.setdefault(cid, {}).update(vals)
+            updated += 1
+
+    if not changes:
+        return 0
+
+    # recompute & persist TCO totals using current settings (financing-aware)
+    ids = list(changes)
+    try:
+        tco = compute_tco_batch([SimpleNamespace(**rows[i]) for i in ids], ps)
+        for col, values in tco.items():
+            for cid, v in zip(ids, values, strict=True):
+                changes[cid][col] = v
+    except Exception as e:
+        current_app.logger.warning("persist TCO failed (bulk): %s", e)
+
+    params = [{"id": cid, **vals} for cid, vals in changes.items() if vals]
+    for chunk in _chunks(params):
+        db.session.execute(update(Car), list(chunk))
+    return updated
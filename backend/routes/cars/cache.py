@@ -0,0 +1,66 @@
+# cache.py
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import OrderedDict
+
+from sqlalchemy import func
+
+from backend.models.models import Car, PriceSettings, db
+from backend.utils.spot_prices import configured_spot_profile
+from backend.utils.trips import configured_trip_distribution
+from backend.utils.versions import get_versions
+
+MAX_ENTRIES = 16
+
+_lock = threading.Lock()
+_entries: OrderedDict[str, bytes] = OrderedDict()
+
+
+def cars_list_etag(ps: PriceSettings | None, variant: str = "") -> str | None:
+    """
+    Strong validator for the serialized car list.
+    Keyed by the 'cars'/'prices' data versions, a cheap cars-table fingerprint
+    (row count + max id, catches seeds/inserts that bypass the API) and the
+    price-settings values themselves (plus the configured PHEV trip
+    distribution and spot-price profile). None when versions are unavailable.
+    """
+    versions = get_versions("cars", "prices")
+    if versions is None:
+        return None
+    try:
+        count, max_id = db.session.query(func.count(Car.id), func.max(Car.id)).one()
+    except Exception:
+        db.session.rollback()
+        return None
+
+    prices = sorted(ps.to_dict().items()) if ps is not None else None
+    trips = configured_trip_distribution()
+    trips = trips.fingerprint if trips is not None else None
+    spot = configured_spot_profile()
+    spot = spot.fingerprint if spot is not None else None
+    key = repr((versions, count, max_id, prices, trips, spot, variant))
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+
+def get(etag: str) -> bytes | None:
+    with _lock:
+        body = _entries.get(etag)
+        if body is not None:
+            _entries.move_to_end(etag)
+        return body
+
+
+def put(etag: str, body: bytes) -> None:
+    with _lock:
+        _entries[etag] = body
+        _entries.move_to_end(etag)
+        while len(_entries) > MAX_ENTRIES:
+            _entries.popitem(last=False)
+
+
+def clear() -> None:
+    """Drop every cached body (other processes rely on the version bump)."""
+    with _lock:
+        _entries.clear()
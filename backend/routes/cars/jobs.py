@@ -0,0 +1,139 @@
+# jobs.py
+from __future__ import annotations
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from types import SimpleNamespace
+from typing import Any
+
+from flask import Flask, current_app
+from sqlalchemy import update
+
+from backend.models.models import Car, PriceSettings, TcoJob, db
+from backend.utils.settings import PriceSnapshot
+from backend.utils.versions import bump, get_versions, lock_versions, set_version
+
+from . import cache
+from .batch import compute_tco_batch
+from .bulk import BULK_CHUNK, _chunks, _load_tco_inputs
+
+# Restarts when cars/prices change under a running job before it gives up
+MAX_ATTEMPTS = 3
+
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    # One worker: jobs in this process run one at a time, in submission order
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tco-job")
+        return _executor
+
+
+def _run_inline(app: Flask) -> bool:
+    """Tests (and TCO_JOBS_INLINE=1) run jobs on the calling thread."""
+    return bool(app.config.get("TCO_JOBS_INLINE", app.config.get("TESTING")))
+
+
+def enqueue_tco_refresh() -> TcoJob | None:
+    """
+    Queue a recompute of the persisted TCO columns for the current prices
+    version (coalesces with an already-queued job for the same version).
+    CI-safe: returns None if the jobs table is unavailable.
+    """
+    try:
+        version = (get_versions("prices") or {}).get("prices", 0)
+        job = TcoJob.query.filter_by(status="queued", prices_version=version).first()
+        if job is None:
+            job = TcoJob(status="queued", prices_version=version)
+            db.session.add(job)
+            db.session.commit()
+    except Exception as e:
+        current_app.logger.warning("enqueue TCO job failed: %s", e)
+        db.session.rollback()
+        return None
+
+    app = current_app._get_current_object()
+    if _run_inline(app):
+        run_job(job.id)
+    else:
+        _get_executor().submit(_run_in_app, app, job.id)
+    return job
+
+
+def _run_in_app(app: Flask, job_id: int) -> None:
+    with app.app_context():
+        try:
+            run_job(job_id)
+        finally:
+            db.session.remove()
+
+
+def run_job(job_id: int) -> None:
+    """Execute a queued job to completion (done / superseded / failed)."""
+    job = db.session.get(TcoJob, job_id)
+    if job is None or job.status != "queued":
+        return
+    job.status = "running"
+    job.started_at = datetime.utcnow()
+    db.session.commit()
+
+    try:
+        for _ in range(MAX_ATTEMPTS):
+            if _materialize(job):
+                break
+        else:
+            job.status = "superseded"
+            job.error = "cars or prices kept changing; a newer job will catch up"
+    except Exception as e:
+        current_app.logger.warning("TCO job %s failed: %s", job_id, e)
+        db.session.rollback()
+        job = db.session.get(TcoJob, job_id)
+        job.status = "failed"
+        job.error = str(e)
+    job.finished_at = datetime.utcnow()
+    db.session.commit()
+
+
+def _materialize(job: TcoJob) -> bool:
+    """
+    One attempt: price every car in chunks (committing only progress), then
+    swap the whole generation in a single transaction. Returns False, writing
+    nothing, if cars or prices changed since the inputs were read.
+    """
+    start = get_versions("prices", "cars") or {"prices": 0, "cars": 0}
+    row = db.session.get(PriceSettings, 1)
+    ps = PriceSnapshot.from_row(row) if row is not None else None
+    rows = _load_tco_inputs(None)
+    ids = list(rows)
+
+    job.prices_version = start["prices"]
+    job.total, job.done = len(ids), 0
+    db.session.commit()
+
+    params: list[dict[str, Any]] = []
+    for chunk in _chunks(ids, BULK_CHUNK):
+        tco = compute_tco_batch([SimpleNamespace(**rows[i]) for i in chunk], ps)
+        params.extend(
+            {"id": cid, **{col: values[k] for col, values in tco.items()}}
+            for k, cid in enumerate(chunk)
+        )
+        job.done += len(chunk)
+        db.session.commit()
+
+    # Readers see the previous generation until this commit, then all of the new
+    if lock_versions("prices", "cars") != start:
+        db.session.rollback()
+        return False
+    for chunk in _chunks(params):
+        db.session.execute(update(Car), list(chunk))
+    bump("cars")
+    set_version("tco", job.prices_version)
+    job.status = "done"
+    db.session.commit()
+    cache.clear()
+    return True
@@ -0,0 +1,243 @@
+# montecarlo.py
+from __future__ import annotations
+
+import atexit
+import multiprocessing
+import os
+import threading
+from collections.abc import Sequence
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any
+
+import numpy as np
+
+from backend.models.models import PriceSettings
+from backend.utils.tco_kernel import HORIZONS, derive_tco_grid, load_columns
+
+from .pricing import normalize_prices
+from .util import num
+
+# Stochastic factors, in covariance order
+FACTORS: tuple[str, ...] = ("el", "bensin", "diesel", "rate")
+
+# Yearly volatility: log-return sd for prices, percentage points for the rate
+DEFAULT_VOLATILITY = {"el": 0.30, "bensin": 0.12, "diesel": 0.14, "rate": 0.75}
+DEFAULT_CORRELATION = (
+    (1.00, 0.30, 0.30, 0.20),
+    (0.30, 1.00, 0.90, 0.25),
+    (0.30, 0.90, 1.00, 0.25),
+    (0.20, 0.25, 0.25, 1.00),
+)
+
+DEFAULT_PATHS = 2_000
+DEFAULT_SEED = 12_345
+MAX_PATHS = 20_000
+MAX_CELLS = 5_000_000  # cars x paths x horizons
+# Fixed chunking (not per worker) so results don't depend on the worker count
+CHUNK_PATHS = 500
+
+
+def _cholesky(corr: Any) -> np.ndarray:
+    m = np.asarray(corr, dtype=float)
+    if m.shape != (len(FACTORS), len(FACTORS)) or not np.allclose(m, m.T):
+        k = len(FACTORS)
+        raise ValueError(f"correlation must be a symmetric {k}x{k} matrix")
+    if not np.allclose(np.diag(m), 1.0) or (np.abs(m) > 1).any():
+        raise ValueError("correlation needs a unit diagonal and entries in [-1, 1]")
+    try:
+        return np.linalg.cholesky(m)
+    except np.linalg.LinAlgError as e:
+        raise ValueError("correlation must be positive definite") from e
+
+
+def parse_spec(body: dict[str, Any]) -> dict[str, Any]:
+    """Validated simulation spec from a request body. Raises ValueError."""
+    paths = int(num(body.get("paths"), DEFAULT_PATHS))
+    if not 1 <= paths <= MAX_PATHS:
+        raise ValueError(f"paths must be 1..{MAX_PATHS}")
+
+    vol = dict(DEFAULT_VOLATILITY)
+    given = body.get("volatility") or {}
+    if not isinstance(given, dict) or set(given) - set(FACTORS):
+        raise ValueError(f"volatility keys: {', '.join(FACTORS)}")
+    for k, v in given.items():
+        vol[k] = num(v, -1.0)
+        if not 0 <= vol[k] <= 5:
+            raise ValueError(f"volatility.{k} must be 0..5")
+
+    return {
+        "paths": paths,
+        "seed": int(num(body.get("seed"), DEFAULT_SEED)),
+        "volatility": vol,
+        "chol": _cholesky(body.get("correlation") or DEFAULT_CORRELATION),
+    }
+
+
+def _horizon_means(
+    rng: np.random.Generator, n: int, base: dict[str, float], spec: dict[str, Any]
+) -> dict[str, np.ndarray]:
+    """
+    Draw `n` yearly paths over the longest horizon. Year 1 is today's level;
+    prices then follow a driftless correlated log random walk, the rate an
+    arithmetic one (floored at 0). Returns per-factor (n, len(HORIZONS)) means
+    of the path over each horizon.
+    """
+    years = max(HORIZONS)
+    z = rng.standard_normal((n, years - 1, len(FACTORS))) @ spec["chol"].T
+    vol = np.array([spec["volatility"][f] for f in FACTORS])
+    steps = np.concatenate(
+        [np.zeros((n, 1, len(FACTORS))), np.cumsum(z * vol, axis=1)], axis=1
+    )  # (n, years, factors): cumulative shock at the start of each year
+
+    out = {}
+    for i, f in enumerate(FACTORS):
+        if f == "rate":
+            level = np.maximum(0.0, base[f] + steps[..., i])
+        else:
+            level = base[f] * np.exp(steps[..., i])
+        csum = np.cumsum(level, axis=1)
+        out[f] = np.stack([csum[:, h - 1] / h for h in HORIZONS], axis=1)
+    return out
+
+
+def _simulate_chunk(
+    cols: dict[str, np.ndarray],
+    P: dict[str, Any],
+    spec: dict[str, Any],
+    seed: np.random.SeedSequence,
+    n: int,
+) -> np.ndarray:
+    """TCO for all cars on `n` paths: (cars, n, len(HORIZONS)). Process-safe."""
+    base = {
+        "el": float(P["elec_sek_kwh"]),
+        "bensin": float(P["bensin_sek_l"]),
+        "diesel": float(P["diesel_sek_l"]),
+        "rate": float(P.get("interest_rate_pct", 0.0) or 0.0),
+    }
+    means = _horizon_means(np.random.default_rng(seed), n, base, spec)
+    out = np.empty((cols["type_code"].shape[0], n, len(HORIZONS)))
+    for h, years in enumerate(HORIZONS):
+        grid = {
+            "elec_sek_kwh": means["el"][:, h],
+            "bensin_sek_l": means["bensin"][:, h],
+            "diesel_sek_l": means["diesel"][:, h],
+            "interest_rate_pct": means["rate"][:, h],
+            "yearly_km": np.full(n, P["yearly_km"]),
+            "downpayment_sek": np.full(n, float(P.get("downpayment_sek", 0.0) or 0.0)),
+        }
+        # Each horizon has its own price means: price only that horizon
+        out[:, :, h] = derive_tco_grid(cols, P, grid, horizons=(years,))[:, :, 0]
+    return out
+
+
+def _run_chunks(cols, P, spec, pool: Executor | None) -> np.ndarray:
+    sizes = [CHUNK_PATHS] * (spec["paths"] // CHUNK_PATHS)
+    if spec["paths"] % CHUNK_PATHS:
+        sizes.append(spec["paths"] % CHUNK_PATHS)
+    seeds = np.random.SeedSequence(spec["seed"]).spawn(len(sizes))
+    args = [(cols, P, spec, s, n) for s, n in zip(seeds, sizes, strict=True)]
+
+    if pool is None or len(args) == 1:
+        parts = [_simulate_chunk(*a) for a in args]
+    else:
+        try:
+            parts = list(pool.map(_simulate_chunk, *zip(*args, strict=True)))
+        except BrokenProcessPool:
+            # A worker died (OOM kill etc.): drop the pool, finish in-process
+            _discard_pool(pool)
+            parts = [_simulate_chunk(*a) for a in args]
+    return np.concatenate(parts, axis=1)
+
+
+def default_workers() -> int:
+    return max(1, min(4, os.cpu_count() or 1))
+
+
+# One process pool for the whole app: workers start once (lazily, on the first
+# simulation) and concurrent requests share them instead of each forking its own.
+_pool: ProcessPoolExecutor | None = None
+_pool_lock = threading.Lock()
+
+
+def shared_pool() -> ProcessPoolExecutor | None:
+    """The app-wide pool of default_workers() processes; None on one core."""
+    global _pool
+    if default_workers() <= 1:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            # forkserver: never fork the (threaded) server process itself
+            methods = multiprocessing.get_all_start_methods()
+            ctx = multiprocessing.get_context(
+                "forkserver" if "forkserver" in methods else None
+            )
+            _pool = ProcessPoolExecutor(max_workers=default_workers(), mp_context=ctx)
+        return _pool
+
+
+def _discard_pool(pool: Executor) -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+@atexit.register
+def _shutdown_pool() -> None:
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+
+
+def run_monte_carlo(
+    cars: Sequence[Any],
+    ps: PriceSettings | None,
+    spec: dict[str, Any],
+    pool: Executor | None = None,
+) -> dict[str, Any]:
+    """
+    P10/P50/P90 (and mean) TCO per car and horizon over `spec["paths"]`
+    correlated energy-price / interest-rate paths, plus each car's probability of
+    being the cheapest. Chunks run on `pool` (in-process when None). Same
+    seed -> same numbers, whatever the pool size.
+    """
+    cells = len(cars) * spec["paths"] * len(HORIZONS)
+    if cells > MAX_CELLS:
+        raise ValueError(
+            f"simulation would produce {cells} values; max is {MAX_CELLS} "
+            "(fewer paths or pass car ids)"
+        )
+
+    summary: dict[str, Any] = {
+        "paths": spec["paths"],
+        "seed": spec["seed"],
+        "horizons": list(HORIZONS),
+        "volatility": spec["volatility"],
+        "cars": [],
+    }
+    if not cars:
+        return summary
+
+    tco = _run_chunks(load_columns(cars), normalize_prices(ps), spec, pool)
+    p10, p50, p90 = np.percentile(tco, (10, 50, 90), axis=1)  # (cars, horizons)
+    mean = tco.mean(axis=1)
+    wins = tco.argmin(axis=0)  # (paths, horizons)
+    p_cheapest = np.stack(
+        [np.bincount(wins[:, h], minlength=len(cars)) for h in range(len(HORIZONS))],
+        axis=1,
+    ) / float(spec["paths"])
+
+    summary["cars"] = [
+        {
+            "id": c.id,
+            "model": c.model,
+            "p10": np.round(p10[i], 2).tolist(),
+            "p50": np.round(p50[i], 2).tolist(),
+            "p90": np.round(p90[i], 2).tolist(),
+            "mean": np.round(mean[i], 2).tolist(),
+            "p_cheapest": np.round(p_cheapest[i], 4).tolist(),
+        }
+        for i, c in enumerate(cars)
+    ]
+    return summary
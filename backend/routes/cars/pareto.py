@@ -0,0 +1,124 @@
+# pareto.py
+from __future__ import annotations
+
+from collections.abc import Sequence
+from typing import Any
+
+import numpy as np
+
+from backend.models.models import PriceSettings
+from backend.utils.tco_kernel import derive_arrays, float_column, load_columns
+
+from .pricing import normalize_prices
+
+# Selectable dimensions -> (source, direction). TCO comes from the batch model;
+# the rest are car columns where a missing / non-positive value means unknown.
+PARETO_DIMS: dict[str, tuple[str, str]] = {
+    "tco_3y": ("tco_total_3y", "min"),
+    "tco_5y": ("tco_total_5y", "min"),
+    "tco_8y": ("tco_total_8y", "min"),
+    "range_km": ("range_km", "max"),
+    "acceleration_0_100": ("acceleration_0_100", "min"),
+    "trunk_size_litre": ("trunk_size_litre", "max"),
+    "dc_time_min_10_80": ("dc_time_min_10_80", "min"),
+    "battery_aviloo_score": ("battery_aviloo_score", "max"),
+}
+DEFAULT_DIMS: tuple[str, ...] = ("tco_5y", "range_km", "acceleration_0_100")
+
+# Candidates settled per skyline step
+BLOCK = 256
+
+
+def parse_dims(raw: str | None) -> list[str]:
+    """'tco_5y,range_km' -> validated, de-duplicated list. Raises ValueError."""
+    dims = [d.strip() for d in (raw or "").split(",") if d.strip()]
+    dims = list(dict.fromkeys(dims)) or list(DEFAULT_DIMS)
+    unknown = [d for d in dims if d not in PARETO_DIMS]
+    if unknown:
+        raise ValueError(
+            f"unknown dims: {', '.join(unknown)} (choose from {', '.join(PARETO_DIMS)})"
+        )
+    if len(dims) < 2:
+        raise ValueError("need at least two dims")
+    return dims
+
+
+def metrics(
+    cars: Sequence[Any], ps: PriceSettings | None, dims: Sequence[str]
+) -> np.ndarray:
+    """(cars, dims) raw metric values; NaN where unknown."""
+    derived = None
+    out = np.empty((len(cars), len(dims)))
+    for j, dim in enumerate(dims):
+        source, _ = PARETO_DIMS[dim]
+        if source.startswith("tco_total_"):
+            if derived is None:
+                derived = derive_arrays(load_columns(cars), normalize_prices(ps))
+            out[:, j] = derived[source]
+        else:
+            col = float_column(cars, source)
+            out[:, j] = np.where(col > 0, col, np.nan)
+    return out
+
+
+def _to_minimization(values: np.ndarray, dims: Sequence[str]) -> np.ndarray:
+    """
+    Flip "max" dims and push unknowns past the worst known value, so
+    dominance is plain componentwise <= with at least one <.
+    """
+    X = values.copy()
+    for j, dim in enumerate(dims):
+        if PARETO_DIMS[dim][1] == "max":
+            X[:, j] = -X[:, j]
+        col = X[:, j]
+        known = ~np.isnan(col)
+        worst = col[known].max() + 1.0 if known.any() else 0.0
+        col[~known] = worst
+    return X
+
+
+def _dominated(P: np.ndarray, Q: np.ndarray, pairs: int = 1 << 18) -> np.ndarray:
+    """mask[i]: some row of P dominates Q[i] (<= everywhere, < somewhere)."""
+    out = np.zeros(len(Q), dtype=bool)
+    if len(P) == 0:
+        return out
+    step = max(1, pairs // len(P))  # bounds the (step, |P|, dims) temporaries
+    for s in range(0, len(Q), step):
+        q = Q[s : s + step, None, :]
+        le = (P[None, :, :] <= q).all(axis=2)
+        lt = (P[None, :, :] < q).any(axis=2)
+        out[s : s + step] = (le & lt).any(axis=1)
+    return out
+
+
+def skyline(X: np.ndarray) -> np.ndarray:
+    """
+    Indices of the non-dominated rows of X (minimize every column), in input
+    order. Sort-filter-skyline: after presorting by a strictly monotone score
+    (normalized sum) a point can only be dominated by points before it. So the
+    head block's survivors (checked only against each other) are final, and
+    they prune everything behind them in one broadcasted pass.
+    """
+    n = X.shape[0]
+    if n == 0:
+        return np.empty(0, dtype=np.intp)
+    lo, hi = X.min(axis=0), X.max(axis=0)
+    span = np.where(hi > lo, hi - lo, 1.0)
+    remaining = np.argsort(((X - lo) / span).sum(axis=1), kind="stable")
+
+    keep: list[np.ndarray] = []
+    while remaining.size:
+        head, rest = remaining[:BLOCK], remaining[BLOCK:]
+        B = X[head]
+        front = head[~_dominated(B, B)]
+        keep.append(front)
+        remaining = rest[~_dominated(X[front], X[rest])]
+    return np.sort(np.concatenate(keep))
+
+
+def pareto_front(
+    cars: Sequence[Any], ps: PriceSettings | None, dims: Sequence[str]
+) -> tuple[np.ndarray, np.ndarray]:
+    """(frontier indices into `cars`, raw (cars, dims) metrics)."""
+    values = metrics(cars, ps, dims)
+    return skyline(_to_minimization(values, dims)), values
@@ -0,0 +1,71 @@
+# phev.py
+from __future__ import annotations
+
+from collections.abc import Sequence
+from typing import Any
+
+import numpy as np
+
+from backend.models.models import PriceSettings
+from backend.utils.tco_kernel import (
+    PHEV,
+    commute_km_per_day,
+    derive_arrays,
+    electric_range_km,
+    load_columns,
+    phev_electric_km,
+    round2,
+    type_codes,
+)
+from backend.utils.trips import TripDistribution
+
+from .pricing import normalize_prices
+
+
+def phev_split(
+    cars: Sequence[Any], ps: PriceSettings | None, trips: TripDistribution | None
+) -> dict[str, Any]:
+    """
+    Yearly electric/fuel km split per PHEV under a trip-length distribution
+    (None -> the configured one, else the fixed daily commute), next to the
+    commute-model energy cost it replaces.
+    """
+    is_phev = type_codes(cars) == PHEV if cars else []
+    phevs = [c for c, keep in zip(cars, is_phev, strict=True) if keep]
+    P = normalize_prices(ps)
+    if trips is not None:
+        P["trip_distribution"] = trips
+    trips = P["trip_distribution"]
+    out: dict[str, Any] = {
+        "yearly_km": P["yearly_km"],
+        "days_per_year": trips.days_per_year if trips else None,
+        "mean_trip_km": round(trips.mean_km, 2) if trips else commute_km_per_day(P),
+        "items": [],
+    }
+    if not phevs:
+        return out
+
+    cols = load_columns(phevs)
+    km = float(P["yearly_km"])
+    ev_km = phev_electric_km(cols, km, commute_km_per_day(P), trips)
+    energy = derive_arrays(cols, P)["energy_fuel_year"]
+    baseline = derive_arrays(cols, {**P, "trip_distribution": None})
+    share = ev_km / km if km > 0 else np.zeros_like(ev_km)
+
+    columns = {
+        "electric_range_km": round2(electric_range_km(cols)),
+        "electric_km_year": round2(ev_km),
+        "fuel_km_year": round2(np.maximum(km - ev_km, 0.0)),
+        "electric_share": np.round(share, 4).tolist(),
+        "energy_fuel_year": round2(energy),
+        "energy_fuel_year_commute": round2(baseline["energy_fuel_year"]),
+    }
+    out["items"] = [
+        {
+            "id": getattr(car, "id", None),
+            "model": getattr(car, "model", None),
+            **{k: v[i] for k, v in columns.items()},
+        }
+        for i, car in enumerate(phevs)
+    ]
+    return out
@@ -5,6 +5,9 @@ from typing import Any
 from backend.models.models import (
     PriceSettings,
 )  # absolute import to avoid relative hops
+from backend.utils.spot_prices import configured_spot_profile
+from backend.utils.tco_kernel import CHARGING_LOSS_PCT, charging_loss_factor
+from backend.utils.trips import configured_trip_distribution
 
 from .util import num
 
@@ -17,7 +20,7 @@ DEFAULTS: dict[str, Any] = {
     "yearly_km": 18000,
     "daily_commute_km": 30,
     # charging system losses (applied to electricity price)
-    "charging_loss_pct": 0.10,
+    "charging_loss_pct": CHARGING_LOSS_PCT,
     # tire replacement
     "tire_lifespan_years": 3,
     # financing
@@ -48,14 +51,13 @@ def normalize_prices(ps: PriceSettings | None) -> dict[str, Any]:
             "tire_lifespan_years": DEFAULTS["tire_lifespan_years"],
             "downpayment_sek": DEFAULTS["downpayment_sek"],
             "interest_rate_pct": DEFAULTS["interest_rate_pct"],
+            "trip_distribution": configured_trip_distribution(),
+            "charging_loss_factor": loss,
+            "spot_profile": configured_spot_profile(),
         }
 
     ore = _pos(getattr(ps, "el_price_ore_kwh", None), DEFAULTS["el_price_ore_kwh"])
-    loss_pct = (
-        getattr(ps, "charging_loss_pct", DEFAULTS["charging_loss_pct"])
-        or DEFAULTS["charging_loss_pct"]
-    )
-    loss = 1.0 + float(loss_pct)
+    loss = charging_loss_factor(ps)
 
     return {
         "elec_sek_kwh": (ore / 100.0) * loss,
@@ -84,6 +86,11 @@ def normalize_prices(ps: PriceSettings | None) -> dict[str, Any]:
         "interest_rate_pct": float(
             getattr(ps, "interest_rate_pct", DEFAULTS["interest_rate_pct"]) or 0.0
         ),
+        # PHEV daily trip lengths (app config); None -> fixed commute model
+        "trip_distribution": configured_trip_distribution(),
+        # ENERGY_MODE=spot: per-car smart overnight charging price (app config)
+        "charging_loss_factor": loss,
+        "spot_profile": configured_spot_profile(),
     }
 
 
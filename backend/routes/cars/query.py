@@ -0,0 +1,317 @@
+# query.py
+from __future__ import annotations
+
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from typing import Any
+
+import numpy as np
+from flask import current_app
+from sqlalchemy import and_, func, or_
+
+from backend.models.models import Car, PriceSettings
+from backend.utils.charging import charging_metrics
+from backend.utils.pagination import decode_cursor, encode_cursor
+from backend.utils.tco_kernel import derive_arrays, load_columns, norm_type
+
+from .batch import compute_derived_batch
+from .pricing import normalize_prices
+from .serialize import serialize_car
+from .util import num
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 500
+
+# Road-trip distance behind road_trip_min (?trip_km=)
+DEFAULT_TRIP_KM = 500.0
+MAX_TRIP_KM = 5_000.0
+
+# Multi-value filters: ?body_style=SUV,Sedan (comma-separated and/or repeated)
+LIST_FILTERS = {
+    "body_style": Car.body_style,
+    "eu_segment": Car.eu_segment,
+    "suv_tier": Car.suv_tier,
+    "type_of_vehicle": Car.type_of_vehicle,
+}
+
+# Range predicates: ?price_min=..&price_max=..
+RANGE_FILTERS = {
+    "price": Car.estimated_purchase_price,
+    "range": Car.range_km,
+    "year": Car.year,
+}
+
+# SQL-sortable keys. NULLs sort as 0 (what serialize_car reports for them)
+DB_SORT_KEYS = {
+    "id": Car.id,
+    "model": Car.model,
+    "year": Car.year,
+    "price": func.coalesce(Car.estimated_purchase_price, 0),
+    "estimated_purchase_price": func.coalesce(Car.estimated_purchase_price, 0),
+    "range_km": func.coalesce(Car.range_km, 0),
+    "acceleration_0_100": func.coalesce(Car.acceleration_0_100, 0),
+    "trunk_size_litre": func.coalesce(Car.trunk_size_litre, 0),
+    "dc_time_min_10_80": func.coalesce(Car.dc_time_min_10_80, 0),
+    "battery_aviloo_score": func.coalesce(Car.battery_aviloo_score, 0),
+}
+
+# Derived keys -> batch array; per-month values order exactly like the totals
+DERIVED_SORT_KEYS = {
+    **{f"tco_{y}y": f"tco_total_{y}y" for y in (3, 5, 8)},
+    **{f"tco_total_{y}y": f"tco_total_{y}y" for y in (3, 5, 8)},
+    **{f"tco_{y}_years": f"tco_total_{y}y" for y in (3, 5, 8)},
+    **{f"tco_per_month_{y}y": f"tco_total_{y}y" for y in (3, 5, 8)},
+    "energy_fuel_year": "energy_fuel_year",
+    "recurring_year": "recurring_year",
+}
+
+# Charging-curve keys -> utils.charging.charging_metrics array
+CHARGING_SORT_KEYS = {
+    "road_trip_min": "road_trip_min",
+    "dc_time_min_10_80_est": "dc_10_80_min",
+}
+
+
+def _list_arg(args, key: str) -> list[str]:
+    out: list[str] = []
+    for raw in args.getlist(key):
+        out.extend(s.strip() for s in str(raw).split(",") if s.strip())
+    return out
+
+
+@dataclass
+class CarQuery:
+    """Parsed /api/cars query string (filters, sort, keyset page)."""
+
+    lists: dict[str, list[str]] = field(default_factory=dict)
+    ranges: dict[str, tuple[float | None, float | None]] = field(default_factory=dict)
+    q: str = ""
+    sort: str = "id"
+    desc: bool = False
+    limit: int | None = None
+    cursor: str | None = None
+    trip_km: float = DEFAULT_TRIP_KM
+
+    @classmethod
+    def from_args(cls, args) -> CarQuery:
+        """Raises ValueError with a client-facing message on bad input."""
+        lists = {k: _list_arg(args, k) for k in LIST_FILTERS}
+        lists["type_of_vehicle"] += _list_arg(args, "type")
+        lists["type_of_vehicle"] = sorted(
+            {norm_type(t) for t in lists["type_of_vehicle"]}
+        )
+        lists = {k: sorted(set(v)) for k, v in lists.items() if v}
+
+        ranges = {}
+        for name in RANGE_FILTERS:
+            lo, hi = args.get(f"{name}_min"), args.get(f"{name}_max")
+            lo = num(lo, None) if lo not in (None, "") else None
+            hi = num(hi, None) if hi not in (None, "") else None
+            if lo is not None or hi is not None:
+                ranges[name] = (lo, hi)
+
+        sort = (args.get("sort") or "id").strip()
+        desc = sort.startswith("-")
+        sort = sort.lstrip("-")
+        if not (
+            sort in DB_SORT_KEYS
+            or sort in DERIVED_SORT_KEYS
+            or sort in CHARGING_SORT_KEYS
+        ):
+            raise ValueError(f"unknown sort key: {sort}")
+
+        trip_km = num(args.get("trip_km"), DEFAULT_TRIP_KM)
+        if not 1 <= trip_km <= MAX_TRIP_KM:
+            raise ValueError(f"trip_km must be 1..{MAX_TRIP_KM:g}")
+
+        limit = None
+        cursor = args.get("cursor") or None
+        if args.get("limit") not in (None, "") or cursor:
+            limit = int(num(args.get("limit"), DEFAULT_LIMIT))
+            if not 1 <= limit <= MAX_LIMIT:
+                raise ValueError(f"limit must be 1..{MAX_LIMIT}")
+
+        return cls(
+            lists=lists,
+            ranges=ranges,
+            q=(args.get("q") or "").strip(),
+            sort=sort,
+            desc=desc,
+            limit=limit,
+            cursor=cursor,
+            trip_km=trip_km,
+        )
+
+    @property
+    def paginated(self) -> bool:
+        return self.limit is not None
+
+    def cache_key(self) -> str:
+        """Canonical form, for the response cache/ETag."""
+        return repr(
+            (
+                sorted(self.lists.items()),
+                sorted(self.ranges.items()),
+                self.q.lower(),
+                self.sort,
+                self.desc,
+                self.limit,
+                self.cursor,
+                self.trip_km,
+            )
+        )
+
+    def filtered(self):
+        """Car query with every SQL-side predicate applied (indexed columns)."""
+        q = Car.query
+        for key, values in self.lists.items():
+            q = q.filter(LIST_FILTERS[key].in_(values))
+        for name, (lo, hi) in self.ranges.items():
+            col = RANGE_FILTERS[name]
+            if lo is not None:
+                q = q.filter(col >= lo)
+            if hi is not None:
+                q = q.filter(col <= hi)
+        if self.q:
+            q = q.filter(Car.model.ilike(f"%{self.q}%"))
+        return q
+
+
+def iter_query(
+    cq: CarQuery, ps: PriceSettings | None
+) -> tuple[Iterator[dict], str | None]:
+    """
+    (serialized cars for `cq`, next cursor). The batch TCO/charging pass runs
+    up front; each car is serialized only when the iterator reaches it.
+    DB-column sorts page in SQL (keyset on (key, id)); derived TCO and
+    charging sorts evaluate the filtered set in one batch pass and page in
+    memory.
+    """
+    if cq.sort in DB_SORT_KEYS:
+        cars, next_cursor = _db_sorted(cq)
+        derived = _derive(cars, ps)
+    else:
+        cars, derived, next_cursor = _derived_sorted(cq, ps)
+    charging = _charging_columns(cars, cq.trip_km)
+
+    def items() -> Iterator[dict]:
+        for c, d, *values in zip(cars, derived, *charging, strict=True):
+            item = serialize_car(c, ps, d)
+            item.update(zip(CHARGING_FIELDS, values, strict=True))
+            yield item
+
+    return items(), next_cursor
+
+
+def run_query(cq: CarQuery, ps: PriceSettings | None) -> list[dict] | dict[str, Any]:
+    """
+    Serialized cars for `cq`: a plain list, or {items, next_cursor, limit} when
+    paginated (see iter_query).
+    """
+    items, next_cursor = iter_query(cq, ps)
+    if not cq.paginated:
+        return list(items)
+    return {"items": list(items), "next_cursor": next_cursor, "limit": cq.limit}
+
+
+# Charging estimates added to every item: field -> (metric, decimals)
+CHARGING_FIELDS = {
+    "dc_time_min_10_80_est": ("dc_10_80_min", 1),
+    "ac_time_h_0_100_est": ("ac_0_100_h", 2),
+    "road_trip_min": ("road_trip_min", 1),
+}
+
+
+def _charging_columns(cars: list[Car], trip_km: float) -> list[list[float]]:
+    """
+    Curve-based charging estimates and road-trip minutes, one batch per page
+    (None where the model lacks the car's data).
+    """
+    m = charging_metrics(cars, trip_km)
+    return [
+        [None if np.isnan(v) else v for v in np.round(m[key], nd).tolist()]
+        for key, nd in CHARGING_FIELDS.values()
+    ]
+
+
+def _derive(cars: list[Car], ps: PriceSettings | None) -> list[dict | None]:
+    """One vectorized pass over the page; fall back to per-car compute on failure."""
+    try:
+        return compute_derived_batch(cars, ps)
+    except Exception as e:
+        current_app.logger.warning("batch TCO failed; computing per car: %s", e)
+        return [None] * len(cars)
+
+
+def _db_sorted(cq: CarQuery) -> tuple[list[Car], str | None]:
+    key = DB_SORT_KEYS[cq.sort]
+    q = cq.filtered()
+    if cq.cursor:
+        value, last_id = decode_cursor(cq.cursor, cq.sort)
+        if cq.desc:
+            q = q.filter(or_(key < value, and_(key == value, Car.id < last_id)))
+        else:
+            q = q.filter(or_(key > value, and_(key == value, Car.id > last_id)))
+    direction = "desc" if cq.desc else "asc"
+    q = q.order_by(getattr(key, direction)(), getattr(Car.id, direction)())
+
+    if not cq.paginated:
+        return q.all(), None
+
+    rows = q.limit(cq.limit + 1).all()
+    if len(rows) <= cq.limit:
+        return rows, None
+    last = rows[cq.limit - 1]
+    # Read the key off the row the same way SQL sees it (NULL -> 0)
+    attr = "estimated_purchase_price" if cq.sort == "price" else cq.sort
+    value = getattr(last, attr)
+    if value is None:
+        value = 0
+    return rows[: cq.limit], encode_cursor(cq.sort, _jsonable(value), last.id)
+
+
+def _jsonable(v: Any) -> Any:
+    if isinstance(v, int | float | str) or v is None:
+        return v
+    return float(v)
+
+
+def _derived_sorted(
+    cq: CarQuery, ps: PriceSettings | None
+) -> tuple[list[Car], list[dict], str | None]:
+    cars: list[Car] = cq.filtered().order_by(Car.id).all()
+    if not cars:
+        return [], [], None
+
+    if cq.sort in CHARGING_SORT_KEYS:
+        values = charging_metrics(cars, cq.trip_km)[CHARGING_SORT_KEYS[cq.sort]]
+    else:
+        values = derive_arrays(load_columns(cars), normalize_prices(ps))[
+            DERIVED_SORT_KEYS[cq.sort]
+        ]
+    ids = np.fromiter((c.id for c in cars), dtype=np.int64, count=len(cars))
+    signed = -values if cq.desc else values
+    signed = np.where(np.isnan(signed), np.inf, signed)  # unknowns last either way
+    signed_ids = -ids if cq.desc else ids
+    order = np.lexsort((signed_ids, signed))
+
+    if cq.cursor:
+        value, last_id = decode_cursor(cq.cursor, cq.sort)
+        signed_value = -float(value or 0) if cq.desc else float(value or 0)
+        sv = np.inf if value is None else signed_value  # None: among the unknowns
+        sid = -last_id if cq.desc else last_id
+        after = (signed[order] > sv) | (
+            (signed[order] == sv) & (signed_ids[order] > sid)
+        )
+        order = order[after]
+
+    next_cursor = None
+    if cq.paginated:
+        if len(order) > cq.limit:
+            last = int(order[cq.limit - 1])
+            value = None if np.isnan(values[last]) else float(values[last])
+            next_cursor = encode_cursor(cq.sort, value, int(ids[last]))
+        order = order[: cq.limit]
+
+    page = [cars[i] for i in order.tolist()]
+    return page, _derive(page, ps), next_cursor
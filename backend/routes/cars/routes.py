@@ -1,10 +1,34 @@
 from __future__ import annotations
 
+import numpy as np
 from flask import Blueprint, current_app, jsonify, request
 
-from backend.models.models import Car, PriceSettings, db
+from backend.models.models import Car, PriceSettings, TcoJob, db
+from backend.utils.depreciation import (
+    BEV_WARRANTY_KINK_PP,
+    MILEAGE_SLOPE_PER_10K,
+    RETENTION,
+    SALVAGE_FLOOR,
+    STD_KM_PER_YEAR,
+    WARRANTY_MONTHS,
+    compile_curve,
+)
+from backend.utils.settings import reset_settings_snapshot, settings_snapshot
+from backend.utils.streaming import stream_json, wants_stream
+from backend.utils.trips import parse_trip_distribution
+from backend.utils.versions import bump, get_versions
 
-from .serialize import compute_derived, serialize_car
+from . import cache
+from .batch import compute_derived_batch
+from .bulk import bulk_update_cars
+from .jobs import enqueue_tco_refresh
+from .montecarlo import parse_spec, run_monte_carlo, shared_pool
+from .pareto import PARETO_DIMS, pareto_front, parse_dims
+from .phev import phev_split
+from .query import CarQuery, iter_query, run_query
+from .serialize import serialize_car
+from .sweep import run_sweep
+from .util import _cars_from_body, num
 
 cars_bp = Blueprint("cars", __name__, url_prefix="/api")
 
@@ -18,23 +42,77 @@ def which_handler():
 @cars_bp.get("/cars/")
 def list_cars():
     """
-    Return all cars with derived fields (TCO includes financing).
+    Return cars with derived fields (TCO includes financing).
+    Optional query: body_style/eu_segment/suv_tier/type_of_vehicle (comma lists),
+    q, price_/range_/year_ min/max, sort=[-]key (incl. road_trip_min for
+    ?trip_km=, default 500); limit/cursor switch to a keyset
+    page envelope {items, next_cursor, limit}. Without them: the plain list.
+    stream=1 serializes car by car into a chunked body (same bytes).
+    Served from a versioned cache with a strong ETag (304 on If-None-Match).
     CI-safe: returns [] with 200 if the table is missing.
     """
     try:
-        cars: list[Car] = Car.query.order_by(Car.id).all()
+        cq = CarQuery.from_args(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    # Request settings snapshot (None -> normalize with defaults)
+    ps = settings_snapshot().prices
+
+    etag = cache.cars_list_etag(ps, cq.cache_key())
+    if etag is not None:
+        if etag in request.if_none_match:
+            return _with_etag(current_app.response_class(status=304), etag), 304
+        body = cache.get(etag)
+        if body is not None:
+            resp = current_app.response_class(body, mimetype="application/json")
+            return _with_etag(resp, etag), 200
+
+    if wants_stream(request.args):
+        return _stream_cars(cq, ps, etag)
+
+    try:
+        payload = run_query(cq, ps)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         current_app.logger.warning("GET /api/cars failed; returning []: %s", e)
-        return jsonify([]), 200
+        db.session.rollback()
+        return jsonify({"items": [], "next_cursor": None} if cq.paginated else []), 200
+
+    resp = jsonify(payload)
+    if etag is not None:
+        cache.put(etag, resp.get_data())
+        _with_etag(resp, etag)
+    return resp, 200
+
 
-    # Fetch settings row if available; normalize with defaults otherwise
+def _stream_cars(cq: CarQuery, ps, etag: str | None):
+    """
+    ?stream=1: the batch pass runs up front, then cars are serialized and
+    flushed in chunks (not cached: the body is never held whole).
+    """
     try:
-        ps = PriceSettings.query.get(1)
-    except Exception:
-        ps = None
+        items, next_cursor = iter_query(cq, ps)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        current_app.logger.warning("GET /api/cars failed; returning []: %s", e)
+        db.session.rollback()
+        return jsonify({"items": [], "next_cursor": None} if cq.paginated else []), 200
+
+    envelope = {"next_cursor": next_cursor, "limit": cq.limit} if cq.paginated else None
+    resp = stream_json(items, envelope=envelope)
+    if etag is not None:
+        _with_etag(resp, etag)
+    return resp, 200
+
 
-    rows = [serialize_car(c, ps) for c in cars]
-    return jsonify(rows), 200
+def _with_etag(resp, etag: str):
+    resp.set_etag(etag)
+    # Let clients keep the body but always revalidate (cheap 304s)
+    resp.headers["Cache-Control"] = "no-cache"
+    return resp
 
 
 @cars_bp.get("/cars/categories")
@@ -74,93 +152,204 @@ def car_categories():
         return resp, 200
 
 
+@cars_bp.get("/cars/depreciation")
+def depreciation_curves():
+    """
+    Retention-vs-new-price curves per vehicle key, one point per `step` months
+    up to `years` (default 15, max 40), for the chart to fetch once.
+    Static per deploy; cacheable.
+    """
+    years = int(min(40, max(1, num(request.args.get("years"), 15))))
+    step = int(min(12, max(1, num(request.args.get("step"), 1))))
+    months = list(range(0, years * 12 + 1, step))
+    m = np.asarray(months)
+    resp = jsonify(
+        {
+            "months": months,
+            "curves": {
+                key: np.round(compile_curve(grid).at_many(m), 4).tolist()
+                for key, grid in RETENTION.items()
+            },
+            "anchors": {
+                key: {str(k): v for k, v in sorted(grid.items())}
+                for key, grid in RETENTION.items()
+            },
+            "salvage_floor": SALVAGE_FLOOR,
+            "warranty_months": WARRANTY_MONTHS,
+            "warranty_kink_pp": BEV_WARRANTY_KINK_PP,
+            "std_km_per_year": STD_KM_PER_YEAR,
+            "mileage_slope_per_10k": MILEAGE_SLOPE_PER_10K,
+        }
+    )
+    resp.headers["Cache-Control"] = "public, max-age=3600"
+    return resp, 200
+
+
+@cars_bp.get("/cars/pareto")
+def pareto_cars():
+    """
+    Non-dominated (skyline) cars over `dims` (comma list; default
+    tco_5y,range_km,acceleration_0_100), after the same filters as GET /api/cars.
+    Each item is the serialized car plus its "pareto" metric values.
+    CI-safe: empty frontier with 200 if the table is missing.
+    """
+    try:
+        dims = parse_dims(request.args.get("dims"))
+        cq = CarQuery.from_args(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    ps = settings_snapshot().prices
+    meta = {"dims": dims, "directions": {d: PARETO_DIMS[d][1] for d in dims}}
+    try:
+        cars: list[Car] = cq.filtered().order_by(Car.id).all()
+    except Exception as e:
+        current_app.logger.warning("GET /api/cars/pareto failed: %s", e)
+        db.session.rollback()
+        return jsonify({**meta, "total": 0, "items": []}), 200
+
+    front, values = pareto_front(cars, ps, dims)
+    page = [cars[i] for i in front.tolist()]
+    derived = compute_derived_batch(page, ps)
+    items = []
+    for i, c, d in zip(front.tolist(), page, derived, strict=True):
+        row = serialize_car(c, ps, d)
+        row["pareto"] = {
+            dim: (None if np.isnan(v) else round(float(v), 2))
+            for dim, v in zip(dims, values[i], strict=True)
+        }
+        items.append(row)
+    return jsonify({**meta, "total": len(cars), "items": items}), 200
+
+
+@cars_bp.post("/cars/sweep")
+def sweep_cars():
+    """
+    TCO sensitivity sweep over a price x mileage x interest grid.
+    Body: {"ranges": {<param>: number | [numbers] | {start, stop, step} |
+                      {min, max, steps}}, "ids": [car ids]?}
+    Params: el_price_ore_kwh, bensin_price_sek_litre, diesel_price_sek_litre,
+            yearly_km, interest_rate_pct, downpayment_sek (others stay as stored).
+    Never writes PriceSettings.
+    """
+    body = request.get_json(silent=True) or {}
+    if not isinstance(body, dict) or not isinstance(body.get("ranges", {}), dict):
+        return jsonify({"error": "Expected {'ranges': {...}}"}), 400
+
+    ps = settings_snapshot().prices
+
+    try:
+        cars = _cars_from_body(body)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        current_app.logger.warning("POST /api/cars/sweep: cars unavailable: %s", e)
+        cars = []
+
+    try:
+        return jsonify(run_sweep(cars, ps, body)), 200
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+
+@cars_bp.post("/cars/montecarlo")
+def montecarlo_cars():
+    """
+    Monte Carlo TCO: P10/P50/P90/mean per car and horizon over correlated
+    electricity/fuel/interest-rate paths, plus P(cheapest).
+    Body: {"paths"?, "seed"?, "ids"?, "volatility"?: {el, bensin, diesel, rate},
+           "correlation"?: 4x4 over (el, bensin, diesel, rate)}.
+    Runs on the app-wide process pool (montecarlo.shared_pool).
+    Never writes PriceSettings.
+    """
+    body = request.get_json(silent=True) or {}
+    if not isinstance(body, dict):
+        return jsonify({"error": "Expected a JSON object"}), 400
+    try:
+        spec = parse_spec(body)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    ps = settings_snapshot().prices
+
+    try:
+        cars = _cars_from_body(body)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        current_app.logger.warning("POST /api/cars/montecarlo: cars unavailable: %s", e)
+        cars = []
+
+    try:
+        return jsonify(run_monte_carlo(cars, ps, spec, pool=shared_pool())), 200
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+
+@cars_bp.post("/cars/phev-split")
+def phev_split_cars():
+    """
+    PHEV electric/fuel km split per year from a distribution of daily trip
+    lengths, with the resulting energy cost next to the fixed-commute one.
+    Body: {"trips"?: {"histogram": {"edges", "counts"}} | {"samples": [km]} |
+           {"commute_km": n}, plus optional "days_per_year"; "ids"?: [car ids]}.
+    Without "trips" the configured PHEV_TRIP_DISTRIBUTION (or commute) applies.
+    """
+    body = request.get_json(silent=True) or {}
+    if not isinstance(body, dict):
+        return jsonify({"error": "Expected a JSON object"}), 400
+    try:
+        trips = parse_trip_distribution(body.get("trips"))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    ps = settings_snapshot().prices
+
+    try:
+        cars = _cars_from_body(body)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        current_app.logger.warning("POST /api/cars/phev-split: cars unavailable: %s", e)
+        cars = []
+
+    return jsonify(phev_split(cars, ps, trips)), 200
+
+
 @cars_bp.post("/cars/update")
 def update_cars():
     """
     Bulk update some fields. If body is not a list, recompute TCO for all cars.
     Persists the TCO values computed with financing so spreadsheets/exports can reuse.
+    Set-based: see bulk.bulk_update_cars. `?async=1` without a list body queues a
+    background job instead (202 + job; poll /api/cars/jobs/<id>).
     """
     try:
         payload = request.get_json(silent=True)
-        if not isinstance(payload, list):
-            ids = [i for (i,) in db.session.query(Car.id).all()]
-            payload = [{"id": i} for i in ids]
 
         # Settings row (create if missing to avoid later failures)
         try:
-            ps = PriceSettings.query.get(1)
-            if not ps:
-                ps = PriceSettings(id=1)
-                db.session.add(ps)
+            if settings_snapshot().prices is None:
+                db.session.add(PriceSettings(id=1))
                 db.session.commit()
+                reset_settings_snapshot()
+            ps = settings_snapshot().prices
         except Exception:
+            db.session.rollback()
             ps = None
 
-        updated = 0
-        for p in payload:
-            car = Car.query.get(p.get("id"))
-            if not car:
-                continue
-
-            # basic fields
-            if "model" in p:
-                car.model = p["model"] or car.model
-            if "year" in p and p["year"] is not None:
-                car.year = int(p["year"])
-            if "type_of_vehicle" in p:
-                car.type_of_vehicle = p["type_of_vehicle"] or car.type_of_vehicle
-
-            for k in (
-                "body_style",
-                "eu_segment",
-                "suv_tier",
-                "dc_time_source",
-                "ac_time_source",
-            ):
-                if k in p:
-                    setattr(car, k, p[k] or getattr(car, k))
-
-            # consumption: accept either key
-            if "consumption_kwh_100km" in p or "consumption_kwh_per_100km" in p:
-                raw = p.get("consumption_kwh_100km", p.get("consumption_kwh_per_100km"))
-                car.consumption_kwh_per_100km = float(raw or 0)
-            for k in (
-                "consumption_l_per_100km",
-                "estimated_purchase_price",
-                "summer_tires_price",
-                "winter_tires_price",
-                "acceleration_0_100",
-                "battery_capacity_kwh",
-                "trunk_size_litre",
-                "full_insurance_year",
-                "half_insurance_year",
-                "car_tax_year",
-                "repairs_year",
-                "dc_peak_kw",
-                "dc_time_min_10_80",
-                "ac_onboard_kw",
-                "ac_time_h_0_100",
-            ):
-                if k in p:
-                    setattr(car, k, float(p[k] or 0))
-
-            if "range_km" in p:
-                car.range_km = int(p["range_km"] or 0)
-
-            # recompute & persist TCO totals using current settings (financing-aware)
-            try:
-                d = compute_derived(car, ps)
-                car.tco_3_years = d["tco_3_years"]
-                car.tco_5_years = d["tco_5_years"]
-                car.tco_8_years = d["tco_8_years"]
-            except Exception as e:
-                current_app.logger.debug(
-                    "persist TCO failed for car %s: %s", getattr(car, "id", "?"), e
-                )
-
-            updated += 1
+        if not isinstance(payload, list) and _as_flag(request.args.get("async")):
+            job = enqueue_tco_refresh()
+            if job is not None:
+                resp = jsonify({"job": job.to_dict(), "message": "TCO refresh queued"})
+                resp.headers["X-Cars-Handler"] = "car_evaluation"
+                return resp, 202
+
+        updated = bulk_update_cars(payload if isinstance(payload, list) else None, ps)
 
+        bump("cars")
         db.session.commit()
+        cache.clear()
         resp = jsonify({"updated": updated, "message": "Cars updated"})
         resp.headers["X-Cars-Handler"] = "car_evaluation"
         return resp, 200
@@ -171,3 +360,41 @@ def update_cars():
         resp = jsonify({"error": "Internal server error"})
         resp.headers["X-Cars-Handler"] = "car_evaluation"
         return resp, 500
+
+
+@cars_bp.get("/cars/jobs")
+def list_tco_jobs():
+    """
+    Recent TCO materialization jobs, plus the generation (prices version) the
+    persisted Car.tco_* columns currently hold. CI-safe: empty on DB errors.
+    """
+    try:
+        jobs = TcoJob.query.order_by(TcoJob.id.desc()).limit(20).all()
+        versions = get_versions("prices", "tco") or {"prices": 0, "tco": 0}
+    except Exception as e:
+        current_app.logger.warning("GET /api/cars/jobs failed: %s", e)
+        db.session.rollback()
+        return jsonify({"generation": None, "stale": None, "jobs": []}), 200
+    return (
+        jsonify(
+            {
+                "generation": versions["tco"],
+                "prices_version": versions["prices"],
+                "stale": versions["tco"] != versions["prices"],
+                "jobs": [j.to_dict() for j in jobs],
+            }
+        ),
+        200,
+    )
+
+
+@cars_bp.get("/cars/jobs/<int:job_id>")
+def get_tco_job(job_id: int):
+    job = db.session.get(TcoJob, job_id)
+    if job is None:
+        return jsonify({"error": "Not found"}), 404
+    return jsonify(job.to_dict()), 200
+
+
+def _as_flag(v: str | None) -> bool:
+    return str(v or "").strip().lower() in {"1", "true", "yes", "on"}
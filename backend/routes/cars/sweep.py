@@ -0,0 +1,170 @@
+# sweep.py
+from __future__ import annotations
+
+from collections.abc import Sequence
+from typing import Any
+
+import numpy as np
+
+from backend.models.models import PriceSettings
+from backend.utils.tco_kernel import (
+    HORIZONS,
+    charging_loss_factor,
+    derive_tco_grid,
+    load_columns,
+)
+
+from .pricing import DEFAULTS, _pos, normalize_prices
+from .util import num
+
+# Sweepable settings, in grid-column order (PriceSettings field names / units)
+SWEEP_PARAMS: tuple[str, ...] = (
+    "el_price_ore_kwh",
+    "bensin_price_sek_litre",
+    "diesel_price_sek_litre",
+    "yearly_km",
+    "interest_rate_pct",
+    "downpayment_sek",
+)
+_MUST_BE_POSITIVE = {
+    "el_price_ore_kwh",
+    "bensin_price_sek_litre",
+    "diesel_price_sek_litre",
+    "yearly_km",
+}
+
+MAX_VALUES_PER_PARAM = 100
+MAX_GRID_POINTS = 5_000
+MAX_CELLS = 5_000_000  # cars x grid points x horizons
+
+
+def _base_point(ps: PriceSettings | None) -> dict[str, float]:
+    """Stored settings, normalized like normalize_prices (never written back)."""
+    P = normalize_prices(ps)
+    return {
+        "el_price_ore_kwh": _pos(
+            getattr(ps, "el_price_ore_kwh", None), DEFAULTS["el_price_ore_kwh"]
+        ),
+        "bensin_price_sek_litre": P["bensin_sek_l"],
+        "diesel_price_sek_litre": P["diesel_sek_l"],
+        "yearly_km": P["yearly_km"],
+        "interest_rate_pct": P["interest_rate_pct"],
+        "downpayment_sek": P["downpayment_sek"],
+    }
+
+
+def parse_axis(name: str, spec: Any) -> list[float]:
+    """
+    One sweep axis. Accepts:
+      - a number                       -> [number]
+      - a list of numbers              -> as given
+      - {"start", "stop", "step"}      -> inclusive range
+      - {"min", "max", "steps"}        -> `steps` evenly spaced values
+    Raises ValueError with a client-facing message.
+    """
+    if isinstance(spec, dict):
+        if "step" in spec:
+            start, stop, step = (
+                num(spec.get(k), np.nan) for k in ("start", "stop", "step")
+            )
+            if not (
+                np.isfinite([start, stop, step]).all() and step > 0 and stop >= start
+            ):
+                raise ValueError(f"{name}: need start <= stop and step > 0")
+            count = np.floor((stop - start) / step + 1e-9) + 1
+            if not np.isfinite(count) or count > MAX_VALUES_PER_PARAM:
+                raise ValueError(f"{name}: more than {MAX_VALUES_PER_PARAM} values")
+            values = (start + step * np.arange(int(count))).tolist()
+        else:
+            lo, hi = num(spec.get("min"), np.nan), num(spec.get("max"), np.nan)
+            steps = np.floor(num(spec.get("steps"), 0))
+            if not (np.isfinite([lo, hi]).all() and hi >= lo and steps >= 1):
+                raise ValueError(f"{name}: need min <= max and steps >= 1")
+            if not np.isfinite(steps) or steps > MAX_VALUES_PER_PARAM:
+                raise ValueError(f"{name}: more than {MAX_VALUES_PER_PARAM} values")
+            values = np.linspace(lo, hi, int(steps)).tolist()
+    elif isinstance(spec, list):
+        if not spec or len(spec) > MAX_VALUES_PER_PARAM:
+            raise ValueError(f"{name}: give 1..{MAX_VALUES_PER_PARAM} values")
+        values = [num(v, np.nan) for v in spec]
+    else:
+        values = [num(spec, np.nan)]
+
+    if not np.isfinite(values).all():
+        raise ValueError(f"{name}: values must be numbers")
+    floor_ok = (lambda v: v > 0) if name in _MUST_BE_POSITIVE else (lambda v: v >= 0)
+    if not all(floor_ok(v) for v in values):
+        bound = "> 0" if name in _MUST_BE_POSITIVE else ">= 0"
+        raise ValueError(f"{name}: values must be {bound}")
+    if name == "yearly_km":
+        values = [float(int(v)) for v in values]
+    return values
+
+
+def build_grid(
+    body: dict[str, Any], ps: PriceSettings | None
+) -> tuple[list[list[float]], dict[str, np.ndarray]]:
+    """
+    Cartesian product of the requested axes (unswept params stay at the stored
+    value). Returns (grid rows in SWEEP_PARAMS order, normalized (G,) arrays).
+    """
+    unknown = sorted(set(body.get("ranges", {})) - set(SWEEP_PARAMS))
+    if unknown:
+        raise ValueError(f"unknown sweep params: {', '.join(unknown)}")
+
+    base = _base_point(ps)
+    ranges = body.get("ranges") or {}
+    axes = [
+        parse_axis(k, ranges[k]) if k in ranges else [float(base[k])]
+        for k in SWEEP_PARAMS
+    ]
+    size = int(np.prod([len(a) for a in axes]))
+    if size > MAX_GRID_POINTS:
+        raise ValueError(f"grid has {size} points; max is {MAX_GRID_POINTS}")
+
+    mesh = np.meshgrid(*[np.asarray(a) for a in axes], indexing="ij")
+    flat = {k: m.ravel() for k, m in zip(SWEEP_PARAMS, mesh, strict=True)}
+    grid = {
+        "elec_sek_kwh": (flat["el_price_ore_kwh"] / 100.0) * charging_loss_factor(ps),
+        "bensin_sek_l": flat["bensin_price_sek_litre"],
+        "diesel_sek_l": flat["diesel_price_sek_litre"],
+        "yearly_km": flat["yearly_km"],
+        "interest_rate_pct": flat["interest_rate_pct"],
+        "downpayment_sek": flat["downpayment_sek"],
+    }
+    rows = np.column_stack([flat[k] for k in SWEEP_PARAMS]).tolist()
+    return rows, grid
+
+
+def run_sweep(
+    cars: Sequence[Any], ps: PriceSettings | None, body: dict[str, Any]
+) -> dict[str, Any]:
+    """
+    Evaluate the compute_derived TCO model for cars x grid points x horizons.
+    Pure read: the stored PriceSettings row is only used for unswept values.
+    """
+    rows, grid = build_grid(body, ps)
+    cells = len(cars) * len(rows) * len(HORIZONS)
+    if cells > MAX_CELLS:
+        raise ValueError(
+            f"sweep would produce {cells} values; max is {MAX_CELLS} "
+            "(narrow the ranges or pass car ids)"
+        )
+
+    if cars:
+        tco = derive_tco_grid(load_columns(cars), normalize_prices(ps), grid)
+        winners = np.asarray([c.id for c in cars])[tco.argmin(axis=0)].tolist()
+        matrix = np.round(tco, 2).tolist()
+    else:
+        matrix, winners = [], []
+
+    return {
+        "params": list(SWEEP_PARAMS),
+        "horizons": list(HORIZONS),
+        "grid": rows,
+        "cars": [{"id": c.id, "model": c.model} for c in cars],
+        # tco[car][grid point][horizon], SEK
+        "tco": matrix,
+        # cheapest car id per [grid point][horizon]
+        "cheapest": winners,
+    }
@@ -5,6 +5,14 @@ from decimal import Decimal
 from enum import Enum
 from typing import Any
 
+from backend.models.models import Car
+
+# Charging estimates (curve model); re-exported for callers that import them here
+from backend.utils.charging import (  # noqa: F401
+    estimate_ac_0_100_hours,
+    estimate_dc_10_80_minutes,
+)
+
 
 def as_text(v: Any, default: str | None = None) -> str | None:
     if v is None:
@@ -47,6 +55,25 @@ def num(v: Any, default: float = 0.0) -> float:
     return out if out is not None and out == out else default  # NaN-safe
 
 
+def _cars_from_body(body: dict) -> list[Car]:
+    """
+    Cars named by the request body's optional "ids" list (all cars when it is
+    missing or empty), ordered by id. Raises ValueError on non-integer ids
+    before touching the database.
+    """
+    ids = body.get("ids")
+    q = Car.query.order_by(Car.id)
+    if isinstance(ids, list) and ids:
+        parsed = set()
+        for i in ids:
+            f = as_float(i)
+            if isinstance(i, bool) or f is None or not f.is_integer():
+                raise ValueError("ids must be integers")
+            parsed.add(int(f))
+        q = q.filter(Car.id.in_(parsed))
+    return q.all()
+
+
 def safe(val, default=None):
     return val if val is not None else default
 
@@ -86,27 +113,3 @@ def estimate_repairs_year(norm_type_: str, car_year: int | None) -> float:
     age = max(0, (year_now - int(car_year)) if car_year else 0)
     base = 3000 if norm_type_ == "EV" else 5000
     return base + max(0, age - 5) * 300
-
-
-# Optional charging fallbacks (if you render these fields)
-try:
-    from utils.charging import estimate_ac_0_100_hours, estimate_dc_10_80_minutes
-except Exception:  # pragma: no cover
-
-    def estimate_dc_10_80_minutes(batt_kwh, peak_kw) -> int:
-        try:
-            batt = float(batt_kwh or 0)
-            peak = float(peak_kw or 0)
-            if batt <= 0 or peak <= 0:
-                return 0
-            return int(round((0.7 * batt) / (0.6 * peak) * 60))  # simple heuristic
-        except Exception:
-            return 0
-
-    def estimate_ac_0_100_hours(batt_kwh, ac_kw) -> float:
-        try:
-            batt = float(batt_kwh or 0)
-            ac = float(ac_kw or 0) or 7.0
-            return round(batt / ac, 1) if batt > 0 else 0.0
-        except Exception:
-            return 0.0
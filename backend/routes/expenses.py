@@ -1,10 +1,30 @@
 # routes/expenses.py
 from flask import Blueprint, current_app, jsonify, request
 
-from ..models.models import Expense, db
+from ..models.models import Expense, Month, db
+from ..utils.balances import recompute_balances
+from ..utils.bulk import bulk_response
+from ..utils.pagination import ListQuery, ListSpec, SortKey
+from ..utils.streaming import stream_json, wants_stream
+from ..utils.versions import bump
 
 expenses_bp = Blueprint("expenses", __name__, url_prefix="/api/expenses")
 
+STREAM_BATCH = 1000  # rows per yield_per batch when streaming
+
+EXPENSE_LIST = ListSpec(
+    Expense,
+    sort_keys={
+        "id": SortKey(Expense.id),
+        "category": SortKey(Expense.category),
+        "name": SortKey(Expense.name, ""),
+        "amount": SortKey(Expense.amount),
+    },
+    default_sort="category",
+    filters={"month_id": Expense.month_id, "category": Expense.category},
+    date_column=Month.month_date,
+)
+
 
 def _f(v, default=0.0):
     try:
@@ -13,35 +33,49 @@ def _f(v, default=0.0):
         return float(default)
 
 
+def _expense_row(e: Expense) -> dict:
+    return {
+        "id": e.id,
+        "month_id": e.month_id,
+        "category": e.category or "Other",
+        "name": e.name,
+        "description": e.name,  # temporary alias for any old clients
+        "amount": _f(e.amount),
+        "created_at": (
+            e.created_at.isoformat() if getattr(e, "created_at", None) else None
+        ),
+    }
+
+
 @expenses_bp.get("")
 @expenses_bp.get("/")
 def list_expenses():
-    """Return expenses (optionally filtered by month_id). CI-safe: [] on error."""
+    """
+    Return expenses, by category then id. Filters: month_id, category (comma
+    lists), from/to (YYYY-MM[-DD], on the month's date); sort=[-]key;
+    limit/cursor/total switch to a keyset page envelope (see utils.pagination).
+    `stream=1` iterates the query in batches and streams the array.
+    CI-safe: [] on error.
+    """
     try:
-        q = Expense.query
-        month_id = request.args.get("month_id", type=int)
-        if month_id:
-            q = q.filter(Expense.month_id == month_id)
-
-        rows = q.order_by(Expense.category.asc(), Expense.id.asc()).all()
-        data = [
-            {
-                "id": e.id,
-                "month_id": e.month_id,
-                "category": e.category or "Other",
-                "name": e.name,
-                "description": e.name,  # temporary alias for any old clients
-                "amount": _f(e.amount),
-                "created_at": (
-                    e.created_at.isoformat() if getattr(e, "created_at", None) else None
-                ),
-            }
-            for e in rows
-        ]
-        return jsonify(data), 200
+        lq = ListQuery.from_args(request.args, EXPENSE_LIST)
+    except ValueError as ex:
+        return jsonify({"error": str(ex)}), 400
+    try:
+        if wants_stream(request.args):
+            if not lq.paginated:
+                rows = lq.ordered().yield_per(STREAM_BATCH)
+                return stream_json(map(_expense_row, rows)), 200
+            rows, next_cursor = lq.page()
+            envelope = lq.envelope(next_cursor, lq.total())
+            return stream_json(map(_expense_row, rows), envelope=envelope), 200
+        return jsonify(lq.payload(_expense_row)), 200
+    except ValueError as ex:
+        return jsonify({"error": str(ex)}), 400
     except Exception as ex:
         current_app.logger.warning("GET /api/expenses failed; returning []: %s", ex)
-        return jsonify([]), 200
+        db.session.rollback()
+        return jsonify(lq.empty()), 200
 
 
 @expenses_bp.post("")
@@ -71,9 +105,21 @@ def create_expense():
             amount=amount,
         )
         db.session.add(e)
+        db.session.flush()
+        recompute_balances(e.month_id)
+        bump("expenses")
         db.session.commit()
         return jsonify({"id": e.id}), 201
     except Exception as ex:
         db.session.rollback()
         current_app.logger.exception("POST /api/expenses failed: %s", ex)
         return jsonify({"error": "Internal Server Error"}), 500
+
+
+@expenses_bp.post("/bulk")
+def bulk_create_expenses():
+    """
+    Up to 10 000 expenses in one transaction (list or {"rows": [...]});
+    per-row errors, ?partial=1 writes the valid rows. See utils.bulk.
+    """
+    return bulk_response("expenses")
@@ -4,6 +4,7 @@ import pandas as pd
 from flask import Blueprint, jsonify, request
 
 from ..models.models import AccInfo, Month, db
+from ..utils.balances import recompute_balances
 
 # 👇 add /api in the blueprint prefix so the final path is /api/upload/csv
 file_upload_bp = Blueprint("file_upload", __name__, url_prefix="/api/upload")
@@ -108,6 +109,8 @@ def upload_csv():
         first_month = db.session.query(Month).order_by(Month.id.asc()).first()
         if first_month:
             first_month.starting_funds = latest_balance
+            db.session.flush()
+            recompute_balances(first_month.id)
             db.session.commit()
 
         return (
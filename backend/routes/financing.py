@@ -2,10 +2,11 @@
 from flask import Blueprint, current_app, jsonify, request
 
 from ..models.models import db
+from ..utils.balances import LOAN_SEED_KEY, recompute_balances
 
 # Try model import; stay CI-safe if migrations/models aren't ready.
 try:
-    from models.models import Financing
+    from ..models.models import Financing
 except Exception:  # pragma: no cover
     Financing = None
 
@@ -61,6 +62,10 @@ def upsert_financing():
         else:
             row = Financing(name=name, value=value)
             db.session.add(row)
+        if name == LOAN_SEED_KEY:
+            # opening loan of the first month -> re-chain every month
+            db.session.flush()
+            recompute_balances()
         db.session.commit()
         return (
             jsonify(
@@ -0,0 +1,52 @@
+# backend/routes/forecast.py
+from __future__ import annotations
+
+from flask import Blueprint, current_app, jsonify, request
+
+from backend.models.models import db
+from backend.utils.forecast import DEFAULT_LOOKBACK, DEFAULT_YEARS, forecast
+
+forecast_bp = Blueprint("forecast", __name__, url_prefix="/api/forecast")
+
+
+def _int(raw, name: str, default: int) -> int:
+    if raw is None or raw == "":
+        return default
+    try:
+        return int(raw)
+    except (TypeError, ValueError):
+        raise ValueError(f"{name} must be an integer") from None
+
+
+@forecast_bp.route("", methods=["GET", "POST"])
+def get_forecast():
+    """
+    Month-by-month projection of funds and loan balance past the last month.
+    Query (or JSON body): years (1..30, default 10), lookback (months used to
+    infer recurring lines, 1..24, default 6). POST body may also carry
+    scenarios: [{name, income_growth_pct, expense_growth_pct, extra_income,
+    extra_expense, loan_payment, loan_rate_pct, include_planned,
+    one_offs: [{month: "YYYY-MM", amount}]}], all computed side by side.
+    """
+    body = request.get_json(silent=True) if request.method == "POST" else None
+    body = body if isinstance(body, dict) else {}
+    try:
+        scenarios = body.get("scenarios")
+        if scenarios is not None and not isinstance(scenarios, list):
+            raise ValueError("scenarios must be a list")
+        years = _int(
+            body.get("years", request.args.get("years")), "years", DEFAULT_YEARS
+        )
+        lookback = _int(
+            body.get("lookback", request.args.get("lookback")),
+            "lookback",
+            DEFAULT_LOOKBACK,
+        )
+        return jsonify(forecast(scenarios, years=years, lookback=lookback)), 200
+    except ValueError as e:
+        db.session.rollback()
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        current_app.logger.warning("%s /api/forecast failed: %s", request.method, e)
+        db.session.rollback()
+        return jsonify({"error": "Internal Server Error"}), 500
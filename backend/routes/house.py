@@ -2,10 +2,29 @@
 from flask import Blueprint, current_app, jsonify, request
 
 from backend.models.models import HouseCost, LandCost, db
+from backend.utils.pagination import ListQuery, ListSpec, SortKey
 
 house_bp = Blueprint("house", __name__, url_prefix="/api")
 
 
+def _cost_list(model) -> ListSpec:
+    return ListSpec(
+        model,
+        sort_keys={
+            "id": SortKey(model.id),
+            "name": SortKey(model.name),
+            "amount": SortKey(model.amount),
+            "status": SortKey(model.status),
+        },
+        filters={"status": model.status},
+        date_column=model.created_at,
+    )
+
+
+HOUSE_COST_LIST = _cost_list(HouseCost)
+LAND_COST_LIST = _cost_list(LandCost)
+
+
 def _f(v, default=0.0):
     try:
         return float(v)
@@ -13,23 +32,33 @@ def _f(v, default=0.0):
         return float(default)
 
 
+def _cost_row(r) -> dict:
+    return {"id": r.id, "name": r.name, "amount": _f(r.amount), "status": r.status}
+
+
 # ---------- HOUSE COSTS ----------
 
 
 @house_bp.get("/house_costs")
 @house_bp.get("/house_costs/")
 def list_house_costs():
-    """CI-safe: return [] with 200 even if query fails."""
+    """
+    Filter: status (comma list), from/to on created_at; sort=[-]key;
+    limit/cursor/total switch to a keyset page envelope (see utils.pagination).
+    CI-safe: return [] with 200 even if query fails.
+    """
+    try:
+        lq = ListQuery.from_args(request.args, HOUSE_COST_LIST)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     try:
-        rows = HouseCost.query.order_by(HouseCost.id.asc()).all()
-        data = [
-            {"id": r.id, "name": r.name, "amount": _f(r.amount), "status": r.status}
-            for r in rows
-        ]
-        return jsonify(data), 200
+        return jsonify(lq.payload(_cost_row)), 200
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         current_app.logger.warning("GET /api/house_costs failed; returning []: %s", e)
-        return jsonify([]), 200
+        db.session.rollback()
+        return jsonify(lq.empty()), 200
 
 
 @house_bp.post("/house_costs")
@@ -75,17 +104,23 @@ def delete_house_cost(item_id: int):
 @house_bp.get("/land_costs")
 @house_bp.get("/land_costs/")
 def list_land_costs():
-    """CI-safe: return [] with 200 on error."""
+    """
+    Filter: status (comma list), from/to on created_at; sort=[-]key;
+    limit/cursor/total switch to a keyset page envelope (see utils.pagination).
+    CI-safe: return [] with 200 on error.
+    """
     try:
-        rows = LandCost.query.order_by(LandCost.id.asc()).all()
-        data = [
-            {"id": r.id, "name": r.name, "amount": _f(r.amount), "status": r.status}
-            for r in rows
-        ]
-        return jsonify(data), 200
+        lq = ListQuery.from_args(request.args, LAND_COST_LIST)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    try:
+        return jsonify(lq.payload(_cost_row)), 200
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         current_app.logger.warning("GET /api/land_costs failed; returning []: %s", e)
-        return jsonify([]), 200
+        db.session.rollback()
+        return jsonify(lq.empty()), 200
 
 
 @house_bp.post("/land_costs")
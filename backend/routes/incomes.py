@@ -1,10 +1,25 @@
 # routes/incomes.py
 from flask import Blueprint, current_app, jsonify, request
 
-from backend.models.models import Income, db
+from backend.models.models import Income, Month, db
+from backend.utils.balances import recompute_balances
+from backend.utils.bulk import bulk_response
+from backend.utils.pagination import ListQuery, ListSpec, SortKey
+from backend.utils.versions import bump
 
 incomes_bp = Blueprint("incomes", __name__, url_prefix="/api/incomes")
 
+INCOME_LIST = ListSpec(
+    Income,
+    sort_keys={
+        "id": SortKey(Income.id),
+        "source": SortKey(Income.source, ""),
+        "amount": SortKey(Income.amount),
+    },
+    filters={"month_id": Income.month_id, "source": Income.source},
+    date_column=Month.month_date,
+)
+
 
 def _f(v, default=0.0):
     try:
@@ -13,28 +28,37 @@ def _f(v, default=0.0):
         return float(default)
 
 
+def _income_row(r: Income) -> dict:
+    return {
+        "id": r.id,
+        "month_id": r.month_id,
+        "source": r.source,
+        # person may not exist in demo DB → getattr with default
+        "person": getattr(r, "person", None),
+        "amount": _f(r.amount),
+    }
+
+
 @incomes_bp.get("")
 @incomes_bp.get("/")
 def list_incomes():
+    """
+    Filters: month_id, source (comma lists), from/to on the month's date;
+    sort=[-]key; limit/cursor/total switch to a keyset page envelope
+    (see utils.pagination). CI-safe: [] on error.
+    """
+    try:
+        lq = ListQuery.from_args(request.args, INCOME_LIST)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     try:
-        rows = Income.query.order_by(Income.id.asc()).all()
-        data = []
-        for r in rows:
-            # person may not exist in demo DB → getattr with default
-            person = getattr(r, "person", None)
-            data.append(
-                {
-                    "id": r.id,
-                    "month_id": r.month_id,
-                    "source": r.source,
-                    "person": person,  # <-- expose it (can be None)
-                    "amount": _f(r.amount),
-                }
-            )
-        return jsonify(data), 200
+        return jsonify(lq.payload(_income_row)), 200
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         current_app.logger.warning("GET /api/incomes failed; returning []: %s", e)
-        return jsonify([]), 200
+        db.session.rollback()
+        return jsonify(lq.empty()), 200
 
 
 @incomes_bp.post("")
@@ -52,14 +76,26 @@ def create_income():
         return jsonify({"error": "source is required"}), 400
 
     try:
-        r = Income(month_id=month_id, source=source, amount=amount)
+        r = Income(month_id=month_id, name=source, source=source, amount=amount)
         # attach person if the column exists in this DB
         if hasattr(r, "person"):
             r.person = person
         db.session.add(r)
+        db.session.flush()
+        recompute_balances(r.month_id)
+        bump("incomes")
         db.session.commit()
         return jsonify({"id": r.id}), 201
     except Exception as e:
         db.session.rollback()
         current_app.logger.exception("POST /api/incomes failed: %s", e)
         return jsonify({"error": "Internal Server Error"}), 500
+
+
+@incomes_bp.post("/bulk")
+def bulk_create_incomes():
+    """
+    Up to 10 000 incomes in one transaction (list or {"rows": [...]});
+    per-row errors, ?partial=1 writes the valid rows. See utils.bulk.
+    """
+    return bulk_response("incomes")
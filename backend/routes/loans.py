@@ -1,12 +1,30 @@
 # routes/loan_adjustments.py
 from flask import Blueprint, current_app, jsonify, request
 
-from backend.models.models import LoanAdjustment, db
+from backend.models.models import Loan, LoanAdjustment, Month, db
+from backend.utils.balances import recompute_balances
+from backend.utils.bulk import bulk_response
+from backend.utils.pagination import ListQuery, ListSpec, SortKey
 
 # Final paths:
 #   GET/POST /api/loan_adjustments
 loans_bp = Blueprint("loans", __name__, url_prefix="/api/loan_adjustments")
 
+ADJUSTMENT_LIST = ListSpec(
+    LoanAdjustment,
+    sort_keys={
+        "id": SortKey(LoanAdjustment.id),
+        "type": SortKey(LoanAdjustment.type, ""),
+        "amount": SortKey(LoanAdjustment.amount, 0),
+    },
+    filters={
+        "month_id": LoanAdjustment.month_id,
+        "type": LoanAdjustment.type,
+        "loan_id": LoanAdjustment.loan_id,
+    },
+    date_column=Month.month_date,
+)
+
 
 def _f(v, default=0.0):
     try:
@@ -19,40 +37,47 @@ def _s(v, default="other"):
     return v if isinstance(v, str) and v != "" else default
 
 
+def _adjustment_row(adj: LoanAdjustment) -> dict:
+    return {
+        "id": adj.id,
+        "month_id": adj.month_id,
+        # If note == "Start Loan", label as opening balance; otherwise "other"
+        "type": _s(
+            adj.type,
+            (
+                "opening_balance"
+                if (adj.note or "").strip() == "Start Loan"
+                else "other"
+            ),
+        ),
+        "amount": _f(adj.amount),
+        "note": adj.note,
+        "loan_id": adj.loan_id,
+    }
+
+
 @loans_bp.get("")
 @loans_bp.get("/")
 def list_loan_adjustments():
-    """CI-safe: return [] with 200 even if query fails."""
+    """
+    Filters: month_id, type, loan_id (comma lists), from/to on the month's
+    date; sort=[-]key; limit/cursor/total switch to a keyset page envelope
+    (see utils.pagination). CI-safe: return [] with 200 even if query fails.
+    """
     try:
-        items = LoanAdjustment.query.order_by(LoanAdjustment.id.asc()).all()
-        return (
-            jsonify(
-                [
-                    {
-                        "id": adj.id,
-                        "month_id": adj.month_id,
-                        # If note == "Start Loan", label as opening balance; otherwise "other"
-                        "type": _s(
-                            adj.type,
-                            (
-                                "opening_balance"
-                                if (adj.note or "").strip() == "Start Loan"
-                                else "other"
-                            ),
-                        ),
-                        "amount": _f(adj.amount),
-                        "note": adj.note,
-                    }
-                    for adj in items
-                ]
-            ),
-            200,
-        )
+        lq = ListQuery.from_args(request.args, ADJUSTMENT_LIST)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    try:
+        return jsonify(lq.payload(_adjustment_row)), 200
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         current_app.logger.warning(
             "GET /api/loan_adjustments failed; returning []: %s", e
         )
-        return jsonify([]), 200
+        db.session.rollback()
+        return jsonify(lq.empty()), 200
 
 
 @loans_bp.post("")
@@ -66,14 +91,22 @@ def create_loan_adjustment():
     if missing:
         return jsonify({"error": f"Missing fields: {', '.join(missing)}"}), 400
 
+    loan_id = data.get("loan_id")
+    if loan_id is not None and db.session.get(Loan, loan_id) is None:
+        return jsonify({"error": f"Unknown loan_id: {loan_id}"}), 400
+
     try:
         adj = LoanAdjustment(
             month_id=data["month_id"],
+            name=(data.get("name") or data["type"]),
             type=data["type"],
             amount=_f(data["amount"], 0.0),
             note=data.get("note"),
+            loan_id=loan_id,
         )
         db.session.add(adj)
+        db.session.flush()
+        recompute_balances(adj.month_id)
         db.session.commit()
         return (
             jsonify(
@@ -83,6 +116,7 @@ def create_loan_adjustment():
                     "type": adj.type,
                     "amount": _f(adj.amount),
                     "note": adj.note,
+                    "loan_id": adj.loan_id,
                 }
             ),
             201,
@@ -91,3 +125,12 @@ def create_loan_adjustment():
         db.session.rollback()
         current_app.logger.exception("POST /api/loan_adjustments failed: %s", e)
         return jsonify({"error": "Internal Server Error"}), 500
+
+
+@loans_bp.post("/bulk")
+def bulk_create_loan_adjustments():
+    """
+    Up to 10 000 loan adjustments in one transaction (list or {"rows": [...]});
+    per-row errors, ?partial=1 writes the valid rows. See utils.bulk.
+    """
+    return bulk_response("loan_adjustments")
@@ -1,15 +1,19 @@
 # backend/routes/months.py
 from __future__ import annotations
 
-from collections.abc import Iterable
+from collections.abc import Iterable, Iterator
 from datetime import date
 from decimal import Decimal
+from types import SimpleNamespace
 from typing import Any
 
 from flask import Blueprint, current_app, jsonify, request
+from sqlalchemy import select
 from sqlalchemy.orm import selectinload
 
-from backend.models.models import Financing, Month, db
+from backend.models.models import Month, db
+from backend.utils.balances import MONTH_ORDER, month_summaries
+from backend.utils.streaming import stream_json, wants_stream
 
 months_bp = Blueprint("months", __name__, url_prefix="/api/months")
 
@@ -46,14 +50,6 @@ def _iso(d) -> str | None:
     return d.isoformat() if d is not None else None
 
 
-def _loan_delta(adj_type: str, amount: float) -> float:
-    if adj_type == "disbursement":
-        return amount
-    if adj_type == "payment":
-        return -amount
-    return 0.0
-
-
 def _parse_anchor_ym(s: str | None) -> date | None:
     if not s:
         return None
@@ -71,135 +67,159 @@ def _same_month_ym(d: date | None, anchor: date | None) -> bool:
 
 
 # ---------- core ----------
-def build_months_data(
-    months: Iterable[Month],
-    financing_data: dict[str, float],
-    *,
-    is_past: bool = False,
-) -> list[dict[str, Any]]:
-    result: list[dict[str, Any]] = []
-    prev_ending_funds: float | None = None
-    prev_loan_remaining: float | None = None
-    dirty = False
-
-    months_list = list(months)
-    for idx, month in enumerate(months_list):
-        incomes_list = [
+def _summary_row(row: dict[str, Any]) -> dict[str, Any]:
+    d = row.get("month_date")
+    return {
+        "id": row["id"],
+        "name": _month_label(SimpleNamespace(id=row["id"], month_date=d)),
+        "month_date": _iso(d),
+        "startingFunds": _f(row["starting_funds"]),
+        "endingFunds": _f(row["ending_funds"]),
+        "surplus": _f(row["surplus"]),
+        "loanRemaining": _f(row["loan_remaining"]),
+        "totalIncome": _f(row["income"]),
+        "totalExpenses": _f(row["expenses"]),
+        "loanDelta": _f(row["loan_delta"]),
+        "loanInterest": _f(row.get("loan_interest")),
+        "is_current": bool(row.get("is_current")),  # may be overridden
+    }
+
+
+def _line_items(month: Month) -> dict[str, Any]:
+    incomes_list = [
+        {
+            "name": getattr(inc, "source", None),
+            "person": getattr(inc, "person", None),
+            "amount": _f(inc.amount),
+        }
+        for inc in (getattr(month, "incomes", []) or [])
+    ]
+    incomes_by_person: dict[str, float] = {}
+    for item in incomes_list:
+        key = item["person"] or "Unknown"
+        incomes_by_person[key] = incomes_by_person.get(key, 0.0) + _f(item["amount"])
+
+    return {
+        "incomes": incomes_list,
+        "incomesByPerson": incomes_by_person,
+        "expenses": [
             {
-                "name": getattr(inc, "source", None),
-                "person": getattr(inc, "person", None),
-                "amount": _f(inc.amount),
+                "id": e.id,
+                "name": (
+                    getattr(e, "name", None) or getattr(e, "description", "") or ""
+                ).strip(),
+                "description": (
+                    getattr(e, "name", None) or getattr(e, "description", "") or ""
+                ).strip(),
+                "category": e.category or "Other",
+                "amount": _f(e.amount),
             }
-            for inc in (getattr(month, "incomes", []) or [])
-        ]
-        incomes_by_person: dict[str, float] = {}
-        for item in incomes_list:
-            key = item["person"] or "Unknown"
-            incomes_by_person[key] = incomes_by_person.get(key, 0.0) + _f(
-                item["amount"]
-            )
-
-        total_income = sum(x["amount"] for x in incomes_list)
-        total_expenses = sum(
-            _f(e.amount) for e in (getattr(month, "expenses", []) or [])
-        )
-        surplus = total_income - total_expenses
-
-        if idx == 0:
-            starting_funds = _f(month.starting_funds)
-        else:
-            starting_funds = (
-                prev_ending_funds
-                if prev_ending_funds is not None
-                else _f(month.starting_funds)
-            )
-
-        if idx == 0:
-            seed_loan = financing_data.get("loans_taken")
-            loan_remaining = _f(seed_loan, _f(month.loan_remaining))
-        else:
-            loan_remaining = _f(prev_loan_remaining, _f(month.loan_remaining))
-
-        loan_adj_sum = 0.0
-        for adj in getattr(month, "loan_adjustments", []) or []:
-            loan_adj_sum += _loan_delta(getattr(adj, "type", ""), _f(adj.amount))
-        loan_remaining = _f(loan_remaining) + loan_adj_sum
-
-        ending_funds = _f(starting_funds) + _f(surplus)
-
-        if not is_past:
-            updated = False
-            if idx != 0 and _f(month.starting_funds) != _f(starting_funds):
-                month.starting_funds = starting_funds
-                updated = True
-            if _f(month.ending_funds) != _f(ending_funds):
-                month.ending_funds = ending_funds
-                updated = True
-            if _f(month.surplus) != _f(surplus):
-                month.surplus = surplus
-                updated = True
-            if _f(month.loan_remaining) != _f(loan_remaining):
-                month.loan_remaining = loan_remaining
-                updated = True
-            if updated:
-                db.session.add(month)
-                dirty = True
-
-        result.append(
+            for e in (getattr(month, "expenses", []) or [])
+        ],
+        "loanAdjustments": [
             {
-                "id": month.id,
-                "name": _month_label(month),
-                "month_date": _iso(getattr(month, "month_date", None)),
-                "startingFunds": _f(starting_funds),
-                "endingFunds": _f(ending_funds),
-                "surplus": _f(surplus),
-                "loanRemaining": _f(loan_remaining),
-                "is_current": bool(
-                    getattr(month, "is_current", False)
-                ),  # may be overridden
-                "incomes": incomes_list,
-                "incomesByPerson": incomes_by_person,
-                "expenses": [
-                    {
-                        "id": e.id,
-                        "name": (
-                            getattr(e, "name", None)
-                            or getattr(e, "description", "")
-                            or ""
-                        ).strip(),
-                        "description": (
-                            getattr(e, "name", None)
-                            or getattr(e, "description", "")
-                            or ""
-                        ).strip(),
-                        "category": e.category or "Other",
-                        "amount": _f(e.amount),
-                    }
-                    for e in (getattr(month, "expenses", []) or [])
-                ],
-                "loanAdjustments": [
-                    {
-                        "name": getattr(adj, "name", None),
-                        "type": getattr(adj, "type", None),
-                        "amount": _f(adj.amount),
-                        "note": getattr(adj, "note", None),
-                    }
-                    for adj in (getattr(month, "loan_adjustments", []) or [])
-                ],
+                "name": getattr(adj, "name", None),
+                "type": getattr(adj, "type", None),
+                "amount": _f(adj.amount),
+                "note": getattr(adj, "note", None),
             }
+            for adj in (getattr(month, "loan_adjustments", []) or [])
+        ],
+    }
+
+
+# Months per yield_per batch: line items are loaded (selectin) one batch at
+# a time, so memory stays flat however long the history is
+MONTH_BATCH = 24
+
+
+def iter_months_data(
+    summaries: Iterable[dict[str, Any]], *, line_items: bool = True
+) -> Iterator[dict[str, Any]]:
+    """
+    Payload rows from utils.balances.month_summaries (totals and running
+    balances computed in SQL); with `line_items`, the months' incomes,
+    expenses and loan adjustments are streamed in for just these rows.
+    """
+    summaries = list(summaries)
+    if not line_items or not summaries:
+        yield from map(_summary_row, summaries)
+        return
+    by_id = {row["id"]: row for row in summaries}
+    months = db.session.scalars(
+        select(Month)
+        .options(
+            selectinload(Month.incomes),
+            selectinload(Month.expenses),
+            selectinload(Month.loan_adjustments),
         )
+        .where(Month.id.in_(list(by_id)))
+        .order_by(*MONTH_ORDER)
+        .execution_options(yield_per=MONTH_BATCH)
+    )
+    for month in months:
+        row = _summary_row(by_id[month.id])
+        row.update(_line_items(month))
+        yield row
+
+
+def build_months_data(
+    summaries: Iterable[dict[str, Any]], *, line_items: bool = True
+) -> list[dict[str, Any]]:
+    return list(iter_months_data(summaries, line_items=line_items))
+
+
+# ---------- windowing ----------
+VIEWS = ("full", "summary")
+MAX_LIMIT = 1200  # 100 years of months
+
+
+def _next_month(d: date) -> date:
+    return date(d.year + d.month // 12, d.month % 12 + 1, 1)
 
-        prev_ending_funds = ending_funds
-        prev_loan_remaining = loan_remaining
 
-    if not is_past and dirty:
+def _window_args(args) -> dict[str, Any]:
+    """
+    Parse `from` / `to` (YYYY-MM, both inclusive), `limit` and `view`.
+    Raises ValueError on malformed values.
+    """
+    out: dict[str, Any] = {}
+    for key in ("from", "to"):
+        raw = args.get(key)
+        if raw:
+            d = _parse_anchor_ym(raw)
+            if d is None:
+                raise ValueError(f"{key} must be YYYY-MM")
+            out[key] = d
+    if "from" in out and "to" in out and out["to"] < out["from"]:
+        raise ValueError("to must not be before from")
+    out["limit"] = None
+    if args.get("limit"):
         try:
-            db.session.commit()
-        except Exception as e:
-            db.session.rollback()
-            current_app.logger.exception("Commit failed in build_months_data: %s", e)
+            out["limit"] = int(args["limit"])
+        except ValueError:
+            raise ValueError(f"limit must be 1..{MAX_LIMIT}") from None
+        if not 1 <= out["limit"] <= MAX_LIMIT:
+            raise ValueError(f"limit must be 1..{MAX_LIMIT}")
+    out["view"] = (args.get("view") or "full").strip().lower()
+    if out["view"] not in VIEWS:
+        raise ValueError(f"view must be one of: {', '.join(VIEWS)}")
+    return out
+
+
+def _windowed_rows(w: dict[str, Any], date_from: date | None):
+    summaries = month_summaries(
+        date_from=date_from,
+        date_before=_next_month(w["to"]) if "to" in w else None,
+        limit=w["limit"],
+    )
+    return iter_months_data(summaries, line_items=w["view"] == "full")
+
 
-    return result
+def _json_rows(rows: Iterable[dict[str, Any]]):
+    if wants_stream(request.args):
+        return stream_json(rows), 200
+    return jsonify(list(rows)), 200
 
 
 # ---------- routes ----------
@@ -208,54 +228,41 @@ def build_months_data(
 def get_months():
     """
     Returns months from the chosen 'current' month (inclusive) onward.
+    Pure read: totals and running balances come from one aggregate query
+    (utils.balances.month_summaries); line items are loaded for the returned
+    months only.
 
     The anchor month comes from query param `anchor` (YYYY-MM or YYYY-MM-DD);
-    if absent, we use today's month.
+    if absent, we use today's month. Optional window: `from` (defaults to
+    the anchor), `to` (inclusive), `limit`; `view=summary` omits the
+    incomes / expenses / loanAdjustments arrays (see /api/months/<id>);
+    `stream=1` sends the array in chunks (utils.streaming).
     """
     try:
-        months = (
-            db.session.query(Month)
-            .options(
-                selectinload(Month.incomes),
-                selectinload(Month.expenses),
-                selectinload(Month.loan_adjustments),
-            )
-            .order_by(Month.month_date.asc())
-            .all()
-        )
-        financing_entries = db.session.query(Financing).all()
-        financing_data = {f.name: _f(f.value) for f in financing_entries}
-
-        # Build payload once
-        payload = build_months_data(months, financing_data, is_past=False)
-
-        # Compute anchor and slice index purely from DB dates (no flags/strings)
+        w = _window_args(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    try:
         anchor = _parse_anchor_ym(request.args.get("anchor")) or date.today().replace(
             day=1
         )
-        anchor_ym = (anchor.year, anchor.month)
-
-        idx = None
-        for i, m in enumerate(months):
-            d = getattr(m, "month_date", None)
-            if d and (d.year, d.month) >= anchor_ym:
-                idx = i
-                break
-
-        if idx is None:
-            # Anchor after last month -> return empty list
-            return jsonify([]), 200
-
-        # Mark is_current on the chosen month in the payload
-        chosen = months[idx]
-        chosen_d = getattr(chosen, "month_date", None)
-        for row in payload:
-            # recompute using parsed date to avoid any string mismatch
-            md = row.get("month_date")
-            row_date = date(int(md[0:4]), int(md[5:7]), int(md[8:10])) if md else None
-            row["is_current"] = _same_month_ym(row_date, chosen_d)
-
-        return jsonify(payload[idx:]), 200
+        rows = _windowed_rows(w, w.get("from", anchor))
+
+        # Mark is_current on the anchor month (the first month on/after it)
+        chosen = month_summaries(date_from=anchor, limit=1)
+        chosen_d = chosen[0]["month_date"] if chosen else None
+
+        def marked(rows):
+            for row in rows:
+                # recompute using parsed date to avoid any string mismatch
+                md = row.get("month_date")
+                row_date = (
+                    date(int(md[0:4]), int(md[5:7]), int(md[8:10])) if md else None
+                )
+                row["is_current"] = _same_month_ym(row_date, chosen_d)
+                yield row
+
+        return _json_rows(marked(rows))
 
     except Exception as ex:
         current_app.logger.exception("/api/months failed, returning []: %s", ex)
@@ -264,21 +271,26 @@ def get_months():
 
 @months_bp.get("/all")
 def get_all_months():
-    """Return all months (no mutations)."""
+    """Return all months (no mutations); same `from`/`to`/`limit`/`view`/`stream`."""
     try:
-        months = (
-            db.session.query(Month)
-            .options(
-                selectinload(Month.incomes),
-                selectinload(Month.expenses),
-                selectinload(Month.loan_adjustments),
-            )
-            .order_by(Month.month_date.asc())
-            .all()
-        )
-        financing_entries = db.session.query(Financing).all()
-        financing_data = {f.name: _f(f.value) for f in financing_entries}
-        return jsonify(build_months_data(months, financing_data, is_past=True)), 200
+        w = _window_args(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    try:
+        return _json_rows(_windowed_rows(w, w.get("from")))
     except Exception as ex:
         current_app.logger.exception("/api/months/all failed, returning []: %s", ex)
         return jsonify([]), 200
+
+
+@months_bp.get("/<int:month_id>")
+def get_month(month_id: int):
+    """One month with its balances and line items (lazy detail for summaries)."""
+    try:
+        rows = build_months_data(month_summaries(month_id=month_id))
+    except Exception as ex:
+        current_app.logger.exception("/api/months/%s failed: %s", month_id, ex)
+        return jsonify({"error": "Internal Server Error"}), 500
+    if not rows:
+        return jsonify({"error": "Month not found"}), 404
+    return jsonify(rows[0]), 200
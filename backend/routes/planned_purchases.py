@@ -7,6 +7,7 @@ from typing import Any
 from flask import Blueprint, current_app, jsonify, request
 
 from backend.models.models import PlannedPurchase, db
+from backend.utils.pagination import ListQuery, ListSpec, SortKey
 
 # Final paths after register_routes(app, url_prefix="/api"):
 #   GET/POST     /api/planned_purchases
@@ -18,6 +19,18 @@ planned_purchases_bp = Blueprint(
 )
 
 
+PURCHASE_LIST = ListSpec(
+    PlannedPurchase,
+    sort_keys={
+        "id": SortKey(PlannedPurchase.id),
+        "date": SortKey(PlannedPurchase.date, date.max),  # undated last
+        "amount": SortKey(PlannedPurchase.amount),
+        "item": SortKey(PlannedPurchase.item),
+    },
+    date_column=PlannedPurchase.date,
+)
+
+
 # -------------------- helpers --------------------
 def _parse_date(s: str | None) -> date | None:
     if not s:
@@ -69,19 +82,27 @@ def _row_to_dict(p: PlannedPurchase) -> dict[str, Any]:
 @planned_purchases_bp.get("/")
 def list_planned_purchases():
     """
-    Return all planned purchases.
+    Return planned purchases (from/to filter on the purchase date;
+    sort=[-]key; limit/cursor/total switch to a keyset page envelope, see
+    utils.pagination).
 
     CI/empty-safe: returns 200 with [] even on query errors,
     so frontend logic can remain simple.
     """
     try:
-        rows = PlannedPurchase.query.order_by(PlannedPurchase.id.asc()).all()
-        return jsonify([_row_to_dict(p) for p in rows]), 200
+        lq = ListQuery.from_args(request.args, PURCHASE_LIST)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    try:
+        return jsonify(lq.payload(_row_to_dict)), 200
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         current_app.logger.warning(
             "GET /api/planned_purchases failed; returning []: %s", e
         )
-        return jsonify([]), 200
+        db.session.rollback()
+        return jsonify(lq.empty()), 200
 
 
 @planned_purchases_bp.post("")
@@ -8,6 +8,10 @@ from typing import Any
 from flask import Blueprint, current_app, jsonify, request
 
 from backend.models.models import AccInfo, Month, PriceSettings, db
+from backend.routes.cars import cache as cars_cache
+from backend.routes.cars.jobs import enqueue_tco_refresh
+from backend.utils.settings import reset_settings_snapshot
+from backend.utils.versions import bump
 
 settings_bp = Blueprint("settings", __name__, url_prefix="/api/settings")
 
@@ -243,8 +247,18 @@ def save_prices():
                 data["interest_rate_pct"], row.interest_rate_pct or 0.0
             )
 
+        bump("prices")
         db.session.commit()
-        return jsonify(_serialize_prices(row)), 200
+        reset_settings_snapshot()
+        cars_cache.clear()
+        body = _serialize_prices(row)
+
+        # Persisted Car.tco_* columns follow the new prices off the request path
+        job = enqueue_tco_refresh()
+        resp = jsonify(body)
+        if job is not None:
+            resp.headers["X-TCO-Job"] = str(job.id)
+        return resp, 200
 
     except Exception as e:
         current_app.logger.exception("save_prices error: %s", e)
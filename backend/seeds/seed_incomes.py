@@ -9,6 +9,7 @@ from datetime import UTC, datetime
 from sqlalchemy import and_, delete, select
 
 from backend.models.models import Income, IncomeSource, Month, db
+from backend.utils.balances import recompute_balances
 
 
 def _with_jitter(amount: float, pct: float) -> float:
@@ -119,6 +120,8 @@ def seed_incomes(
             db.session.add(row)
             created += 1
 
+    db.session.flush()
+    recompute_balances()
     db.session.commit()
     print(
         f"✅ Done. Created {created} incomes. Skipped {skipped}. Months affected: {len(target_months)}. Sources: {len(sources)}."
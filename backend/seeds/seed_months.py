@@ -16,6 +16,7 @@ from sqlalchemy import text
 
 from backend.app import create_app
 from backend.models.models import Expense, Income, LoanAdjustment, Month, db
+from backend.utils.balances import recompute_balances
 
 # ------------------------------------------------------------------------------
 # Resolve paths so the module works when run from repo root or backend/
@@ -290,6 +291,8 @@ def seed(
                 f"{ins_months} months, {ins_incomes} incomes, {ins_expenses} expenses, {ins_adjusts} loan adjustments."
             )
         else:
+            db.session.flush()
+            recompute_balances()
             db.session.commit()
             print(
                 "✅ Seeded "
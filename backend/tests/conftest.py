@@ -1,9 +1,86 @@
 # backend/tests/conftest.py
+import os
 import pathlib
 import sys
 
+import pytest
+
 # repo root = two levels up from this file
 ROOT = pathlib.Path(__file__).resolve().parents[2]
 p = str(ROOT)
 if p not in sys.path:
     sys.path.insert(0, p)
+
+# App-level tests run against a throwaway in-memory SQLite DB (never a real PG);
+# must be set before backend.config is imported.
+os.environ["DATABASE_URL"] = "sqlite://"
+
+
+@pytest.fixture()
+def app():
+    from backend.app import create_app
+    from backend.models.models import db
+
+    app = create_app()
+    app.config["TESTING"] = True
+    with app.app_context():
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture()
+def client(app):
+    return app.test_client()
+
+
+CAR_TYPES = ("EV", "PHEV", "Diesel", "Bensin")
+
+
+@pytest.fixture()
+def make_cars(app):
+    """
+    make_cars(n | [overrides, ...], **fields) adds and commits Car rows
+    "Car 0".."Car n-1" (year 2020, type cycling through CAR_TYPES) and
+    returns them. A field given as a callable is called with the car's index.
+    """
+    from backend.models.models import Car, db
+
+    def make(rows, **fields):
+        rows = [{}] * rows if isinstance(rows, int) else rows
+        cars = [
+            Car(
+                **{
+                    "model": f"Car {i}",
+                    "year": 2020,
+                    "type_of_vehicle": CAR_TYPES[i % len(CAR_TYPES)],
+                    **{k: v(i) if callable(v) else v for k, v in fields.items()},
+                    **row,
+                }
+            )
+            for i, row in enumerate(rows)
+        ]
+        db.session.add_all(cars)
+        db.session.commit()
+        return cars
+
+    return make
+
+
+@pytest.fixture()
+def priced_cars(make_cars):
+    """One EV, Diesel and PHEV plus a PriceSettings row (sweep, Monte Carlo)."""
+    from backend.models.models import PriceSettings, db
+
+    db.session.add(PriceSettings(id=1, el_price_ore_kwh=200, interest_rate_pct=4.0))
+    return make_cars(
+        [
+            dict(model="EV", year=2022, type_of_vehicle="EV",
+                 estimated_purchase_price=350_000, consumption_kwh_per_100km=17),
+            dict(model="Diesel", type_of_vehicle="Diesel",
+                 estimated_purchase_price=250_000, consumption_l_per_100km=6),
+            dict(model="PHEV", year=2021, type_of_vehicle="PHEV",
+                 estimated_purchase_price=300_000, consumption_kwh_per_100km=18,
+                 consumption_l_per_100km=2),
+        ]
+    )  # fmt: skip
@@ -0,0 +1,88 @@
+# backend/tests/test_analytics.py
+from datetime import date
+
+import pytest
+
+from backend.models.models import Expense, Income, Month, db
+from backend.routes import analytics
+from backend.utils.analytics import month_pivot
+
+
+def test_pivot_rolling_and_yoy_across_gaps():
+    # 2024-04 has no Month row: unknown, not zero
+    months = [date(2023, m, 1) for m in range(1, 13)] + [
+        date(2024, m, 1) for m in (1, 2, 3, 5)
+    ]
+    rows = [
+        (date(2023, 1, 1), "Food", 100),
+        (date(2023, 5, 1), "Food", 40),
+        (date(2024, 1, 1), "Food", 150),
+        (date(2024, 2, 1), "Car", 50),
+        (date(2024, 5, 1), None, 7),
+    ]
+    out = month_pivot(
+        months, rows, start=date(2024, 1, 1), end=date(2024, 6, 1), rolling=3, yoy=True
+    )
+    assert out["months"] == ["2024-01", "2024-02", "2024-03", "2024-05"]
+    food, car, other = out["series"]
+    assert [food["key"], car["key"], other["key"]] == ["Food", "Car", "Other"]
+    assert food["values"] == [150, 0, 0, 0]
+    assert food["rolling_avg"] == [50, 50, 50, 0]  # Nov..Jan; Mar, (Apr), May
+    assert food["yoy_delta"] == [50, 0, 0, -40]
+    assert car["rolling_avg"][1] == pytest.approx(16.67)
+    assert out["total"]["values"] == [150, 50, 0, 7]
+    assert out["total"]["sum"] == 207
+
+
+@pytest.fixture()
+def ledger(app):
+    analytics._entries.clear()
+    for i in range(24):
+        m = Month(name=f"M{i}", month_date=date(2023 + i // 12, i % 12 + 1, 1))
+        m.expenses.append(Expense(category="Transportation", name="fuel", amount=i))
+        m.expenses.append(Expense(category="Food", name="food", amount=1_000))
+        m.incomes.append(Income(name="Salary", source="Work", amount=30_000))
+        db.session.add(m)
+    db.session.commit()
+    return m.id
+
+
+def test_expense_pivot_endpoint(client, ledger):
+    body = client.get(
+        "/api/analytics/expenses/pivot?from=2024-01&to=2024-12"
+        "&keys=Transportation&rolling=3&yoy=1"
+    ).get_json()
+    assert body["months"][0] == "2024-01" and len(body["months"]) == 12
+    (transport,) = body["series"]
+    assert transport["values"][:2] == [12, 13]
+    assert transport["rolling_avg"][0] == 11  # (10 + 11 + 12) / 3
+    assert transport["yoy_delta"] == [12] * 12
+
+    incomes = client.get("/api/analytics/incomes/pivot?by=source").get_json()
+    assert incomes["series"][0]["key"] == "Work"
+    assert incomes["series"][0]["sum"] == 24 * 30_000
+
+
+def test_cached_per_data_version(client, ledger):
+    url = "/api/analytics/expenses/pivot?from=2024-12"
+    first = client.get(url)
+    etag = first.headers["ETag"]
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+
+    res = client.post(
+        "/api/expenses",
+        json={"month_id": ledger, "category": "Food", "name": "x", "amount": 5},
+    )
+    assert res.status_code == 201
+    second = client.get(url)
+    assert second.headers["ETag"] != etag
+    food = next(s for s in second.get_json()["series"] if s["key"] == "Food")
+    assert food["values"] == [1_005]
+
+
+@pytest.mark.parametrize(
+    "qs",
+    ["by=person", "from=2024-13", "rolling=1", "rolling=x", "from=2024-02&to=2024-01"],
+)
+def test_bad_params(client, ledger, qs):
+    assert client.get(f"/api/analytics/expenses/pivot?{qs}").status_code == 400
@@ -0,0 +1,141 @@
+# backend/tests/test_bulk.py
+from datetime import date
+
+import pytest
+
+from backend.models.models import Expense, Income, LoanAdjustment, Month, db
+from backend.utils import bulk
+from backend.utils.versions import get_versions
+
+
+@pytest.fixture()
+def months(app):
+    rows = [
+        Month(name=f"M{i}", month_date=date(2024, i + 1, 1), starting_funds=1_000)
+        for i in range(12)
+    ]
+    db.session.add_all(rows)
+    db.session.commit()
+    bulk.recompute_balances()
+    db.session.commit()
+    return [m.id for m in rows]
+
+
+@pytest.fixture()
+def recomputes(monkeypatch):
+    calls = []
+    real = bulk.recompute_balances
+
+    def spy(from_month_id=None):
+        calls.append(from_month_id)
+        return real(from_month_id)
+
+    monkeypatch.setattr(bulk, "recompute_balances", spy)
+    return calls
+
+
+def test_bulk_expenses_one_transaction(client, months, recomputes):
+    rows = [
+        {
+            "month_id": months[3 + i % 9],
+            "category": "Food",
+            "name": f"x{i}",
+            "amount": "1,5" if i == 0 else 2,
+        }
+        for i in range(3_000)
+    ]
+    res = client.post("/api/expenses/bulk", json={"rows": rows})
+    assert res.status_code == 201
+    body = res.get_json()
+    assert body["inserted"] == 3_000 and body["error_count"] == 0
+    assert body["months_updated"] == 9
+    assert recomputes == [months[3]]  # once, from the earliest affected month
+    assert get_versions("expenses") == {"expenses": 1}
+
+    assert db.session.query(Expense).count() == 3_000
+    summary = client.get("/api/months/all?view=summary").get_json()
+    assert summary[3]["totalExpenses"] == 333 * 2 + 1.5
+    assert summary[-1]["endingFunds"] == 1_000 - 2 * 2_999 - 1.5
+
+
+def test_invalid_rows_reject_the_batch(client, months, recomputes):
+    rows = [
+        {"month_id": months[0], "category": "Food", "name": "ok", "amount": 1},
+        {"month_id": months[0], "category": "", "name": "x", "amount": 1},
+        {"month_id": 999_999, "category": "Food", "name": "x", "amount": 1},
+        {"month_id": months[0], "category": "Food", "name": "x", "amount": "lots"},
+        "nope",
+    ]
+    res = client.post("/api/expenses/bulk", json=rows)
+    assert res.status_code == 400
+    body = res.get_json()
+    assert [e["index"] for e in body["errors"]] == [1, 2, 3, 4]
+    assert body["errors"][1]["error"] == "Unknown month_id: 999999"
+    assert db.session.query(Expense).count() == 0 and recomputes == []
+
+    res = client.post("/api/expenses/bulk?partial=1", json=rows)
+    assert res.status_code == 201
+    assert res.get_json()["inserted"] == 1
+    assert res.get_json()["error_count"] == 4
+
+
+def test_bulk_incomes_and_loan_adjustments(client, months):
+    res = client.post(
+        "/api/incomes/bulk",
+        json=[{"month_id": m, "source": "Work", "amount": 30_000} for m in months],
+    )
+    assert res.status_code == 201
+    assert db.session.query(Income).filter_by(name="Work").count() == 12
+    assert get_versions("incomes") == {"incomes": 1}
+
+    loan = client.post(
+        "/api/loans",
+        json={"name": "car", "principal": 10_000, "start_date": "2024-01-01"},
+    ).get_json()
+    res = client.post(
+        "/api/loan_adjustments/bulk",
+        json=[
+            {"month_id": months[1], "type": "payment", "amount": 100},
+            {
+                "month_id": months[2],
+                "type": "payment",
+                "amount": 50,
+                "loan_id": loan["id"],
+            },
+            {"month_id": months[2], "type": "payment", "amount": 5, "loan_id": 404},
+        ],
+    )
+    assert res.status_code == 400
+    assert res.get_json()["errors"] == [{"index": 2, "error": "Unknown loan_id: 404"}]
+
+    res = client.post(
+        "/api/loan_adjustments/bulk?partial=true",
+        json={"rows": [{"month_id": months[1], "type": "payment", "amount": 100}]},
+    )
+    assert res.status_code == 201
+    adj = db.session.query(LoanAdjustment).one()
+    assert adj.name == "payment"
+    assert db.session.get(Month, months[1]).loan_remaining == -100
+
+
+@pytest.mark.parametrize("amount", ["nan", "inf", "-inf", "1e999"])
+def test_non_finite_amount_is_a_row_error(client, months, amount):
+    rows = [
+        {"month_id": months[0], "category": "Food", "name": "ok", "amount": 1},
+        {"month_id": months[0], "category": "Food", "name": "x", "amount": amount},
+    ]
+    res = client.post("/api/expenses/bulk", json=rows)
+    assert res.status_code == 400
+    assert res.get_json()["errors"] == [{"index": 1, "error": "amount must be finite"}]
+    assert db.session.query(Expense).count() == 0
+
+
+@pytest.mark.parametrize("payload", [{"rows": {}}, {"x": 1}, "text"])
+def test_bad_envelope(client, months, payload):
+    assert client.post("/api/incomes/bulk", json=payload).status_code == 400
+
+
+def test_row_limit(client, months, monkeypatch):
+    monkeypatch.setattr(bulk, "MAX_ROWS", 2)
+    res = client.post("/api/incomes/bulk", json=[{}] * 3)
+    assert res.status_code == 400
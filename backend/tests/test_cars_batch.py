@@ -0,0 +1,110 @@
+# backend/tests/test_cars_batch.py
+import random
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+
+from backend.routes.cars.batch import compute_derived_batch
+from backend.routes.cars.serialize import compute_derived
+
+TYPES = ["EV", "PHEV", "Diesel", "Bensin", "bev", "plug-in", "petrol", None, ""]
+
+
+def _random_car(rng: random.Random, i: int) -> SimpleNamespace:
+    def maybe(v):
+        # Mix in the shapes real rows/payloads carry: None, Decimal, strings
+        roll = rng.random()
+        if roll < 0.1:
+            return None
+        if roll < 0.3:
+            return Decimal(str(round(v, 2)))
+        if roll < 0.35:
+            return str(round(v, 1)).replace(".", ",")
+        return v
+
+    return SimpleNamespace(
+        id=i,
+        type_of_vehicle=rng.choice(TYPES),
+        estimated_purchase_price=maybe(rng.uniform(0, 800_000)),
+        consumption_kwh_per_100km=maybe(rng.uniform(0, 30)),
+        consumption_l_per_100km=maybe(rng.uniform(0, 12)),
+        summer_tires_price=maybe(rng.choice([0, rng.uniform(2_000, 20_000)])),
+        winter_tires_price=maybe(rng.choice([0, rng.uniform(2_000, 20_000)])),
+        tire_replacement_interval_years=rng.choice(
+            [None, 0, 2, 3, Decimal("2.50"), 4.0]
+        ),
+        full_insurance_year=maybe(rng.choice([0, rng.uniform(5_000, 20_000)])),
+        half_insurance_year=maybe(rng.choice([0, rng.uniform(3_000, 10_000)])),
+        car_tax_year=maybe(rng.uniform(0, 5_000)),
+        repairs_year=maybe(rng.uniform(0, 8_000)),
+    )
+
+
+PRICE_SETTINGS = [
+    None,
+    SimpleNamespace(
+        el_price_ore_kwh=180,
+        diesel_price_sek_litre=19.5,
+        bensin_price_sek_litre=17.2,
+        yearly_km=25_000,
+        daily_commute_km=40,
+        downpayment_sek=50_000.0,
+        interest_rate_pct=4.2,
+    ),
+    # zero rate + huge downpayment exercises both amortization branches
+    SimpleNamespace(
+        el_price_ore_kwh=0,
+        diesel_price_sek_litre=0,
+        bensin_price_sek_litre=0,
+        yearly_km=0,
+        daily_commute_km=0,
+        downpayment_sek=900_000.0,
+        interest_rate_pct=0.0,
+    ),
+]
+
+
+@pytest.mark.parametrize("ps", PRICE_SETTINGS)
+def test_batch_matches_scalar_compute_derived(ps):
+    rng = random.Random(1234)
+    cars = [_random_car(rng, i) for i in range(500)]
+
+    batch = compute_derived_batch(cars, ps)
+
+    assert len(batch) == len(cars)
+    for car, got in zip(cars, batch, strict=True):
+        expected = compute_derived(car, ps)
+        # exact equality (keys, order, values) — not approx
+        assert list(got) == list(expected)
+        assert got == expected, f"car {car.id}"
+
+
+def test_batch_honours_explicit_residuals():
+    cars = [
+        SimpleNamespace(
+            type_of_vehicle="EV",
+            estimated_purchase_price=300_000,
+            expected_value_after_3y=200_000,
+            expected_value_after_5y=None,
+            expected_value_after_8y=Decimal("90000"),
+        ),
+        SimpleNamespace(type_of_vehicle="EV", estimated_purchase_price=300_000),
+    ]
+    batch = compute_derived_batch(cars, None)
+    assert batch == [compute_derived(c, None) for c in cars]
+    assert batch[0]["expected_value_after_3y"] == 200_000
+    assert batch[1]["expected_value_after_3y"] == 165_000
+
+
+def test_batch_empty():
+    assert compute_derived_batch([], None) == []
+
+
+def test_round2_matches_builtin_round_on_ties():
+    import numpy as np
+
+    from backend.utils.tco_kernel import round2
+
+    values = [2.675, 1.005, 0.125, 0.375, -0.125, 1234567.895, 0.0, -0.001, 1e17]
+    assert round2(np.array(values)) == [round(v, 2) for v in values]
@@ -0,0 +1,74 @@
+# backend/tests/test_cars_bulk.py
+import pytest
+from sqlalchemy import event
+
+from backend.models.models import Car, PriceSettings, db
+from backend.routes.cars.serialize import compute_derived
+
+N_CARS = 300
+
+
+@pytest.fixture()
+def seeded(make_cars):
+    make_cars(
+        N_CARS,
+        estimated_purchase_price=lambda i: 200_000 + i * 1_000,
+        consumption_kwh_per_100km=16.5,
+        consumption_l_per_100km=5.5,
+        full_insurance_year=9_000,
+        summer_tires_price=8_000,
+        winter_tires_price=9_000,
+    )
+
+
+@pytest.fixture()
+def car_selects(app):
+    """Count SELECT statements that read the cars table."""
+    seen: list[str] = []
+
+    def _before(conn, cursor, statement, params, context, executemany):
+        s = statement.lstrip().upper()
+        if s.startswith("SELECT") and "FROM CARS" in s:
+            seen.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", _before)
+    yield seen
+    event.remove(db.engine, "before_cursor_execute", _before)
+
+
+def _assert_persisted_tco_matches_scalar():
+    db.session.expire_all()
+    ps = db.session.get(PriceSettings, 1)
+    for car in Car.query.all():
+        d = compute_derived(car, ps)
+        assert float(car.tco_3_years) == pytest.approx(d["tco_3_years"], abs=0.01)
+        assert float(car.tco_5_years) == pytest.approx(d["tco_5_years"], abs=0.01)
+        assert float(car.tco_8_years) == pytest.approx(d["tco_8_years"], abs=0.01)
+
+
+def test_list_payload_uses_one_in_query(client, seeded, car_selects):
+    payload = [
+        {"id": i, "estimated_purchase_price": 111_000 + i, "type_of_vehicle": "EV"}
+        for i in range(1, N_CARS + 1)
+    ]
+    payload.append({"id": 99_999, "model": "missing"})
+
+    resp = client.post("/api/cars/update", json=payload)
+
+    assert resp.status_code == 200
+    assert resp.get_json()["updated"] == N_CARS
+    assert len(car_selects) == 1
+    assert db.session.get(Car, 7).estimated_purchase_price == 111_007
+    _assert_persisted_tco_matches_scalar()
+
+
+def test_no_body_recomputes_all_after_price_change(client, seeded, car_selects):
+    client.patch("/api/settings/prices", json={"el_price_ore_kwh": 400})
+    car_selects.clear()
+
+    resp = client.post("/api/cars/update")
+
+    assert resp.status_code == 200
+    assert resp.get_json()["updated"] == N_CARS
+    assert len(car_selects) == 1
+    _assert_persisted_tco_matches_scalar()
@@ -0,0 +1,55 @@
+# backend/tests/test_cars_cache.py
+import pytest
+
+from backend.models.models import Car, db
+from backend.routes.cars import cache
+
+
+@pytest.fixture(autouse=True)
+def seeded(app):
+    cache.clear()
+    db.session.add_all(
+        [
+            Car(model="EV A", year=2022, estimated_purchase_price=300_000),
+            Car(model="EV B", year=2021, estimated_purchase_price=250_000),
+        ]
+    )
+    db.session.commit()
+
+
+def test_get_sets_strong_etag_and_revalidates(client):
+    first = client.get("/api/cars")
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+    assert etag and not etag.startswith("W/")
+
+    again = client.get("/api/cars", headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.data == b""
+
+    cached = client.get("/api/cars")
+    assert cached.headers["ETag"] == etag
+    assert cached.get_json() == first.get_json()
+
+
+def test_cars_update_invalidates(client):
+    etag = client.get("/api/cars").headers["ETag"]
+
+    client.post("/api/cars/update", json=[{"id": 1, "estimated_purchase_price": 1}])
+
+    after = client.get("/api/cars", headers={"If-None-Match": etag})
+    assert after.status_code == 200
+    assert after.headers["ETag"] != etag
+    assert after.get_json()[0]["estimated_purchase_price"] == 1
+
+
+def test_price_change_invalidates(client):
+    before = client.get("/api/cars")
+    etag = before.headers["ETag"]
+
+    client.patch("/api/settings/prices", json={"interest_rate_pct": 9.5})
+
+    after = client.get("/api/cars", headers={"If-None-Match": etag})
+    assert after.status_code == 200
+    assert after.headers["ETag"] != etag
+    assert after.get_json()[0]["interest_3y"] > before.get_json()[0]["interest_3y"]
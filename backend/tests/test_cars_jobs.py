@@ -0,0 +1,73 @@
+# backend/tests/test_cars_jobs.py
+import pytest
+
+from backend.models.models import Car, PriceSettings, TcoJob, db
+from backend.routes.cars import jobs
+from backend.routes.cars.serialize import compute_derived
+from backend.utils.versions import bump
+
+N_CARS = 25
+
+
+@pytest.fixture()
+def seeded(make_cars):
+    db.session.add(PriceSettings(id=1, el_price_ore_kwh=200))
+    make_cars(
+        N_CARS,
+        year=2021,
+        estimated_purchase_price=lambda i: 220_000 + i * 5_000,
+        consumption_kwh_per_100km=16,
+        consumption_l_per_100km=5.5,
+        tco_3_years=1,
+        tco_5_years=1,
+        tco_8_years=1,
+    )
+
+
+def _persisted():
+    db.session.expire_all()
+    return {c.id: float(c.tco_5_years) for c in Car.query.all()}
+
+
+def test_price_change_materializes_new_generation(client, seeded, monkeypatch):
+    monkeypatch.setattr(jobs, "BULK_CHUNK", 10)  # several progress chunks
+    resp = client.patch("/api/settings/prices", json={"el_price_ore_kwh": 350})
+    job = client.get(f"/api/cars/jobs/{resp.headers['X-TCO-Job']}").get_json()
+    assert job["status"] == "done" and job["done"] == job["total"] == N_CARS
+
+    ps = db.session.get(PriceSettings, 1)
+    for car in Car.query.all():
+        assert float(car.tco_5_years) == pytest.approx(
+            compute_derived(car, ps)["tco_5_years"], abs=0.01
+        )
+    listing = client.get("/api/cars/jobs").get_json()
+    assert listing["generation"] == listing["prices_version"] == job["prices_version"]
+    assert listing["stale"] is False
+
+
+def test_concurrent_change_never_leaves_a_mixed_generation(client, seeded, monkeypatch):
+    real = jobs.compute_tco_batch
+
+    def racing_writer(cars, ps):
+        bump("cars")  # someone edits cars while the job is pricing
+        db.session.commit()
+        return real(cars, ps)
+
+    monkeypatch.setattr(jobs, "BULK_CHUNK", 10)
+    monkeypatch.setattr(jobs, "compute_tco_batch", racing_writer)
+    before = _persisted()
+
+    resp = client.patch("/api/settings/prices", json={"el_price_ore_kwh": 500})
+
+    job = db.session.get(TcoJob, int(resp.headers["X-TCO-Job"]))
+    assert job.status == "superseded"
+    assert _persisted() == before  # old generation intact, nothing half-written
+    assert client.get("/api/cars/jobs").get_json()["stale"] is True
+
+
+def test_async_update_queues_a_job(client, seeded):
+    resp = client.post("/api/cars/update?async=1")
+    assert resp.status_code == 202
+    job_id = resp.get_json()["job"]["id"]
+    assert client.get(f"/api/cars/jobs/{job_id}").get_json()["status"] == "done"
+    assert client.get("/api/cars/jobs/999").status_code == 404
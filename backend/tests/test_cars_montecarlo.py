@@ -0,0 +1,62 @@
+# backend/tests/test_cars_montecarlo.py
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from backend.models.models import Car, PriceSettings, db
+from backend.routes.cars import montecarlo
+from backend.routes.cars.montecarlo import parse_spec, run_monte_carlo
+from backend.routes.cars.serialize import compute_derived
+
+
+def test_zero_volatility_collapses_to_point_estimate(client, priced_cars):
+    zero = {"el": 0, "bensin": 0, "diesel": 0, "rate": 0}
+    resp = client.post("/api/cars/montecarlo", json={"paths": 50, "volatility": zero})
+    assert resp.status_code == 200
+    body = resp.get_json()
+
+    ps = db.session.get(PriceSettings, 1)
+    for row, car in zip(body["cars"], Car.query.order_by(Car.id), strict=True):
+        d = compute_derived(car, ps)
+        point = [pytest.approx(d[f"tco_total_{h}y"], abs=0.01) for h in (3, 5, 8)]
+        assert row["p10"] == row["p50"] == row["p90"] == point
+    assert [sum(c["p_cheapest"][h] for c in body["cars"]) for h in range(3)] == [
+        pytest.approx(1.0)
+    ] * 3
+
+
+def test_seeded_runs_are_reproducible_and_ordered(app, priced_cars):
+    cars = Car.query.order_by(Car.id).all()
+    spec = parse_spec({"paths": 1_200, "seed": 99})
+    a = run_monte_carlo(cars, None, spec)
+    with ProcessPoolExecutor(max_workers=2) as pool:
+        assert a == run_monte_carlo(cars, None, spec, pool=pool)
+    assert a != run_monte_carlo(cars, None, parse_spec({"paths": 1_200, "seed": 7}))
+    for c in a["cars"]:
+        for h in range(3):
+            assert c["p10"][h] < c["p50"][h] < c["p90"][h]
+
+
+def test_invalid_specs_are_rejected(client, priced_cars):
+    for bad in (
+        {"paths": 0},
+        {"volatility": {"gold": 0.1}},
+        {"correlation": [[1, 0], [0, 1]]},
+        {"correlation": [[1, 2, 0, 0], [2, 1, 0, 0], [0, 0, 1, 0], [0, 0, 0, 1]]},
+    ):
+        assert client.post("/api/cars/montecarlo", json=bad).status_code == 400
+
+
+def test_requests_share_one_pool(client, priced_cars, monkeypatch):
+    monkeypatch.setattr(montecarlo, "default_workers", lambda: 2)
+    monkeypatch.setattr(montecarlo, "_pool", None)
+    body = {"paths": 1_200, "seed": 5, "workers": 64}  # workers is ignored
+    try:
+        first = client.post("/api/cars/montecarlo", json=body).get_json()
+        pool = montecarlo._pool
+        assert pool is not None and pool._max_workers == 2
+        assert client.post("/api/cars/montecarlo", json=body).get_json() == first
+        assert montecarlo.shared_pool() is pool
+    finally:
+        if montecarlo._pool is not None:
+            montecarlo._pool.shutdown()
@@ -0,0 +1,71 @@
+# backend/tests/test_cars_pareto.py
+import numpy as np
+import pytest
+
+from backend.models.models import Car, db
+from backend.routes.cars.pareto import skyline
+
+
+def _brute_force(X):
+    keep = []
+    for i, p in enumerate(X):
+        dominated = any(
+            (q <= p).all() and (q < p).any() for j, q in enumerate(X) if j != i
+        )
+        if not dominated:
+            keep.append(i)
+    return keep
+
+
+@pytest.mark.parametrize("dims", [2, 3, 5])
+def test_skyline_matches_brute_force(dims):
+    rng = np.random.default_rng(dims)
+    X = rng.integers(0, 30, size=(700, dims)).astype(float)  # plenty of ties
+    assert skyline(X).tolist() == _brute_force(X)
+
+
+@pytest.fixture()
+def seeded(app):
+    db.session.add_all(
+        [
+            # cheap, short range: on the frontier
+            Car(model="Cheap", year=2020, type_of_vehicle="Bensin",
+                estimated_purchase_price=120_000, consumption_l_per_100km=6,
+                range_km=600, acceleration_0_100=11),
+            # fast, long range EV: on the frontier
+            Car(model="Fast", year=2023, type_of_vehicle="EV",
+                estimated_purchase_price=550_000, consumption_kwh_per_100km=18,
+                range_km=550, acceleration_0_100=4.5),
+            # dominated by "Fast" on range/acceleration and by "Mid" on TCO
+            Car(model="Meh", year=2023, type_of_vehicle="EV",
+                estimated_purchase_price=600_000, consumption_kwh_per_100km=20,
+                range_km=400, acceleration_0_100=7),
+            Car(model="Mid", year=2022, type_of_vehicle="EV",
+                estimated_purchase_price=350_000, consumption_kwh_per_100km=16,
+                range_km=450, acceleration_0_100=6.5),
+            # unknown acceleration counts as worst
+            Car(model="NoData", year=2022, type_of_vehicle="EV",
+                estimated_purchase_price=600_000, consumption_kwh_per_100km=20,
+                range_km=300),
+        ]
+    )  # fmt: skip
+    db.session.commit()
+
+
+def test_pareto_endpoint(client, seeded):
+    body = client.get(
+        "/api/cars/pareto?dims=tco_5y,range_km,acceleration_0_100"
+    ).get_json()
+    assert body["total"] == 5
+    assert body["directions"]["range_km"] == "max"
+    assert sorted(c["model"] for c in body["items"]) == ["Cheap", "Fast", "Mid"]
+    fast = next(c for c in body["items"] if c["model"] == "Fast")
+    assert fast["pareto"]["acceleration_0_100"] == 4.5
+
+    evs = client.get("/api/cars/pareto?dims=tco_5y,range_km&type_of_vehicle=EV")
+    assert {c["model"] for c in evs.get_json()["items"]} == {"Fast", "Mid"}
+
+
+def test_bad_dims_are_rejected(client, seeded):
+    assert client.get("/api/cars/pareto?dims=tco_5y,colour").status_code == 400
+    assert client.get("/api/cars/pareto?dims=range_km").status_code == 400
@@ -0,0 +1,89 @@
+# backend/tests/test_cars_query.py
+import pytest
+
+N_CARS = 40
+
+
+@pytest.fixture()
+def seeded(make_cars):
+    make_cars(
+        N_CARS,
+        year=lambda i: 2015 + i % 8,
+        body_style=lambda i: ("SUV", "Sedan")[i % 2],
+        eu_segment=lambda i: ("C", "D")[i % 3 == 0],
+        estimated_purchase_price=lambda i: 200_000 + (i * 7_919) % 150_000,
+        consumption_kwh_per_100km=lambda i: 15 + i % 5,
+        consumption_l_per_100km=lambda i: 5 + i % 3,
+        range_km=lambda i: None if i % 5 == 0 else 300 + i,
+    )
+
+
+def _walk(client, query):
+    """Follow next_cursor to the end; returns all items and the page count."""
+    items, pages, cursor = [], 0, None
+    while True:
+        url = f"/api/cars?{query}" + (f"&cursor={cursor}" if cursor else "")
+        resp = client.get(url)
+        assert resp.status_code == 200
+        body = resp.get_json()
+        items.extend(body["items"])
+        pages += 1
+        cursor = body["next_cursor"]
+        if not cursor:
+            return items, pages
+
+
+def test_no_params_keeps_plain_list(client, seeded):
+    body = client.get("/api/cars").get_json()
+    assert isinstance(body, list) and len(body) == N_CARS
+    assert [c["id"] for c in body] == sorted(c["id"] for c in body)
+
+
+def test_filters_match_client_side_filtering(client, seeded):
+    full = client.get("/api/cars").get_json()
+    body = client.get(
+        "/api/cars?body_style=SUV&type_of_vehicle=ev,phev&price_min=250000&q=car 1"
+    ).get_json()
+    expected = [
+        c["id"]
+        for c in full
+        if c["body_style"] == "SUV"
+        and c["type_of_vehicle"] in {"EV", "PHEV"}
+        and c["estimated_purchase_price"] >= 250_000
+        and "car 1" in c["model"].lower()
+    ]
+    assert expected and [c["id"] for c in body] == expected
+
+
+@pytest.mark.parametrize("sort", ["price", "-range_km", "tco_per_month_8y", "-tco_3y"])
+def test_keyset_pages_cover_the_sorted_list(client, seeded, sort):
+    full = client.get(f"/api/cars?sort={sort}").get_json()
+    items, pages = _walk(client, f"sort={sort}&limit=7")
+
+    assert pages == -(-N_CARS // 7)
+    assert [c["id"] for c in items] == [c["id"] for c in full]
+    assert items == full
+
+    field = {"price": "estimated_purchase_price", "-range_km": "range_km"}.get(
+        sort, "tco_total_8y" if "8y" in sort else "tco_total_3y"
+    )
+    values = [c[field] for c in full]
+    assert values == sorted(values, reverse=sort.startswith("-"))
+
+
+def test_bad_sort_limit_or_cursor_is_400(client, seeded):
+    assert client.get("/api/cars?sort=nope").status_code == 400
+    assert client.get("/api/cars?limit=0").status_code == 400
+    assert client.get("/api/cars?cursor=garbage").status_code == 400
+    cursor = client.get("/api/cars?sort=price&limit=5").get_json()["next_cursor"]
+    assert client.get(f"/api/cars?sort=year&cursor={cursor}").status_code == 400
+
+
+def test_etag_is_per_query(client, seeded):
+    a = client.get("/api/cars?body_style=SUV")
+    b = client.get("/api/cars?body_style=Sedan")
+    assert a.headers["ETag"] != b.headers["ETag"]
+    again = client.get(
+        "/api/cars?body_style=SUV", headers={"If-None-Match": a.headers["ETag"]}
+    )
+    assert again.status_code == 304
@@ -0,0 +1,80 @@
+# backend/tests/test_cars_sweep.py
+from types import SimpleNamespace
+
+import pytest
+
+from backend.models.models import Car, PriceSettings, db
+from backend.routes.cars.serialize import compute_derived
+from backend.routes.cars.sweep import parse_axis
+
+
+def test_grid_points_match_compute_derived(client, priced_cars):
+    resp = client.post(
+        "/api/cars/sweep",
+        json={
+            "ranges": {
+                "el_price_ore_kwh": [150, 400],
+                "yearly_km": {"start": 10_000, "stop": 30_000, "step": 10_000},
+                "interest_rate_pct": {"min": 0, "max": 6, "steps": 2},
+            }
+        },
+    )
+    assert resp.status_code == 200
+    body = resp.get_json()
+    assert len(body["grid"]) == 2 * 3 * 2
+    assert len(body["tco"]) == 3 and len(body["tco"][0]) == 12
+    assert len(body["tco"][0][0]) == len(body["horizons"]) == 3
+
+    stored = db.session.get(PriceSettings, 1)
+    cars = Car.query.order_by(Car.id).all()
+    for g, point in enumerate(body["grid"]):
+        values = dict(zip(body["params"], point, strict=True))
+        ps = SimpleNamespace(**{**stored.to_dict(), **values})
+        for c, car in enumerate(cars):
+            d = compute_derived(car, ps)
+            assert body["tco"][c][g] == [
+                pytest.approx(d[f"tco_total_{h}y"], abs=0.01) for h in (3, 5, 8)
+            ]
+        cheapest = min(cars, key=lambda car: compute_derived(car, ps)["tco_total_5y"])
+        assert body["cheapest"][g][1] == cheapest.id
+
+    # settings row untouched
+    db.session.expire_all()
+    assert db.session.get(PriceSettings, 1).el_price_ore_kwh == 200
+
+
+def test_invalid_ranges_are_rejected(client, priced_cars):
+    for bad in (
+        {"ranges": {"el_price_ore_kwh": {"start": 5, "stop": 1, "step": 1}}},
+        {"ranges": {"yearly_km": [0]}},
+        {"ranges": {"unknown": 1}},
+        {"ranges": {"yearly_km": {"min": 1, "max": 2, "steps": 101}}},
+        {"ranges": {"yearly_km": {"min": 1, "max": 2, "steps": "inf"}}},
+        {"ranges": {"yearly_km": {"min": 1, "max": 2, "steps": "nan"}}},
+        {"ranges": {"yearly_km": {"start": 0, "stop": 1e300, "step": 1e-300}}},
+    ):
+        assert client.post("/api/cars/sweep", json=bad).status_code == 400
+
+
+def test_parse_axis_inclusive_step():
+    assert parse_axis("yearly_km", {"start": 10, "stop": 30, "step": 10}) == [
+        10.0,
+        20.0,
+        30.0,
+    ]
+
+
+@pytest.mark.parametrize(
+    "url", ["/api/cars/sweep", "/api/cars/montecarlo", "/api/cars/phev-split"]
+)
+def test_ids_select_cars(client, priced_cars, url):
+    ids = [c.id for c in Car.query.order_by(Car.id)]
+    payload = {"ranges": {}, "paths": 50} if "phev" not in url else {}
+    for bad in (["x"], [1.5], [True]):
+        res = client.post(url, json={**payload, "ids": bad})
+        assert res.status_code == 400
+        assert res.get_json() == {"error": "ids must be integers"}
+    res = client.post(url, json={**payload, "ids": [ids[2], str(ids[0])]})
+    assert res.status_code == 200
+    if url.endswith("sweep"):
+        assert len(res.get_json()["tco"]) == 2
@@ -0,0 +1,125 @@
+# backend/tests/test_charging.py
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from backend.models.models import Car, db
+from backend.utils.charging import (
+    CLASSES,
+    CURVES,
+    charging_metrics,
+    dc_hours,
+    estimate_dc_10_80_minutes,
+)
+
+
+def _brute_force_hours(curve, batt, peak, a, b, steps=200_000):
+    x, y = zip(*CURVES[curve], strict=True)
+    s = np.linspace(a, b, steps + 1)
+    mid = (s[1:] + s[:-1]) / 2
+    return float((batt * np.diff(s) / (peak * np.interp(mid, x, y))).sum())
+
+
+@pytest.mark.parametrize("curve", CLASSES)
+@pytest.mark.parametrize("window", [(0.1, 0.8), (0.0, 1.0), (0.35, 0.55)])
+def test_tabulated_integral_matches_fine_integration(curve, window):
+    got = dc_hours(77.0, 150.0, CLASSES.index(curve), *window)
+    assert float(got) == pytest.approx(
+        _brute_force_hours(curve, 77.0, 150.0, *window), rel=1e-4
+    )
+
+
+def test_estimates():
+    # 400 V pack averages ~53% of peak over 10->80%
+    assert estimate_dc_10_80_minutes(60, 100) == pytest.approx(
+        0.7 * 60 / (0.53 * 100) * 60, rel=0.01
+    )
+    # unknown battery or peak: no estimate rather than "instant"
+    assert estimate_dc_10_80_minutes(0, 100) is None
+    assert estimate_dc_10_80_minutes(60, None) is None
+    assert np.isnan(dc_hours(0.0, 100.0, 0, 0.1, 0.8))
+
+
+def _ev(**kw):
+    return SimpleNamespace(type_of_vehicle="EV", **kw)
+
+
+def test_road_trip_minutes():
+    cars = [
+        _ev(battery_capacity_kwh=77, dc_peak_kw=230, consumption_kwh_per_100km=18),
+        _ev(battery_capacity_kwh=77, dc_peak_kw=130, consumption_kwh_per_100km=18),
+        _ev(battery_capacity_kwh=40, dc_peak_kw=50, consumption_kwh_per_100km=16),
+        # consumption from battery / range
+        _ev(battery_capacity_kwh=40, dc_peak_kw=50, range_km=250),
+        SimpleNamespace(type_of_vehicle="Diesel"),
+        _ev(),  # nothing known
+    ]
+    short = charging_metrics(cars, 100)["road_trip_min"]
+    assert short.tolist()[:5] == [60.0, 60.0, 60.0, 60.0, 60.0]
+    assert np.isnan(short[5])
+
+    long = charging_metrics(cars, 1_000)["road_trip_min"]
+    assert long[0] < long[1] < long[2]  # faster charging, bigger battery
+    assert long[3] == pytest.approx(long[2])
+    assert long[4] == 600.0 + 10.0  # one fuel stop
+
+    # 77 kWh at 18 kWh/100 km leaves with 0.8 * 77 kWh: 342 km, then charges
+    # exactly what the remaining 658 km need in the cheapest set of stops
+    one_stop = charging_metrics(cars[:1], 700)["road_trip_min"][0]
+    assert one_stop > 420.0
+    assert charging_metrics(cars[:1], 700) is charging_metrics(cars[:1], 700)
+
+
+@pytest.fixture()
+def seeded(app):
+    db.session.add_all(
+        [
+            Car(model="Fast", year=2023, type_of_vehicle="EV",
+                battery_capacity_kwh=77, dc_peak_kw=230,
+                consumption_kwh_per_100km=18),
+            Car(model="Slow", year=2020, type_of_vehicle="EV",
+                battery_capacity_kwh=40, dc_peak_kw=50,
+                consumption_kwh_per_100km=16),
+            Car(model="Diesel", year=2019, type_of_vehicle="Diesel",
+                consumption_l_per_100km=5),
+            # no battery, consumption or DC peak data
+            Car(model="Unknown", year=2021, type_of_vehicle="EV"),
+        ]
+    )  # fmt: skip
+    db.session.commit()
+
+
+def test_list_sorts_by_road_trip_time(client, seeded):
+    body = client.get("/api/cars?sort=road_trip_min&trip_km=800").get_json()
+    assert [c["model"] for c in body] == ["Diesel", "Fast", "Slow", "Unknown"]
+    assert body[0]["road_trip_min"] == 490.0
+    assert body[1]["dc_time_min_10_80_est"] > 0
+    unknown = body[-1]
+    assert unknown["road_trip_min"] is None
+    assert unknown["dc_time_min_10_80_est"] is None
+    assert unknown["ac_time_h_0_100_est"] is None
+
+    page = client.get("/api/cars?sort=-road_trip_min&trip_km=800&limit=2").get_json()
+    assert [c["model"] for c in page["items"]] == ["Slow", "Fast"]
+    rest = client.get(
+        f"/api/cars?sort=-road_trip_min&trip_km=800&limit=2&cursor={page['next_cursor']}"
+    ).get_json()
+    assert [c["model"] for c in rest["items"]] == ["Diesel", "Unknown"]
+
+
+@pytest.mark.parametrize("sort", ["dc_time_min_10_80_est", "-dc_time_min_10_80_est"])
+def test_unknown_charging_data_sorts_last(client, seeded, sort):
+    models, cursor = [], ""
+    while True:
+        page = client.get(f"/api/cars?sort={sort}&limit=1&cursor={cursor}").get_json()
+        models += [c["model"] for c in page["items"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    known, unknown = ["Fast", "Slow"], ["Diesel", "Unknown"]  # Diesel: no DC port
+    if sort.startswith("-"):  # ties break on id in the sort direction
+        known, unknown = known[::-1], unknown[::-1]
+    assert models == [*known, *unknown]
+
+    assert client.get("/api/cars?trip_km=0").status_code == 400
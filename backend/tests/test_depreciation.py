@@ -0,0 +1,69 @@
+# backend/tests/test_depreciation.py
+import random
+from datetime import date
+
+import pytest
+
+from backend.utils.depreciation import (
+    RETENTION,
+    DepreciationParams,
+    _retention_at,
+    compile_curve,
+    predict_future_value_from_today_price,
+    predict_future_values,
+)
+
+TODAY = date(2025, 3, 1)
+
+
+def test_compiled_curve_matches_scalar_formula():
+    custom = {24: 0.7, 48: 0.5, 120: 0.2}
+    for grid in (*RETENTION.values(), custom):
+        curve = compile_curve(grid)
+        for m in range(-3, curve.max_month + 40):
+            assert curve.at(m) == _retention_at(grid, m)
+    assert compile_curve(dict(custom)) is compile_curve(custom)  # cached
+
+
+def test_batch_matches_scalar_prediction():
+    rng = random.Random(7)
+    params = DepreciationParams(retention={**RETENTION, "BEV": {36: 0.5, 72: 0.3}})
+    rows = [
+        (
+            rng.uniform(50_000, 600_000),
+            rng.randint(2008, 2025),
+            rng.choice([0, 1, 3, 5, 8, 12]),
+            rng.choice([8_000, 20_000, 40_000]),
+            rng.choice(["EV", "PHEV", "Diesel", "Bensin", "Hybrid", None]),
+        )
+        for _ in range(500)
+    ]
+    got = predict_future_values(
+        today_price=[r[0] for r in rows],
+        car_year=[r[1] for r in rows],
+        years_ahead=[r[2] for r in rows],
+        yearly_km_future=[r[3] for r in rows],
+        type_of_vehicle=[r[4] for r in rows],
+        params=params,
+        today=TODAY,
+    )
+    for (price, year, ahead, km, tv), v in zip(rows, got, strict=True):
+        expected = predict_future_value_from_today_price(
+            today_price=price,
+            car_year=year,
+            years_ahead=ahead,
+            type_of_vehicle=tv,
+            yearly_km_future=km,
+            params=params,
+            today=TODAY,
+        )
+        assert v == pytest.approx(expected, rel=1e-12)
+
+
+def test_depreciation_endpoint(client):
+    body = client.get("/api/cars/depreciation?years=10&step=6").get_json()
+    assert body["months"][:3] == [0, 6, 12] and body["months"][-1] == 120
+    assert set(body["curves"]) == set(RETENTION)
+    bev = body["curves"]["BEV"]
+    assert len(bev) == len(body["months"]) and bev[0] == 1.0
+    assert bev[body["months"].index(36)] == RETENTION["BEV"][36]
@@ -0,0 +1,174 @@
+# backend/tests/test_forecast.py
+from datetime import date
+
+import pytest
+
+from backend.models.models import (
+    Expense,
+    Financing,
+    Income,
+    LoanAdjustment,
+    Month,
+    PlannedPurchase,
+    db,
+)
+from backend.utils.balances import recompute_balances
+from backend.utils.forecast import Basis, Scenario, project
+
+
+def test_project_closed_form():
+    basis = Basis(
+        start=date(2025, 1, 1),
+        opening_funds=1_000,
+        opening_loan=1_200,
+        incomes={"Work": 500},
+        expenses={"Food": 300},
+        loan_payment=100,
+        planned=((date(2025, 3, 1), 400), (date(2020, 1, 1), 9_999)),
+    )
+    out = project(
+        basis,
+        [
+            Scenario(),
+            Scenario(name="frugal", extra_expense=-100, include_planned=False),
+            Scenario(name="rate", loan_rate_pct=12, loan_payment=200),
+        ],
+        years=1,
+    )
+    assert out["months"][0] == "2025-01" and len(out["months"]) == 12
+    base, frugal, rate = out["scenarios"]
+    assert base["ending_funds"][:3] == [1_200, 1_400, 1_200]
+    assert base["starting_funds"][1] == 1_200
+    assert base["expenses"][2] == 700
+    assert base["summary"]["ending_funds"] == 1_000 + 12 * 200 - 400
+    assert frugal["summary"]["ending_funds"] == 1_000 + 12 * 300
+    assert base["loan_remaining"][-1] == 0 and base["loan_remaining"][10] == 100
+    assert base["summary"]["loan_paid_off"] == "2025-12"
+    # 1 % a month: 1200 * 1.01 - 200 = 1012 after one month
+    assert rate["loan_remaining"][0] == pytest.approx(1_012)
+    assert rate["summary"]["loan_paid_off"] == "2025-07"
+
+
+def test_growth_compounds_per_year():
+    basis = Basis(date(2025, 1, 1), 0, 0, incomes={"Work": 1_000})
+    (s,) = project(basis, [Scenario(income_growth_pct=10)], years=2)["scenarios"]
+    assert s["income"][11] == pytest.approx(1_100)
+    assert s["income"][23] == pytest.approx(1_210)
+    assert s["summary"]["loan_paid_off"] is None
+
+
+@pytest.fixture()
+def ledger(app):
+    db.session.add(Financing(name="loans_taken", value=10_000))
+    for i in range(6):
+        m = Month(name=f"M{i}", month_date=date(2024, 7 + i, 1), starting_funds=0)
+        m.incomes.append(Income(name="Salary", source="Work", amount=30_000))
+        m.expenses.append(Expense(category="Food", name="food", amount=5_000 + i))
+        m.loan_adjustments.append(
+            LoanAdjustment(name="payment", type="payment", amount=1_000)
+        )
+        if i == 2:  # one-off, not recurring
+            m.expenses.append(Expense(category="Travel", name="trip", amount=20_000))
+        db.session.add(m)
+    db.session.add(PlannedPurchase(item="Car", amount=50_000, date=date(2025, 3, 15)))
+    db.session.add(PlannedPurchase(item="Someday", amount=1))
+    recompute_balances()
+    db.session.commit()
+
+
+def test_forecast_endpoint(client, ledger):
+    res = client.post(
+        "/api/forecast",
+        json={
+            "years": 30,
+            "scenarios": [
+                {"name": "base"},
+                {"name": "raise", "income_growth_pct": 3, "loan_payment": 2_000},
+            ],
+        },
+    )
+    assert res.status_code == 200
+    body = res.get_json()
+    basis = body["basis"]
+    assert basis["start"] == "2025-01" and basis["from_month"] == "2024-12"
+    assert basis["recurring_incomes"] == {"Work": 30_000}
+    assert basis["recurring_expenses"] == {"Food": 5_002.5}
+    assert basis["loan_payment"] == 1_000 and basis["loan_remaining"] == 4_000
+    assert basis["starting_funds"] == 6 * 25_000 - 15 - 20_000
+    assert basis["planned_purchases"] == 1
+    assert len(body["months"]) == 360
+
+    base, raised = body["scenarios"]
+    assert base["starting_funds"][0] == basis["starting_funds"]
+    assert base["expenses"][2] == 55_002.5
+    assert base["summary"]["loan_paid_off"] == "2025-04"
+    assert raised["summary"]["loan_paid_off"] == "2025-02"
+    assert raised["summary"]["ending_funds"] > base["summary"]["ending_funds"]
+
+
+def test_forecast_without_months(client, app):
+    db.session.add(Financing(name="loans_taken", value=2_500))
+    db.session.commit()
+    body = client.get("/api/forecast?years=1").get_json()
+    assert body["basis"]["from_month"] is None
+    assert body["scenarios"][0]["loan_remaining"] == [2_500] * 12
+
+
+def test_forecast_follows_scheduled_loans(client, app):
+    m = Month(name="Dec", month_date=date(2024, 12, 1), starting_funds=0)
+    m.incomes.append(Income(name="Salary", source="Work", amount=50_000))
+    db.session.add(m)
+    recompute_balances()
+    db.session.commit()
+    res = client.post(
+        "/api/loans",
+        json={
+            "name": "mortgage",
+            "principal": 1_200_000,
+            "start_date": "2024-12-01",
+            "rate_pct": 3,
+            "property_value": 1_500_000,
+        },
+    )
+    assert res.status_code == 201
+
+    body = client.get("/api/forecast?years=2").get_json()
+    basis = body["basis"]
+    assert basis["loan_remaining"] == 1_200_000 and basis["scheduled_loans"] == 1
+    assert basis["loan_payment"] == 0
+    (s,) = body["scenarios"]
+    # 3 % interest on the balance, 2 % a year of the principal above 70 % LTV
+    assert s["loan_interest"][0] == 3_000 and s["loan_amortization"][0] == 2_000
+    assert s["loan_remaining"][:2] == [1_198_000, 1_196_000]
+    assert s["loan_remaining"][-1] == 1_200_000 - 24 * 2_000
+    assert s["ending_funds"][0] == 50_000 + 50_000 - 5_000
+    assert s["summary"]["loan_paid_off"] is None
+
+
+def test_latest_calendar_month_with_two_rows(client, app):
+    for day, amount in ((1, 1_000), (20, 2_000)):
+        m = Month(name=f"May {day}", month_date=date(2024, 5, day), starting_funds=0)
+        m.incomes.append(Income(name="Salary", source="Work", amount=amount))
+        db.session.add(m)
+    recompute_balances()
+    db.session.commit()
+    res = client.get("/api/forecast?years=1")
+    assert res.status_code == 200
+    basis = res.get_json()["basis"]
+    assert basis["from_month"] == "2024-05" and basis["starting_funds"] == 3_000
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        {"years": 31},
+        {"years": "x"},
+        {"lookback": 0},
+        {"scenarios": {}},
+        {"scenarios": [{"name": "a"}, {"name": "a"}]},
+        {"scenarios": [{"extra_income": "lots"}]},
+        {"scenarios": [{"one_offs": [{"month": "soon", "amount": 1}]}]},
+    ],
+)
+def test_bad_input(client, payload):
+    assert client.post("/api/forecast", json=payload).status_code == 400
@@ -0,0 +1,66 @@
+# backend/tests/test_json_provider.py
+import enum
+import json
+import uuid
+from datetime import date, datetime
+from decimal import Decimal
+
+import numpy as np
+import pytest
+from flask import jsonify
+
+from backend.utils.json_provider import (
+    OrjsonProvider,
+    StdlibJSONProvider,
+    install_json_provider,
+)
+
+
+class Kind(enum.Enum):
+    EV = "ev"
+
+
+PAYLOAD = {
+    "amount": Decimal("123.45"),
+    "day": date(2025, 3, 1),
+    "at": datetime(2025, 3, 1, 7, 30),
+    "kind": Kind.EV,
+    "id": uuid.UUID(int=1),
+    "b": [1, 2.5, None, "å"],
+    "a": {1: "int key"},
+}
+EXPECTED = {
+    "amount": 123.45,
+    "day": "2025-03-01",
+    "at": "2025-03-01T07:30:00",
+    "kind": "ev",
+    "id": "00000000-0000-0000-0000-000000000001",
+    "b": [1, 2.5, None, "å"],
+    "a": {"1": "int key"},
+}
+
+
+@pytest.mark.parametrize("cls", [OrjsonProvider, StdlibJSONProvider])
+def test_native_types(app, cls):
+    provider = cls(app)
+    assert json.loads(provider.dumps(PAYLOAD)) == EXPECTED
+    body = provider.response(PAYLOAD).get_data()
+    assert json.loads(body) == EXPECTED and body.endswith(b"\n")
+
+
+def test_numpy_and_key_order(app):
+    provider = OrjsonProvider(app)
+    out = provider.dumps({"z": np.float64(1.5), "a": np.arange(3), "m": np.int8(2)})
+    assert out == '{"a":[0,1,2],"m":2,"z":1.5}'
+    with pytest.raises(TypeError):
+        provider.dumps({"x": object()})
+
+
+def test_installed_by_create_app(app):
+    assert isinstance(app.json, OrjsonProvider)
+    with app.test_request_context():
+        assert json.loads(jsonify(PAYLOAD).get_data()) == EXPECTED
+
+    app.config["JSON_PROVIDER"] = "stdlib"
+    install_json_provider(app)
+    assert type(app.json) is StdlibJSONProvider
@@ -0,0 +1,178 @@
+# backend/tests/test_loans_schedule.py
+from datetime import date
+
+import numpy as np
+import pytest
+
+from backend.models.models import Financing, Month, db
+from backend.utils.balances import recompute_balances
+from backend.utils.loans import LoanTerms, schedule
+
+MORTGAGE = LoanTerms(
+    id=1,
+    name="house",
+    principal=1_200_000,
+    start=date(2025, 1, 1),
+    rate_pct=3.0,
+    resets=((date(2025, 4, 1), 4.2),),
+    property_value=1_500_000,  # LTV 80 %: 2 % a year
+)
+
+
+def test_swedish_requirement_and_rate_reset():
+    s = schedule([MORTGAGE], months=6)
+    assert s.months[0] == date(2025, 1, 1)
+    assert s.balance[0, 0] == 1_200_000 and s.interest[0, 0] == 0  # disbursed
+    assert s.interest[0, 1] == pytest.approx(3_000)  # 3 % / 12
+    assert s.amortization[0, 1] == pytest.approx(2_000)  # 2 % of principal / 12
+    assert s.rate[0, 3] == 4.2
+    assert s.interest[0, 3] == pytest.approx(1_196_000 * 0.042 / 12)
+
+    # Below 70 % LTV only 1 % is required, below 50 % nothing
+    extra = np.zeros((1, 6))
+    extra[0, 2] = 200_000
+    extra[0, 4] = 300_000
+    s = schedule([MORTGAGE], months=6, extra=extra)
+    assert s.amortization[0, 3] == pytest.approx(1_000)
+    assert s.amortization[0, 5] == 0
+
+
+def test_dti_fixed_amortization_and_payoff():
+    s = schedule([MORTGAGE], months=3, yearly_income=200_000)  # debt 6x income
+    assert s.amortization[0, 1] == pytest.approx(3_000)
+
+    car = LoanTerms(
+        name="car", principal=10_000, start=date(2025, 3, 1), amortization_monthly=4_000
+    )
+    s = schedule([MORTGAGE, car], months=8)
+    assert s.balance[1].tolist()[2:6] == [10_000, 6_000, 2_000, 0]
+    assert s.paid_off(1) == date(2025, 6, 1) and s.paid_off(0) is None
+    assert s.row(1)["summary"]["paid_total"] == 10_000
+
+    # Vectorized rows match one-by-one schedules
+    alone = schedule([MORTGAGE], months=8)
+    np.testing.assert_allclose(s.balance[0], alone.balance[0])
+
+
+@pytest.fixture()
+def mortgage(client, app):
+    for i in range(4):
+        db.session.add(Month(name=f"M{i}", month_date=date(2025, 1 + i, 1)))
+    db.session.add(Financing(name="loans_taken", value=1_000))
+    db.session.commit()
+    recompute_balances()
+    db.session.commit()
+    res = client.post(
+        "/api/loans",
+        json={
+            "name": "house",
+            "principal": 1_200_000,
+            "start_date": "2025-01-15",
+            "rate_pct": 3,
+            "property_value": 1_500_000,
+        },
+    )
+    assert res.status_code == 201
+    loan = res.get_json()
+    res = client.post(
+        f"/api/loans/{loan['id']}/resets",
+        json={"effective_date": "2025-04-01", "rate_pct": 4.2},
+    )
+    assert res.status_code == 201
+    return loan["id"]
+
+
+def test_months_payload_gets_schedule(client, mortgage):
+    month = db.session.query(Month).filter_by(name="M2").one()
+    res = client.post(
+        "/api/loan_adjustments",
+        json={
+            "month_id": month.id,
+            "type": "payment",
+            "amount": 100_000,
+            "loan_id": mortgage,
+        },
+    )
+    assert res.status_code == 201 and res.get_json()["loan_id"] == mortgage
+
+    rows = client.get("/api/months/all?view=summary").get_json()
+    # loans_taken chain (1 000) is untouched by the linked payment
+    assert [r["loanRemaining"] for r in rows] == [
+        1_201_000,
+        1_199_000,
+        1_097_000,
+        1_095_000,
+    ]
+    assert rows[0]["loanInterest"] == 0
+    assert rows[1]["loanInterest"] == pytest.approx(3_000)
+    assert rows[3]["loanInterest"] == pytest.approx(1_096_000 * 0.042 / 12)
+
+    assert client.delete(f"/api/loans/{mortgage}").status_code == 409
+
+
+def test_schedule_endpoint_scenarios(client, mortgage):
+    res = client.post(
+        "/api/loans/schedule",
+        json={
+            "years": 40,
+            "scenarios": [
+                {"name": "base"},
+                {"name": "extra", "extra_monthly": {str(mortgage): 5_000}},
+                {"name": "rates", "rate_shift_pct": 2},
+                {
+                    "name": "lump",
+                    "one_offs": [
+                        {"loan_id": mortgage, "month": "2026-01", "amount": 700_000}
+                    ],
+                },
+            ],
+        },
+    )
+    assert res.status_code == 200
+    body = res.get_json()
+    assert len(body["months"]) == 480 and body["loans"][0]["id"] == mortgage
+    base, extra, rates, lump = body["scenarios"]
+    (house,) = base["loans"]
+    assert house["rate_pct"][:4] == [3, 3, 3, 4.2]
+    assert house["summary"]["paid_off"] is None  # stops amortizing at 50 % LTV
+    assert base["total"]["balance"][-1] == pytest.approx(750_000, abs=1_000)
+    assert extra["loans"][0]["summary"]["paid_off"] is not None
+    assert rates["summary"]["interest_total"] > base["summary"]["interest_total"]
+    assert lump["loans"][0]["amortization"][-1] == 0
+
+    listed = client.get("/api/loans").get_json()
+    assert listed[0]["rate_resets"][0]["rate_pct"] == 4.2
+
+
+@pytest.mark.parametrize(
+    "url,payload",
+    [
+        ("/api/loans", {"principal": 1, "start_date": "2025-01-01"}),
+        ("/api/loans", {"name": "x", "principal": -1, "start_date": "2025-01"}),
+        ("/api/loans", {"name": "x", "principal": 1, "start_date": "soon"}),
+        ("/api/loans/schedule", {"years": 61}),
+        ("/api/loans/schedule", {"scenarios": [{"rate_shift_pct": "x"}]}),
+        ("/api/loans/schedule", {"scenarios": [{"rate_shift_pct": "nan"}]}),
+        ("/api/loans/schedule", {"scenarios": [{"rate_shift_pct": "inf"}]}),
+        ("/api/loans/schedule", {"scenarios": [{"extra_monthly": {"1": -500}}]}),
+        ("/api/loans/schedule", {"scenarios": [{"extra_monthly": {"1": "nan"}}]}),
+        ("/api/loans/schedule", {"scenarios": [{"extra_monthly": {"1": "inf"}}]}),
+        ("/api/loans/schedule", {"scenarios": [{"one_offs": [{"month": "2025-01"}]}]}),
+    ],
+)
+def test_bad_input(client, app, url, payload):
+    assert client.post(url, json=payload).status_code == 400
+
+
+def test_rate_reset_upserts_by_date(client, mortgage):
+    url = f"/api/loans/{mortgage}/resets"
+    res = client.post(url, json={"effective_date": "2025-04-01", "rate_pct": 3.9})
+    assert res.status_code == 200
+    (loan,) = client.get("/api/loans").get_json()
+    assert loan["rate_resets"] == [
+        {
+            "id": loan["rate_resets"][0]["id"],
+            "effective_date": "2025-04-01",
+            "rate_pct": 3.9,
+        }
+    ]
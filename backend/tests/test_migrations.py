@@ -0,0 +1,119 @@
+# backend/tests/test_migrations.py
+from datetime import date
+
+import pytest
+from alembic.autogenerate import compare_metadata
+from alembic.migration import MigrationContext
+from flask_migrate import downgrade, upgrade
+from sqlalchemy import func, inspect, select, text
+
+from backend.models.models import Expense, Financing, Income, LoanAdjustment, Month, db
+from backend.tools.bootstrap_schema import adopted_revision
+from backend.utils.balances import MONTH_ORDER, _summary_statement
+
+
+def test_chain_matches_models(app):
+    db.drop_all()
+    upgrade()
+    with db.engine.connect() as conn:
+        ctx = MigrationContext.configure(conn, opts={"compare_type": True})
+        assert compare_metadata(ctx, db.metadata) == []
+
+    downgrade(revision="base")
+    assert set(inspect(db.engine).get_table_names()) <= {"alembic_version"}
+
+
+def test_account_dedupe_keeps_rows_with_null_keys(app):
+    db.drop_all()
+    upgrade(revision="0003_loans")
+    rows = [
+        ("A", "X", "1", "SE"),
+        ("A", "X", "1", "SE"),  # duplicate, dropped
+        ("A", "X", None, "SE"),
+        ("A", "X", None, "SE"),  # NULLs are distinct for UNIQUE, kept
+        ("B", None, None, None),
+        ("B", None, None, None),
+    ]
+    for person, bank, number, country in rows:
+        db.session.execute(
+            text(
+                "INSERT INTO acc_info (person, bank, acc_number, country) "
+                "VALUES (:p, :b, :n, :c)"
+            ),
+            {"p": person, "b": bank, "n": number, "c": country},
+        )
+    db.session.commit()
+    upgrade()
+    ids = db.session.execute(text("SELECT id FROM acc_info ORDER BY id")).scalars()
+    assert list(ids) == [1, 3, 4, 5, 6]
+
+
+def test_create_all_database_is_adopted_at_head(app):
+    insp = inspect(db.engine)
+    tables = set(insp.get_table_names())
+    assert adopted_revision(insp, tables) == "0004_query_indexes"
+
+
+def _plan(stmt) -> str:
+    sql = str(stmt.compile(db.engine, compile_kwargs={"literal_binds": True}))
+    rows = db.session.execute(text(f"EXPLAIN QUERY PLAN {sql}")).all()
+    return " | ".join(r[-1] for r in rows)
+
+
+@pytest.fixture()
+def ledger(app):
+    for i in range(36):
+        m = Month(name=f"M{i}", month_date=date(2022 + i // 12, i % 12 + 1, 1))
+        for j in range(4):
+            m.expenses.append(Expense(category=f"c{j}", name="x", amount=j))
+            m.incomes.append(Income(name="s", source=f"s{j}", amount=j))
+        db.session.add(m)
+    db.session.commit()
+
+
+@pytest.mark.parametrize(
+    "stmt,index",
+    [
+        (
+            lambda: select(Month.id, Month.name)
+            .where(Month.month_date >= date(2023, 1, 1))
+            .order_by(*MONTH_ORDER),
+            "ix_months_month_date_id",
+        ),
+        (
+            lambda: select(Expense.month_id, func.sum(Expense.amount)).group_by(
+                Expense.month_id
+            ),
+            "ix_expenses_month_id_category",
+        ),
+        (
+            lambda: select(Income.amount).where(Income.month_id == 3),
+            "ix_incomes_month_id_source",
+        ),
+        (
+            lambda: select(Month.month_date, Expense.category, func.sum(Expense.amount))
+            .join(Month, Month.id == Expense.month_id)
+            .where(Month.month_date >= date(2023, 1, 1))
+            .group_by(Month.month_date, Expense.category),
+            "ix_expenses_month_id_category (month_id=?)",
+        ),
+        (
+            lambda: select(LoanAdjustment.id).where(LoanAdjustment.loan_id == 1),
+            "ix_loan_adjustments_loan_id",
+        ),
+        (
+            lambda: select(Financing.id).where(Financing.name == "loans_taken"),
+            "sqlite_autoindex_financing",
+        ),
+    ],
+)
+def test_query_plans_use_indexes(ledger, stmt, index):
+    assert index in _plan(stmt())
+
+
+def test_monthly_totals_need_no_sort(ledger):
+    plan = _plan(_summary_statement())
+    assert "SCAN months USING INDEX ix_months_month_date_id" in plan
+    assert "TEMP B-TREE FOR ORDER BY" not in plan
+    for index in ("ix_incomes_month_id_source", "ix_expenses_month_id_category"):
+        assert index in plan
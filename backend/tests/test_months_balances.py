@@ -0,0 +1,140 @@
+# backend/tests/test_months_balances.py
+from datetime import date
+
+import pytest
+from sqlalchemy import event
+
+from backend.models.models import Financing, Month, db
+from backend.utils.balances import month_summaries, recompute_balances
+
+
+@pytest.fixture()
+def months(app):
+    rows = [
+        Month(name=f"M{i}", month_date=date(2025, i, 1), starting_funds=1000)
+        for i in (1, 2, 3, 4)
+    ]
+    db.session.add_all(rows)
+    db.session.add(Financing(name="loans_taken", value=500))
+    db.session.commit()
+    recompute_balances()
+    db.session.commit()
+    return [m.id for m in rows]
+
+
+def _balances():
+    rows = db.session.query(Month).order_by(Month.month_date).all()
+    return [
+        (float(m.starting_funds), float(m.ending_funds), float(m.loan_remaining))
+        for m in rows
+    ]
+
+
+def _post(client, path, **body):
+    res = client.post(path, json=body)
+    assert res.status_code == 201, res.get_json()
+
+
+def test_writes_rechain_from_their_month(client, months):
+    assert _balances() == [(1000, 1000, 500)] * 4
+
+    _post(client, "/api/incomes", month_id=months[1], source="Salary", amount=300)
+    _post(
+        client, "/api/expenses", month_id=months[2], category="Food", name="x",
+        amount=50,
+    )  # fmt: skip
+    _post(
+        client, "/api/loan_adjustments", month_id=months[0], type="payment",
+        amount=100,
+    )  # fmt: skip
+    assert _balances() == [
+        (1000, 1000, 400),
+        (1000, 1300, 400),
+        (1300, 1250, 400),
+        (1250, 1250, 400),
+    ]
+
+    _post(client, "/api/financing", name="loans_taken", value=800)
+    assert [b[2] for b in _balances()] == [700] * 4
+
+
+def test_only_later_months_are_updated(app, months):
+    updated = []
+
+    @event.listens_for(db.engine, "before_cursor_execute")
+    def _spy(conn, cursor, statement, params, context, executemany):
+        if statement.startswith("UPDATE months"):
+            updated.extend(params if executemany else [params])
+
+    try:
+        db.session.execute(
+            db.text(
+                "INSERT INTO expenses (category, month_id, name, amount) "
+                "VALUES ('Food', :m, 'x', 25)"
+            ),
+            {"m": months[2]},
+        )
+        assert recompute_balances(months[2]) == 2
+        assert recompute_balances(months[2]) == 0  # nothing drifted
+        assert recompute_balances(10_000) == 0
+    finally:
+        event.remove(db.engine, "before_cursor_execute", _spy)
+    assert len(updated) == 2
+
+
+def test_get_months_is_a_pure_read(app, client, months):
+    # balances are the stored chain (source of truth); GET serves the columns
+    # as they are and never repairs them
+    db.session.get(Month, months[3]).ending_funds = 1
+    db.session.commit()
+
+    statements = []
+
+    @event.listens_for(db.engine, "before_cursor_execute")
+    def _spy(conn, cursor, statement, *args):
+        statements.append(statement.split()[0].upper())
+
+    try:
+        body = client.get("/api/months?anchor=2025-01").get_json()
+    finally:
+        event.remove(db.engine, "before_cursor_execute", _spy)
+    assert set(statements) == {"SELECT"}
+    assert [m["endingFunds"] for m in body] == [1000, 1000, 1000, 1]
+    assert body[0]["is_current"] and body[0]["loanRemaining"] == 500
+    assert db.session.get(Month, months[3]).ending_funds == 1
+
+
+def test_summaries_match_the_stored_chain(client, months):
+    _post(client, "/api/incomes", month_id=months[0], source="Salary", amount=900)
+    _post(
+        client, "/api/expenses", month_id=months[1], category="Rent", name="x",
+        amount=1200.5,
+    )  # fmt: skip
+    _post(
+        client, "/api/loan_adjustments", month_id=months[3], type="disbursement",
+        amount=250,
+    )  # fmt: skip
+
+    rows = month_summaries()
+    assert [r["id"] for r in rows] == months
+    assert [(r["income"], r["expenses"], r["loan_delta"]) for r in rows] == [
+        (900, 0, 0),
+        (0, 1200.5, 0),
+        (0, 0, 0),
+        (0, 0, 250),
+    ]
+    got = [(r["starting_funds"], r["ending_funds"], r["loan_remaining"]) for r in rows]
+    assert got == pytest.approx(_balances())
+
+    full = client.get("/api/months/all").get_json()
+    assert [m["endingFunds"] for m in full] == pytest.approx([b[1] for b in got])
+    assert full[1]["expenses"][0]["amount"] == 1200.5
+
+
+def test_window_sums_only_the_selected_months(client, months):
+    _post(client, "/api/incomes", month_id=months[1], source="Salary", amount=300)
+    _post(client, "/api/incomes", month_id=months[3], source="Salary", amount=50)
+    (row,) = month_summaries(date_from=date(2025, 4, 1))
+    assert row["id"] == months[3] and row["income"] == 50
+    assert (row["starting_funds"], row["ending_funds"]) == (1300, 1350)
+    assert [r["id"] for r in month_summaries(limit=2)] == months[:2]
@@ -0,0 +1,74 @@
+# backend/tests/test_months_window.py
+from datetime import date
+
+import pytest
+
+from backend.models.models import Expense, Income, Month, db
+from backend.utils.balances import recompute_balances
+
+
+@pytest.fixture()
+def history(app):
+    """Two years of months, each with one income and a few expenses."""
+    months = []
+    for i in range(24):
+        m = Month(
+            name=f"M{i}",
+            month_date=date(2024 + i // 12, i % 12 + 1, 1),
+            starting_funds=10_000,
+        )
+        m.incomes.append(Income(name="Salary", source="Salary", amount=30_000))
+        for k in range(3):
+            m.expenses.append(Expense(category="Food", name=f"e{k}", amount=9_000))
+        months.append(m)
+    db.session.add_all(months)
+    db.session.flush()
+    recompute_balances()
+    db.session.commit()
+    return [m.id for m in months]
+
+
+def test_window_and_summary_view(client, history):
+    full = client.get("/api/months/all").get_json()
+    assert len(full) == 24
+
+    rows = client.get("/api/months/all?from=2024-06&to=2024-08").get_json()
+    assert [r["month_date"] for r in rows] == ["2024-06-01", "2024-07-01", "2024-08-01"]
+    # running balances still cover the months before the window
+    assert rows[0]["startingFunds"] == 10_000 + 5 * 3_000
+    assert rows == full[5:8]
+
+    summary = client.get("/api/months/all?view=summary&limit=4").get_json()
+    assert [r["id"] for r in summary] == history[:4]
+    assert "expenses" not in summary[0] and "incomes" not in summary[0]
+    assert summary[0]["totalExpenses"] == 27_000
+    assert {k: full[0][k] for k in summary[0]} == summary[0]
+
+    big = client.get("/api/months/all").data
+    small = client.get("/api/months/all?view=summary").data
+    assert len(small) * 3 < len(big)
+
+
+def test_anchor_window(client, history):
+    rows = client.get("/api/months?anchor=2025-03&view=summary&limit=2").get_json()
+    assert [r["month_date"] for r in rows] == ["2025-03-01", "2025-04-01"]
+    assert [r["is_current"] for r in rows] == [True, False]
+
+    # an explicit `from` before the anchor widens the window
+    rows = client.get("/api/months?anchor=2025-03&from=2025-01&to=2025-03").get_json()
+    assert [r["is_current"] for r in rows] == [False, False, True]
+
+
+def test_month_detail(client, history):
+    body = client.get(f"/api/months/{history[13]}").get_json()
+    assert body["month_date"] == "2025-02-01"
+    assert body["endingFunds"] == 10_000 + 14 * 3_000
+    assert len(body["expenses"]) == 3
+    assert client.get("/api/months/999999").status_code == 404
+
+
+@pytest.mark.parametrize(
+    "qs", ["from=2024-13", "from=2025-01&to=2024-01", "limit=0", "view=compact"]
+)
+def test_bad_window_params(client, history, qs):
+    assert client.get(f"/api/months/all?{qs}").status_code == 400
@@ -0,0 +1,134 @@
+# backend/tests/test_pagination.py
+from datetime import date
+
+import pytest
+
+from backend.models.models import AccInfo, Expense, Month, PlannedPurchase, db
+
+
+@pytest.fixture()
+def ledger(app):
+    months = [Month(name=f"M{i}", month_date=date(2025, i + 1, 1)) for i in range(3)]
+    db.session.add_all(months)
+    db.session.flush()
+    for i in range(30):
+        db.session.add(
+            Expense(
+                month_id=months[i % 3].id,
+                category=("Food", "Rent", "Car")[i % 3],
+                name=f"e{i}",
+                amount=i % 7,  # plenty of ties
+            )
+        )
+    db.session.commit()
+    return [m.id for m in months]
+
+
+def _walk(client, url, **params):
+    items, pages, cursor = [], 0, None
+    while True:
+        query = {**params, **({"cursor": cursor} if cursor else {})}
+        body = client.get(url, query_string=query).get_json()
+        items += body["items"]
+        pages += 1
+        cursor = body["next_cursor"]
+        if cursor is None:
+            return items, pages
+
+
+def test_plain_list_is_unchanged(client, ledger):
+    rows = client.get("/api/expenses").get_json()
+    assert len(rows) == 30
+    assert [(r["category"], r["id"]) for r in rows] == sorted(
+        (r["category"], r["id"]) for r in rows
+    )
+
+
+@pytest.mark.parametrize("sort", ["category", "-amount", "amount", "-id", "name"])
+def test_keyset_walk_matches_full_sort(client, ledger, sort):
+    full = client.get("/api/expenses", query_string={"sort": sort, "limit": 500})
+    full = full.get_json()["items"]
+    paged, pages = _walk(client, "/api/expenses", sort=sort, limit=7)
+    assert pages == 5
+    assert [r["id"] for r in paged] == [r["id"] for r in full]
+
+    key = sort.lstrip("-")
+    pairs = [(r[key], r["id"]) for r in full]
+    assert pairs == sorted(pairs, reverse=sort.startswith("-"))
+
+
+def test_filters_and_total(client, ledger):
+    res = client.get(
+        "/api/expenses",
+        query_string={"month_id": f"{ledger[0]},{ledger[1]}", "total": 1, "limit": 5},
+    )
+    body = res.get_json()
+    assert body["total"] == 20 and body["limit"] == 5 and len(body["items"]) == 5
+    assert {r["month_id"] for r in body["items"]} <= set(ledger[:2])
+
+    # from/to select months by their date; to is inclusive
+    body = client.get(
+        "/api/expenses", query_string={"from": "2025-02", "to": "2025-03", "total": 1}
+    ).get_json()
+    assert body["total"] == 20
+    assert {r["month_id"] for r in body["items"]} == set(ledger[1:])
+
+    body = client.get(
+        "/api/expenses", query_string={"category": "Food,Rent", "to": "2025-01-31"}
+    ).get_json()
+    assert {r["category"] for r in body} == {"Food"} and len(body) == 10
+
+
+def test_other_lists(client, app):
+    db.session.add_all(
+        [
+            PlannedPurchase(item="sofa", amount=5_000, date=date(2025, 5, 1)),
+            PlannedPurchase(item="tv", amount=8_000),
+            PlannedPurchase(item="bike", amount=3_000, date=date(2025, 3, 1)),
+            AccInfo(person="A", bank="X", value=10),
+            AccInfo(person="B", value=None),
+        ]
+    )
+    db.session.commit()
+
+    # undated purchases sort last, and paging across them works
+    items, _ = _walk(client, "/api/planned_purchases", sort="date", limit=1)
+    assert [p["item"] for p in items] == ["bike", "sofa", "tv"]
+    body = client.get(
+        "/api/planned_purchases", query_string={"from": "2025-04-15"}
+    ).get_json()
+    assert [p["item"] for p in body] == ["sofa"]
+
+    items, _ = _walk(client, "/api/acc_info", sort="-value", limit=1)
+    assert [a["person"] for a in items] == ["A", "B"]
+    assert client.get("/api/house_costs?total=1").get_json() == {
+        "items": [],
+        "next_cursor": None,
+        "limit": 50,
+        "total": 0,
+    }
+
+
+@pytest.mark.parametrize(
+    "url",
+    [
+        "/api/expenses?sort=nope",
+        "/api/expenses?limit=0",
+        "/api/expenses?month_id=abc",
+        "/api/expenses?cursor=garbage",
+        "/api/incomes?from=2025-13",
+        "/api/incomes?from=2025-03&to=2025-02",
+        "/api/acc_info?from=2025-01",
+        "/api/loan_adjustments?limit=501",
+    ],
+)
+def test_bad_query(client, app, url):
+    assert client.get(url).status_code == 400
+
+
+def test_cursor_is_tied_to_sort(client, ledger):
+    body = client.get("/api/expenses?sort=amount&limit=3").get_json()
+    res = client.get(
+        "/api/expenses", query_string={"sort": "-amount", "cursor": body["next_cursor"]}
+    )
+    assert res.status_code == 400
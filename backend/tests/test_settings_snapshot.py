@@ -0,0 +1,65 @@
+# backend/tests/test_settings_snapshot.py
+import pytest
+from sqlalchemy import event
+
+from backend.models.models import AppSettings, Car, PriceSettings, db
+from backend.utils.energy import energy_cost_per_month
+from backend.utils.settings import settings_snapshot
+
+N_CARS = 1_000
+
+
+@pytest.fixture()
+def seeded(make_cars):
+    db.session.add(PriceSettings(id=1, el_price_ore_kwh=180))
+    db.session.add(AppSettings(id=1, tire_change_price_year=1_500))
+    make_cars(
+        N_CARS,
+        estimated_purchase_price=250_000,
+        consumption_kwh_per_100km=17,
+        consumption_l_per_100km=6,
+        summer_tires_price=6_000,
+        winter_tires_price=8_000,
+    )
+
+
+@pytest.fixture()
+def settings_selects(app):
+    """SELECTs against price_settings / app_settings."""
+    seen: list[str] = []
+
+    def _before(conn, cursor, statement, params, context, executemany):
+        s = statement.upper()
+        if s.lstrip().startswith("SELECT") and (
+            "FROM PRICE_SETTINGS" in s or "FROM APP_SETTINGS" in s
+        ):
+            seen.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", _before)
+    yield seen
+    event.remove(db.engine, "before_cursor_execute", _before)
+
+
+def test_list_cars_reads_settings_once(client, seeded, settings_selects):
+    resp = client.get("/api/cars")
+    assert resp.status_code == 200 and len(resp.get_json()) == N_CARS
+    assert len(settings_selects) == 2  # price_settings + app_settings, once each
+
+
+def test_thousand_car_serialization_is_not_n_plus_one(app, seeded, settings_selects):
+    cars = Car.query.all()
+    with app.test_request_context("/api/cars"):
+        rows = [c.to_dict() for c in cars]
+        costs = [energy_cost_per_month(c) for c in cars]
+
+    assert len(settings_selects) == 2
+    assert rows[0]["tires_year_effective"] == pytest.approx((6_000 + 8_000) / 3 + 1_500)
+    # EV at 1.80 SEK/kWh plus the default 10% charging loss
+    assert costs[0] == pytest.approx(18_000 / 12 / 100 * 17 * 1.8 * 1.1)
+
+
+def test_price_write_is_visible_to_next_request(client, seeded):
+    assert client.get("/api/settings/prices").get_json()["el_price_ore_kwh"] == 180
+    client.patch("/api/settings/prices", json={"el_price_ore_kwh": 300})
+    with client.application.test_request_context("/"):
+        assert settings_snapshot().prices.el_price_ore_kwh == 300
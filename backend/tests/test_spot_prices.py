@@ -0,0 +1,126 @@
+# backend/tests/test_spot_prices.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.models.models import Car, PriceSettings, db
+from backend.utils import spot_prices
+from backend.utils.spot_prices import (
+    PLUG_IN_HOUR,
+    WINDOW_HOURS,
+    load_profile,
+    load_series,
+    night_profile,
+    smart_charging_price,
+)
+
+DAYS = 30
+
+
+def _hourly(seed=3):
+    rng = np.random.default_rng(seed)
+    hours = np.arange(DAYS * 24) % 24
+    # daytime peak, cheap small hours, plus noise
+    return (
+        80 + 60 * np.sin((hours - 6) / 24 * 2 * np.pi) + rng.uniform(0, 40, len(hours))
+    )
+
+
+@pytest.fixture()
+def price_csv(tmp_path):
+    prices = _hourly()
+    ts = pd.date_range("2024-01-01", periods=len(prices), freq="h")
+    path = tmp_path / "spot_2024.csv"
+    pd.DataFrame({"timestamp": ts, "SE3": prices, "SE4": prices + 20}).to_csv(
+        path, index=False
+    )
+    return path, prices
+
+
+def test_series_is_memory_mapped_and_reused(price_csv, monkeypatch):
+    path, prices = price_csv
+    arr = load_series(path, "se3")
+    assert isinstance(arr, np.memmap)
+    assert np.asarray(arr) == pytest.approx(prices)
+    assert (path.parent / "spot_2024.csv.SE3.npy").is_file()
+
+    def _no_parse(*_):
+        raise AssertionError("sidecar should be reused")
+
+    monkeypatch.setattr(spot_prices, "_parse_series", _no_parse)
+    assert np.asarray(load_series(path, "SE3")) == pytest.approx(prices)
+    with pytest.raises(ValueError):
+        load_series(path, "SE9")
+
+
+def _brute_force(prices, kwh, kw):
+    """Greedy per night: fill the cheapest hours at kw, the rest at the mean."""
+    costs = []
+    for start in range(PLUG_IN_HOUR, len(prices) - WINDOW_HOURS + 1, 24):
+        window = np.sort(prices[start : start + WINDOW_HOURS])
+        left, cost = kwh, 0.0
+        for p in window:
+            take = min(kw, left)
+            cost, left = cost + take * p, left - take
+        costs.append(cost + left * prices.mean())
+    return np.mean(costs) / kwh / 100.0
+
+
+def test_cheapest_hours_match_per_night_greedy():
+    prices = _hourly()
+    profile = night_profile(prices)
+    kwh = np.array([3.0, 11.0, 25.5, 60.0, 200.0])  # the last overflows the window
+    kw = np.array([11.0, 7.4, 0.0, 3.7, 11.0])  # 0 -> default 11 kW
+    expected = [
+        _brute_force(prices, e, k or spot_prices.DEFAULT_AC_KW)
+        for e, k in zip(kwh, kw, strict=True)
+    ]
+    assert smart_charging_price(profile, kwh, kw) == pytest.approx(expected)
+    # a light charge only ever pays for (part of) the cheapest hours
+    assert smart_charging_price(profile, kwh[:1], kw[:1])[0] < prices.mean() / 100
+
+
+@pytest.fixture()
+def seeded(app):
+    db.session.add_all(
+        [
+            Car(model="Ev", year=2022, type_of_vehicle="EV",
+                estimated_purchase_price=400_000, consumption_kwh_per_100km=17,
+                ac_onboard_kw=11),
+            Car(model="Diesel", year=2020, type_of_vehicle="Diesel",
+                estimated_purchase_price=250_000, consumption_l_per_100km=5),
+        ]
+    )  # fmt: skip
+    db.session.add(PriceSettings(id=1, el_price_ore_kwh=250))
+    db.session.commit()
+
+
+def test_spot_mode_feeds_the_listing(app, client, seeded, price_csv):
+    path, _ = price_csv
+    flat = client.get("/api/cars")
+    app.config.update(ENERGY_MODE="spot", SPOT_PRICE_FILE=str(path))
+    try:
+        spot = client.get("/api/cars")
+    finally:
+        app.config.update(ENERGY_MODE="flat", SPOT_PRICE_FILE=None)
+    assert spot.headers["ETag"] != flat.headers["ETag"]
+
+    before = {c["model"]: c for c in flat.get_json()}
+    after = {c["model"]: c for c in spot.get_json()}
+    assert after["Diesel"]["tco_total_5y"] == before["Diesel"]["tco_total_5y"]
+    # 18 000 km * 17 kWh/100 km at the night-time spot price instead of 2.50 SEK
+    profile = load_profile(path)
+    grid_kwh_day = 18_000 / 100 * 17 * 1.1 / 365
+    price = smart_charging_price(profile, np.array([grid_kwh_day]), np.array([11.0]))
+    assert after["Ev"]["energy_fuel_year"] == pytest.approx(
+        18_000 / 100 * 17 * price[0] * 1.1, abs=0.01
+    )
+
+
+def test_missing_spot_file_falls_back_to_flat(app, client, seeded, tmp_path):
+    flat = client.get("/api/cars").get_json()
+    app.config.update(ENERGY_MODE="spot", SPOT_PRICE_FILE=str(tmp_path / "nope.csv"))
+    try:
+        assert client.get("/api/cars").get_json() == flat
+    finally:
+        app.config.update(ENERGY_MODE="flat", SPOT_PRICE_FILE=None)
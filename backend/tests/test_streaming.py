@@ -0,0 +1,76 @@
+# backend/tests/test_streaming.py
+from datetime import date
+
+import pytest
+from flask import jsonify
+
+from backend.models.models import Car, Expense, Income, Month, db
+from backend.utils import streaming
+from backend.utils.balances import recompute_balances
+from backend.utils.streaming import iter_json_array
+
+
+@pytest.fixture(autouse=True)
+def production_json(app):
+    # jsonify pretty-prints in debug; streaming targets the compact form
+    app.config["DEBUG"] = False
+
+
+@pytest.mark.parametrize(
+    "items", [[], [{"b": 1, "a": "å"}], [{"x": i, "y": [i, None]} for i in range(50)]]
+)
+def test_matches_jsonify(app, items):
+    with app.test_request_context():
+        assert b"".join(iter_json_array(iter(items))) == jsonify(items).get_data()
+        env = {"next_cursor": "abc", "limit": 3}
+        expected = jsonify({"items": items, **env}).get_data()
+        assert b"".join(iter_json_array(items, envelope=env)) == expected
+
+
+def test_flushes_in_chunks(app):
+    with app.test_request_context():
+        chunks = list(iter_json_array(({"i": i} for i in range(1000)), chunk_bytes=256))
+    assert len(chunks) > 20
+    assert all(len(c) < 256 + 32 for c in chunks)
+
+
+@pytest.fixture()
+def ledger(app):
+    for i in range(30):
+        m = Month(name=f"M{i}", month_date=date(2023 + i // 12, i % 12 + 1, 1))
+        m.incomes.append(Income(name="Salary", source="Salary", amount=30_000))
+        m.expenses.extend(
+            Expense(category="Food", name=f"e{k}", amount=100 + k) for k in range(20)
+        )
+        db.session.add(m)
+    db.session.add_all(
+        Car(model=f"Car {i}", year=2020, type_of_vehicle="EV",
+            estimated_purchase_price=300_000 + i, consumption_kwh_per_100km=17)
+        for i in range(12)
+    )  # fmt: skip
+    db.session.flush()
+    recompute_balances()
+    db.session.commit()
+
+
+@pytest.mark.parametrize(
+    "path",
+    [
+        "/api/months/all",
+        "/api/months/all?view=summary&from=2024-01",
+        "/api/months?anchor=2024-06",
+        "/api/expenses",
+        "/api/cars?sort=-tco_total_5y",
+        "/api/cars?limit=5",
+    ],
+)
+def test_streamed_body_is_identical(client, ledger, monkeypatch, path):
+    monkeypatch.setattr(streaming, "CHUNK_BYTES", 512)
+    sep = "&" if "?" in path else "?"
+    # streamed first: a cached /api/cars body would be served as-is
+    streamed = client.get(f"{path}{sep}stream=1")
+    plain = client.get(path)
+    assert "Content-Length" in plain.headers
+    assert "Content-Length" not in streamed.headers
+    assert streamed.get_data() == plain.get_data()
+    assert streamed.headers.get("ETag") == plain.headers.get("ETag")
@@ -0,0 +1,181 @@
+# backend/tests/test_tco_kernel.py
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from backend.models.models import PriceSettings, db
+from backend.routes.cars.pricing import amortized_totals
+from backend.routes.cars.serialize import compute_derived
+from backend.utils import tco
+from backend.utils.energy import energy_cost_per_month
+from backend.utils.tco_kernel import (
+    derive_arrays,
+    derive_tco_grid,
+    load_columns,
+    norm_type,
+)
+
+# 12 000 km/year => km100 = 120; interest off unless a test turns it on
+P = dict(
+    elec_sek_kwh=2.0,
+    bensin_sek_l=20.0,
+    diesel_sek_l=22.0,
+    yearly_km=12_000,
+    daily_commute_km=30,
+    tire_lifespan_years=3,
+    downpayment_sek=0.0,
+    interest_rate_pct=0.0,
+)
+
+
+def _derive(P=P, **car):
+    out = derive_arrays(load_columns([SimpleNamespace(**car)]), P)
+    return {k: float(v[0]) for k, v in out.items()}
+
+
+@pytest.mark.parametrize(
+    "car, expected",
+    [
+        (dict(type_of_vehicle="EV", consumption_kwh_per_100km=15), 120 * 15 * 2.0),
+        (dict(type_of_vehicle="Diesel", consumption_l_per_100km=5), 120 * 5 * 22.0),
+        (dict(type_of_vehicle="Bensin", consumption_l_per_100km=6), 120 * 6 * 20.0),
+        (dict(type_of_vehicle="ICE", consumption_l_per_100km=6), 120 * 6 * 20.0),
+        # battery 12 / 17 kWh/100km => 70.6 km range: the whole 30 km commute is
+        # electric, 660 km/month; the remaining 4 080 km/year run on petrol
+        (
+            dict(
+                type_of_vehicle="PHEV",
+                consumption_kwh_per_100km=17,
+                battery_capacity_kwh=12,
+                consumption_l_per_100km=6.5,
+            ),
+            79.2 * 17 * 2.0 + 40.8 * 6.5 * 20.0,
+        ),
+    ],
+)
+def test_energy_year_pins(car, expected):
+    assert _derive(**car)["energy_fuel_year"] == pytest.approx(expected)
+
+
+def test_phev_assumed_range_caps_the_electric_share():
+    # no battery => 40 km range; a 50 km commute drives 40*22 = 880 km/month on EV
+    P50 = {**P, "daily_commute_km": 50}
+    car = dict(
+        type_of_vehicle="PHEV",
+        consumption_kwh_per_100km=17,
+        consumption_l_per_100km=6.5,
+    )
+    assert _derive(P50, **car)["energy_fuel_year"] == pytest.approx(
+        105.6 * 17 * 2.0 + 14.4 * 6.5 * 20.0
+    )
+
+
+def test_recurring_and_tco_pins():
+    car = dict(
+        type_of_vehicle="EV",
+        estimated_purchase_price=300_000,
+        consumption_kwh_per_100km=15,
+        summer_tires_price=6_000,
+        winter_tires_price=8_000,
+        full_insurance_year=0,
+        half_insurance_year=4_000,  # full missing -> half
+        car_tax_year=1_000,
+        repairs_year=2_000,
+        expected_value_after_5y=200_000,
+    )
+    out = _derive(**car)
+    recurring = 3_600 + 14_000 / 3 + 4_000 + 1_000 + 2_000
+    assert out["recurring_year"] == pytest.approx(recurring)
+    assert out["tco_total_5y"] == pytest.approx(100_000 + 5 * recurring)
+    assert out["tco_total_3y"] == pytest.approx(300_000 * 0.45 + 3 * recurring)
+
+    # a per-car replacement interval beats the settings' lifespan
+    out = _derive(**car, tire_replacement_interval_years=2)
+    assert out["recurring_year"] == pytest.approx(recurring - 14_000 / 3 + 7_000)
+
+
+def test_interest_matches_the_scalar_amortization():
+    P_loan = {**P, "downpayment_sek": 50_000, "interest_rate_pct": 4.2}
+    out = _derive(P_loan, type_of_vehicle="EV", estimated_purchase_price=300_000)
+    for y in (3, 5, 8):
+        _, interest = amortized_totals(300_000, 50_000, 4.2, y)
+        assert out[f"interest_{y}y"] == pytest.approx(interest)
+
+
+def test_grid_prices_only_the_requested_horizons():
+    cols = load_columns(
+        [
+            SimpleNamespace(type_of_vehicle="EV", estimated_purchase_price=300_000),
+            SimpleNamespace(type_of_vehicle="Diesel", consumption_l_per_100km=5),
+        ]
+    )
+    grid = {
+        "elec_sek_kwh": np.array([1.0, 2.0]),
+        "bensin_sek_l": np.array([18.0, 20.0]),
+        "diesel_sek_l": np.array([20.0, 22.0]),
+        "interest_rate_pct": np.array([0.0, 4.0]),
+        "yearly_km": np.array([10_000.0, 15_000.0]),
+        "downpayment_sek": np.zeros(2),
+    }
+    full = derive_tco_grid(cols, P, grid)
+    only_5y = derive_tco_grid(cols, P, grid, horizons=(5,))
+    assert only_5y.shape == (2, 2, 1)
+    np.testing.assert_allclose(only_5y[:, :, 0], full[:, :, 1])
+
+
+def test_norm_type():
+    assert [norm_type(v) for v in ("bev", "Plug-in", "DIESEL", "petrol", "HEV")] == [
+        "EV",
+        "PHEV",
+        "Diesel",
+        "Bensin",
+        "Bensin",
+    ]
+    assert norm_type(None) == "EV"
+
+
+@pytest.fixture()
+def prices(app):
+    db.session.add(
+        PriceSettings(
+            id=1,
+            el_price_ore_kwh=180,
+            diesel_price_sek_litre=19.5,
+            bensin_price_sek_litre=17.2,
+            yearly_km=25_000,
+            daily_commute_km=40,
+            downpayment_sek=50_000.0,
+            interest_rate_pct=4.2,
+        )
+    )
+    db.session.commit()
+    return db.session.get(PriceSettings, 1)
+
+
+@pytest.mark.parametrize("kind", ["EV", "PHEV", "Diesel", "Bensin"])
+def test_entry_points_agree(app, prices, kind):
+    car = SimpleNamespace(
+        type_of_vehicle=kind,
+        estimated_purchase_price=320_000,
+        consumption_kwh_per_100km=17,
+        battery_capacity_kwh=12,
+        consumption_l_per_100km=6.2,
+        summer_tires_price=6_000,
+        winter_tires_price=8_000,
+        full_insurance_year=9_000,
+        car_tax_year=1_600,
+        repairs_year=2_500,
+    )
+    routes = compute_derived(car, prices)
+    with app.test_request_context("/"):
+        utils = tco.compute_derived(car)
+        monthly = energy_cost_per_month(car)
+
+    assert monthly * 12 == pytest.approx(routes["energy_fuel_year"], abs=0.01)
+    assert utils["energy_fuel_year"] == round(routes["energy_fuel_year"])
+    for y in (3, 5, 8):
+        assert utils[f"tco_total_{y}y"] == pytest.approx(
+            routes[f"tco_total_{y}y"], abs=0.5
+        )
+        assert utils[f"finance_interest_cost_{y}y"] == routes[f"interest_{y}y"]
@@ -0,0 +1,124 @@
+# backend/tests/test_trips.py
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from backend.models.models import Car, PriceSettings, db
+from backend.routes.cars.pricing import normalize_prices
+from backend.utils.tco_kernel import derive_arrays, load_columns
+from backend.utils.trips import (
+    TripDistribution,
+    expected_electric_km_per_day,
+    parse_trip_distribution,
+)
+
+RANGES = np.array([0.0, 3.0, 12.5, 30.0, 47.0, 80.0, 500.0])
+
+
+def test_samples_match_brute_force():
+    samples = np.random.default_rng(1).exponential(25.0, size=3_000).round(1)
+    dist = TripDistribution.from_samples(samples)
+    expected = [np.minimum(samples, r).mean() for r in RANGES]
+    assert expected_electric_km_per_day(RANGES, dist) == pytest.approx(expected)
+
+
+def test_histogram_is_uniform_within_bins():
+    edges, counts = [5, 10, 30, 60, 120], [3, 5, 2, 1]
+    dist = TripDistribution.from_histogram(edges, counts)
+    # midpoint-rule integration over a fine uniform grid in each bin
+    km, w = [], []
+    for a, b, c in zip(edges[:-1], edges[1:], counts, strict=True):
+        km.append(np.linspace(a, b, 20_001)[:-1] + (b - a) / 40_000)
+        w.append(np.full(20_000, c / 20_000))
+    km, w = np.concatenate(km), np.concatenate(w) / sum(counts)
+    expected = [(np.minimum(km, r) * w).sum() for r in RANGES]
+    assert expected_electric_km_per_day(RANGES, dist) == pytest.approx(expected)
+    assert dist.mean_km == pytest.approx((km * w).sum())
+
+
+def test_commute_point_mass_reproduces_the_commute_model():
+    rng = np.random.default_rng(7)
+    cars = [
+        SimpleNamespace(
+            type_of_vehicle="PHEV",
+            consumption_kwh_per_100km=rng.uniform(0, 25),
+            battery_capacity_kwh=rng.choice([0, rng.uniform(5, 25)]),
+            consumption_l_per_100km=rng.uniform(0, 8),
+        )
+        for _ in range(200)
+    ]
+    P = {**normalize_prices(None), "daily_commute_km": 35}
+    commute = derive_arrays(load_columns(cars), P)["energy_fuel_year"]
+    trips = {**P, "trip_distribution": TripDistribution.commute(35)}
+    assert derive_arrays(load_columns(cars), trips)["energy_fuel_year"] == (
+        pytest.approx(commute)
+    )
+
+
+@pytest.mark.parametrize(
+    "spec",
+    [
+        [1, 2],
+        {"samples": []},
+        {"samples": [5, -1]},
+        {"histogram": {"edges": [0, 10], "counts": [1, 2]}},
+        {"histogram": {"edges": [10, 5], "counts": [1]}},
+        {"commute_km": 30, "samples": [1]},
+        {"commute_km": 30, "days_per_year": 400},
+        "{not json",
+    ],
+)
+def test_bad_specs_are_rejected(spec):
+    with pytest.raises(ValueError):
+        parse_trip_distribution(spec)
+
+
+@pytest.fixture()
+def seeded(app):
+    db.session.add_all(
+        [
+            Car(model="Long", year=2022, type_of_vehicle="PHEV",
+                consumption_kwh_per_100km=18, battery_capacity_kwh=18,
+                consumption_l_per_100km=6),  # 100 km electric range
+            Car(model="Short", year=2020, type_of_vehicle="PHEV",
+                consumption_kwh_per_100km=20, battery_capacity_kwh=6,
+                consumption_l_per_100km=6),  # 30 km electric range
+            Car(model="Ev", year=2022, type_of_vehicle="EV",
+                consumption_kwh_per_100km=16),
+        ]
+    )  # fmt: skip
+    db.session.add(PriceSettings(id=1, yearly_km=15_000, daily_commute_km=30))
+    db.session.commit()
+
+
+def test_phev_split_endpoint(client, seeded):
+    # most days are short, a few are long trips
+    trips = {"histogram": {"edges": [0, 20, 60, 300], "counts": [200, 50, 14]}}
+    body = client.post("/api/cars/phev-split", json={"trips": trips}).get_json()
+    items = {c["model"]: c for c in body["items"]}
+    assert set(items) == {"Long", "Short"}
+    long, short = items["Long"], items["Short"]
+    assert long["electric_range_km"] == 100 and short["electric_range_km"] == 30
+    assert long["electric_km_year"] > short["electric_km_year"]
+    assert long["electric_km_year"] + long["fuel_km_year"] == pytest.approx(15_000)
+    # long trips make the 30 km car fall back to petrol more than the commute model
+    assert short["energy_fuel_year"] > short["energy_fuel_year_commute"]
+
+    same = client.post("/api/cars/phev-split", json={"trips": {"commute_km": 30}})
+    for c in same.get_json()["items"]:
+        assert c["energy_fuel_year"] == c["energy_fuel_year_commute"]
+
+    bad = client.post("/api/cars/phev-split", json={"trips": {"samples": "x"}})
+    assert bad.status_code == 400
+
+
+def test_configured_distribution_drives_the_listing(app, client, seeded):
+    before = {c["model"]: c for c in client.get("/api/cars").get_json()}
+    app.config["PHEV_TRIP_DISTRIBUTION"] = '{"samples": [10, 10, 10, 200]}'
+    try:
+        after = {c["model"]: c for c in client.get("/api/cars").get_json()}
+    finally:
+        app.config.pop("PHEV_TRIP_DISTRIBUTION")
+    assert after["Ev"]["tco_total_5y"] == before["Ev"]["tco_total_5y"]
+    assert after["Short"]["energy_fuel_year"] != before["Short"]["energy_fuel_year"]
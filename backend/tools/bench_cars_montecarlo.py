@@ -0,0 +1,64 @@
+# backend/tools/bench_cars_montecarlo.py
+"""
+Benchmark: Monte Carlo TCO scaling with process-pool workers.
+
+    python -m backend.tools.bench_cars_montecarlo                # 200 cars, 20k paths
+    python -m backend.tools.bench_cars_montecarlo 500 10000      # cars, paths
+
+Uses synthetic cars (no DB needed), runs on pools of 1, 2, 4, ... up to
+os.cpu_count() workers (started before timing, as the app's shared pool is)
+and checks every run reproduces the single-worker numbers.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from backend.routes.cars import montecarlo
+from backend.routes.cars.montecarlo import parse_spec, run_monte_carlo
+from backend.tools.bench_cars_tco import _synthetic_cars
+
+
+def _worker_counts() -> list[int]:
+    cores = os.cpu_count() or 1
+    counts, w = [], 1
+    while w < cores:
+        counts.append(w)
+        w *= 2
+    return [*counts, cores]
+
+
+def main(argv: list[str]) -> None:
+    n_cars = int(argv[0]) if argv else 200
+    paths = int(argv[1]) if len(argv) > 1 else montecarlo.MAX_PATHS
+    montecarlo.MAX_CELLS = max(montecarlo.MAX_CELLS, n_cars * paths * 3)
+
+    cars = _synthetic_cars(n_cars)
+    for c in cars:
+        c.model = f"Car {c.id}"
+    spec = parse_spec({"paths": paths, "seed": 1})
+
+    print(f"{n_cars} cars x {paths} paths, {os.cpu_count()} cores")
+    print(f"{'workers':>8} {'time [s]':>10} {'speedup':>9}")
+    baseline = reference = None
+    for w in _worker_counts():
+        pool = ProcessPoolExecutor(max_workers=w) if w > 1 else None
+        if pool is not None:
+            list(pool.map(abs, range(w)))  # start the workers outside the timing
+        t0 = time.perf_counter()
+        out = run_monte_carlo(cars, None, spec, pool=pool)
+        elapsed = time.perf_counter() - t0
+        if pool is not None:
+            pool.shutdown()
+        if reference is None:
+            baseline, reference = elapsed, out
+        elif out != reference:
+            raise SystemExit(f"[FAIL] results differ with {w} workers")
+        print(f"{w:>8} {elapsed:>10.3f} {baseline / elapsed:>8.2f}x")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
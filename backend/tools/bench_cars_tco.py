@@ -0,0 +1,70 @@
+# backend/tools/bench_cars_tco.py
+"""
+Benchmark: per-car compute_derived vs vectorized compute_derived_batch.
+
+    python -m backend.tools.bench_cars_tco            # 1k / 10k / 100k
+    python -m backend.tools.bench_cars_tco 5000 50000 # custom sizes
+
+Uses synthetic cars (no DB needed) and checks both paths agree.
+"""
+
+from __future__ import annotations
+
+import random
+import sys
+import time
+from decimal import Decimal
+from types import SimpleNamespace
+
+from backend.routes.cars.batch import compute_derived_batch
+from backend.routes.cars.serialize import compute_derived
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+
+
+def _synthetic_cars(n: int, seed: int = 42) -> list[SimpleNamespace]:
+    rng = random.Random(seed)
+    types = ("EV", "PHEV", "Diesel", "Bensin")
+    return [
+        SimpleNamespace(
+            id=i,
+            type_of_vehicle=rng.choice(types),
+            estimated_purchase_price=rng.randint(80_000, 700_000),
+            consumption_kwh_per_100km=Decimal(str(round(rng.uniform(12, 25), 2))),
+            consumption_l_per_100km=round(rng.uniform(0, 9), 1),
+            summer_tires_price=rng.randint(4_000, 15_000),
+            winter_tires_price=rng.randint(5_000, 16_000),
+            tire_replacement_interval_years=Decimal("3.00"),
+            full_insurance_year=rng.randint(6_000, 18_000),
+            half_insurance_year=rng.randint(3_000, 9_000),
+            car_tax_year=rng.choice((360, 1_600, 3_200)),
+            repairs_year=rng.randint(2_000, 8_000),
+        )
+        for i in range(n)
+    ]
+
+
+def _time(fn, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main(argv: list[str]) -> None:
+    sizes = [int(a) for a in argv] or list(DEFAULT_SIZES)
+    print(f"{'cars':>8} {'scalar [s]':>12} {'batch [s]':>12} {'speedup':>9}")
+    for n in sizes:
+        cars = _synthetic_cars(n)
+        scalar = _time(lambda cars=cars: [compute_derived(c, None) for c in cars], 1)
+        batch = _time(lambda cars=cars: compute_derived_batch(cars, None))
+        expected = [compute_derived(c, None) for c in cars]
+        if compute_derived_batch(cars, None) != expected:
+            raise SystemExit(f"[FAIL] batch/scalar mismatch at n={n}")
+        print(f"{n:>8} {scalar:>12.4f} {batch:>12.4f} {scalar / batch:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
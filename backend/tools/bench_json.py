@@ -0,0 +1,125 @@
+# backend/tools/bench_json.py
+"""
+Benchmark: JSON serialization of the /api/cars and /api/months/all payloads,
+Flask's stdlib provider vs the orjson provider (utils.json_provider).
+
+    python -m backend.tools.bench_json                 # 2k cars, 10 years
+    python -m backend.tools.bench_json 10000 30        # cars, years of months
+
+Seeds a throwaway in-memory SQLite DB, builds each payload once through the
+real query code, then times provider.response() (best of 5) and records the
+peak traced allocation of one call. "months raw" is the same history as
+un-converted rows (Decimal amounts, date objects), which only the custom
+providers accept.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import time
+import tracemalloc
+from datetime import date
+from decimal import Decimal
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from werkzeug.datastructures import MultiDict  # noqa: E402
+
+from backend.app import create_app  # noqa: E402
+from backend.models.models import Car, Expense, Income, Month, db  # noqa: E402
+from backend.routes.cars.query import CarQuery, run_query  # noqa: E402
+from backend.routes.months import build_months_data  # noqa: E402
+from backend.utils.balances import month_summaries, recompute_balances  # noqa: E402
+from backend.utils.json_provider import (  # noqa: E402
+    OrjsonProvider,
+    StdlibJSONProvider,
+    orjson,
+)
+
+from .bench_cars_tco import _synthetic_cars  # noqa: E402
+
+EXPENSES_PER_MONTH = 40
+
+
+def _seed(n_cars: int, years: int) -> None:
+    for c in _synthetic_cars(n_cars):
+        fields = {k: v for k, v in vars(c).items() if k != "id"}
+        db.session.add(Car(model=f"Car {c.id}", year=2020, **fields))
+    for i in range(years * 12):
+        m = Month(name=f"M{i}", month_date=date(2015 + i // 12, i % 12 + 1, 1))
+        m.incomes.append(Income(name="Salary", source="Salary", amount=42_000))
+        m.expenses.extend(
+            Expense(category="Food", name=f"item {k}", amount=Decimal("123.45"))
+            for k in range(EXPENSES_PER_MONTH)
+        )
+        db.session.add(m)
+    db.session.flush()
+    recompute_balances()
+    db.session.commit()
+
+
+def _raw_months() -> list[dict]:
+    rows = []
+    for m in db.session.query(Month).order_by(Month.month_date):
+        rows.append(
+            {
+                "id": m.id,
+                "month_date": m.month_date,
+                "ending_funds": Decimal(str(m.ending_funds)),
+                "expenses": [
+                    {"name": e.name, "amount": Decimal(str(e.amount))}
+                    for e in m.expenses
+                ],
+            }
+        )
+    return rows
+
+
+def _measure(provider, payload) -> tuple[float, float, int]:
+    best = float("inf")
+    for _ in range(5):
+        t0 = time.perf_counter()
+        body = provider.response(payload).get_data()
+        best = min(best, time.perf_counter() - t0)
+    tracemalloc.start()
+    provider.response(payload)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best * 1e3, peak / 2**20, len(body)
+
+
+def main(argv: list[str]) -> None:
+    n_cars = int(argv[0]) if argv else 2_000
+    years = int(argv[1]) if len(argv) > 1 else 10
+    app = create_app()
+    app.config["DEBUG"] = False
+    providers = {"stdlib": StdlibJSONProvider(app)}
+    if orjson is not None:
+        providers["orjson"] = OrjsonProvider(app)
+    else:
+        print("orjson not installed: stdlib only")
+
+    with app.test_request_context():
+        db.create_all()
+        _seed(n_cars, years)
+        payloads = {
+            "cars": run_query(CarQuery.from_args(MultiDict()), None),
+            "months/all": build_months_data(month_summaries()),
+            "months raw": _raw_months(),
+        }
+        print(
+            f"{'payload':>11} {'provider':>8} {'size [KiB]':>11} "
+            f"{'time [ms]':>10} {'peak alloc [MiB]':>17}"
+        )
+        for name, payload in payloads.items():
+            for pname, provider in providers.items():
+                ms, mib, size = _measure(provider, payload)
+                print(
+                    f"{name:>11} {pname:>8} {size / 1024:>11.0f} "
+                    f"{ms:>10.2f} {mib:>17.2f}"
+                )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,47 @@
+# backend/tools/bench_tco_kernel.py
+"""
+Benchmark: the shared TCO kernel behind every entry point, in µs per car.
+
+    python -m backend.tools.bench_tco_kernel            # 1k / 10k / 100k
+    python -m backend.tools.bench_tco_kernel 5000       # custom sizes
+
+Compares the raw kernel pass with the per-car calls of routes.cars
+(serialize.compute_derived) and utils.tco, and utils.tco's batched path.
+Runs outside an app context, so utils.tco prices with its defaults.
+"""
+
+from __future__ import annotations
+
+import sys
+
+from backend.routes.cars.pricing import normalize_prices
+from backend.routes.cars.serialize import compute_derived
+from backend.utils import tco
+from backend.utils.tco_kernel import derive_arrays, load_columns
+
+from .bench_cars_tco import _synthetic_cars, _time
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+
+
+def main(argv: list[str]) -> None:
+    sizes = [int(a) for a in argv] or list(DEFAULT_SIZES)
+    P = normalize_prices(None)
+    paths = {
+        "kernel": lambda cars: derive_arrays(load_columns(cars), P),
+        "utils.tco many": tco.compute_derived_many,
+        "utils.tco 1x": lambda cars: [tco.compute_derived(c) for c in cars],
+        "routes 1x": lambda cars: [compute_derived(c, None) for c in cars],
+    }
+    print(f"{'cars':>8} " + " ".join(f"{name:>15}" for name in paths) + "  [µs/car]")
+    for n in sizes:
+        cars = _synthetic_cars(n)
+        cells = []
+        for name, fn in paths.items():
+            repeat = 1 if name.endswith("1x") else 3
+            cells.append(_time(lambda fn=fn, cars=cars: fn(cars), repeat) / n * 1e6)
+        print(f"{n:>8} " + " ".join(f"{c:>15.2f}" for c in cells))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -1,113 +1,127 @@
 # backend/tools/bootstrap_schema.py
+"""
+Bring a database to the current schema: `python -m backend.tools.bootstrap_schema`.
+
+Schema changes live in backend/migrations (Flask-Migrate / Alembic); this
+script only adopts databases that predate them. Such databases were built by
+db.create_all() and have no alembic_version table, so they are stamped at
+the newest revision whose schema they already have (see ADOPTION_MARKERS)
+before `upgrade` runs the rest of the chain. A couple of column fix-ups for
+databases older than the baseline revision run first.
+
+The schema is inspected once up front rather than per column check. Last,
+the stored month balances (the source of truth GET /api/months serves) are
+re-chained once, so databases written by older code start out consistent.
+"""
+
 from __future__ import annotations
 
-from collections.abc import Iterable
+from collections.abc import Callable
 
+from flask_migrate import stamp, upgrade
 from sqlalchemy import inspect, text
-from sqlalchemy.engine import Engine
+from sqlalchemy.engine.reflection import Inspector
 
 from backend.app import create_app
 from backend.models.models import db
+from backend.utils.balances import recompute_balances
 
 
-def _has_table(engine: Engine, table: str) -> bool:
-    insp = inspect(engine)
-    return table in insp.get_table_names()
+def _index_names(insp: Inspector, table: str) -> set[str]:
+    return {i["name"] for i in insp.get_indexes(table)}
 
 
-def _has_col(engine: Engine, table: str, col: str) -> bool:
-    insp = inspect(engine)
-    if not _has_table(engine, table):
-        return False
-    return any(c["name"] == col for c in insp.get_columns(table))
+# (revision, test on a create_all() database), newest first
+ADOPTION_MARKERS: tuple[tuple[str, Callable[[Inspector, set[str]], bool]], ...] = (
+    (
+        "0004_query_indexes",
+        lambda insp, tables: "ix_months_month_date_id" in _index_names(insp, "months"),
+    ),
+    ("0003_loans", lambda insp, tables: "loans" in tables),
+    ("0002_versions_and_jobs", lambda insp, tables: "data_versions" in tables),
+    ("0001_baseline", lambda insp, tables: True),
+)
 
 
 def _exec(sql: str) -> None:
     db.session.execute(text(sql))
 
 
-def _add_col_if_missing(engine: Engine, table: str, col: str, ddl: str) -> bool:
-    if not _has_table(engine, table):
-        print(f"[SKIP] Table '{table}' not found; skipping add column '{col}'.")
-        return False
-    if _has_col(engine, table, col):
-        print(f"[OK]    {table}.{col} already exists.")
-        return False
-    print(f"[MIGRATE] Add {table}.{col} {ddl}")
-    _exec(f"ALTER TABLE {table} ADD COLUMN {col} {ddl}")
+def _pre_baseline_fixups(columns: dict[str, set[str]]) -> None:
+    """Columns added/dropped by hand before the baseline revision existed."""
+    cars = columns.get("cars")
+    if cars is not None:
+        if "tire_replacement_interval_years" not in cars:
+            print("[MIGRATE] Add cars.tire_replacement_interval_years")
+            _exec(
+                "ALTER TABLE cars ADD COLUMN tire_replacement_interval_years NUMERIC(4,2)"
+            )
+        # Default to 3 years where NULL (safe to run repeatedly)
+        _exec(
+            "UPDATE cars SET tire_replacement_interval_years = 3"
+            " WHERE tire_replacement_interval_years IS NULL"
+        )
+        for col in ("dc_time_min_10_80_est", "ac_time_h_0_100_est"):
+            if col in cars:
+                print(f"[MIGRATE] Drop cars.{col}")
+                _exec(f"ALTER TABLE cars DROP COLUMN {col}")
+
+    settings = columns.get("app_settings")
+    if settings is not None:
+        if "tire_change_price_year" not in settings:
+            print("[MIGRATE] Add app_settings.tire_change_price_year")
+            _exec(
+                "ALTER TABLE app_settings"
+                " ADD COLUMN tire_change_price_year NUMERIC(10,2) DEFAULT 2000"
+            )
+        # Ensure singleton row exists (id=1); do not overwrite existing
+        _exec(
+            """
+            INSERT INTO app_settings
+                (id, electricity_price_ore_kwh, bensin_price_sek_litre,
+                 diesel_price_sek_litre, yearly_driving_km, daily_commute_km,
+                 tire_change_price_year)
+            SELECT 1, 250, 14, 15, 18000, 30,
+                   COALESCE(
+                     (SELECT tire_change_price_year FROM app_settings LIMIT 1),
+                     2000
+                   )
+             WHERE NOT EXISTS (SELECT 1 FROM app_settings WHERE id = 1)
+            """
+        )
     db.session.commit()
-    return True
 
 
-def _drop_cols_if_exist(engine: Engine, table: str, cols: Iterable[str]) -> None:
-    if not _has_table(engine, table):
-        return
-    for col in cols:
-        if _has_col(engine, table, col):
-            print(f"[MIGRATE] Drop {table}.{col}")
-            _exec(f"ALTER TABLE {table} DROP COLUMN IF EXISTS {col}")
-            db.session.commit()
+def adopted_revision(insp: Inspector, tables: set[str]) -> str | None:
+    """Revision an unversioned database matches; None when it is empty."""
+    if "alembic_version" in tables or "months" not in tables:
+        return None
+    return next(rev for rev, matches in ADOPTION_MARKERS if matches(insp, tables))
 
 
 def main() -> None:
     app = create_app()
     with app.app_context():
-        uri = app.config.get("SQLALCHEMY_DATABASE_URI")
-        print("[INFO] Using DB:", uri)
-        engine = db.engine
-
-        # ---- cars.tire_replacement_interval_years ----
-        _add_col_if_missing(
-            engine, "cars", "tire_replacement_interval_years", "NUMERIC(4,2)"
-        )
-
-        # Default to 3 years where NULL (safe to run repeatedly)
-        if _has_table(engine, "cars"):
-            _exec(
-                """
-                UPDATE cars
-                   SET tire_replacement_interval_years = 3
-                 WHERE tire_replacement_interval_years IS NULL
-                """
-            )
-            db.session.commit()
-
-        # ---- app_settings.tire_change_price_year ----
-        _add_col_if_missing(
-            engine,
-            "app_settings",
-            "tire_change_price_year",
-            "NUMERIC(10,2) DEFAULT 2000",
-        )
-
-        # Ensure singleton row exists (id=1); do not overwrite existing
-        if _has_table(engine, "app_settings"):
-            _exec(
-                """
-                INSERT INTO app_settings
-                    (id, electricity_price_ore_kwh, bensin_price_sek_litre, diesel_price_sek_litre,
-                     yearly_driving_km, daily_commute_km, tire_change_price_year)
-                SELECT 1, 250, 14, 15, 18000, 30,
-                       COALESCE(
-                         (SELECT tire_change_price_year FROM app_settings LIMIT 1),
-                         2000
-                       )
-                 WHERE NOT EXISTS (SELECT 1 FROM app_settings WHERE id = 1)
-                """
-            )
-            db.session.commit()
-
-        # ---- cleanup: drop deprecated *_est columns on cars ----
-        _drop_cols_if_exist(
-            engine,
-            "cars",
-            cols=("dc_time_min_10_80_est", "ac_time_h_0_100_est"),
-        )
-
-        # ---- quick verify printouts ----
-        if _has_table(engine, "cars"):
-            cols = [c["name"] for c in inspect(engine).get_columns("cars")]
-            print("[OK] cars columns:", ", ".join(sorted(cols)))
+        print("[INFO] Using DB:", app.config.get("SQLALCHEMY_DATABASE_URI"))
+        insp = inspect(db.engine)
+        tables = set(insp.get_table_names())
+        columns = {
+            t: {c["name"] for c in insp.get_columns(t)}
+            for t in ("cars", "app_settings")
+            if t in tables
+        }
+        revision = adopted_revision(insp, tables)
+        _pre_baseline_fixups(columns)
+        db.session.remove()
+
+        if revision is not None:
+            print(f"[MIGRATE] Existing schema; stamping {revision}")
+            stamp(revision=revision)
+        upgrade()
+        changed = recompute_balances()
+        db.session.commit()
+        if changed:
+            print(f"[MIGRATE] Re-chained balances of {changed} months")
         print("[DONE] Schema OK.")
 
 
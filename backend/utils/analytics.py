@@ -0,0 +1,151 @@
+# backend/utils/analytics.py
+"""
+Key × month pivots of the ledger (expenses by category, incomes by source).
+
+The database does the heavy part: one GROUP BY (month, key) with SUM(amount)
+over the requested window plus the lookback that rolling averages and
+year-over-year deltas need. pandas then lays the sums out on a calendar of
+months, so "12 months earlier" is a column shift even across gaps.
+
+Months without a Month row stay unknown (null) rather than 0: they are left
+out of rolling means, give no YoY delta and are not returned.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from datetime import date
+from typing import Any
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import func, select
+
+from backend.models.models import Expense, Income, Month, db
+
+YOY_LAG = 12  # months
+
+# kind -> (model, {dimension: column}, label for NULL keys)
+LEDGERS: dict[str, tuple[Any, dict[str, Any], str]] = {
+    "expenses": (Expense, {"category": Expense.category}, "Other"),
+    "incomes": (Income, {"source": Income.source, "name": Income.name}, "Unknown"),
+}
+
+
+def add_months(d: date, n: int) -> date:
+    """First of the month `n` months after `d` (n may be negative)."""
+    k = d.year * 12 + d.month - 1 + n
+    return date(k // 12, k % 12 + 1, 1)
+
+
+def lookback_months(rolling: int | None, yoy: bool) -> int:
+    """History needed before the window's first month."""
+    return max((rolling or 1) - 1, YOY_LAG if yoy else 0)
+
+
+def ledger_sums(
+    kind: str,
+    by: str,
+    *,
+    start: date | None = None,
+    before: date | None = None,
+    keys: Iterable[str] = (),
+) -> tuple[list[date], list[tuple[date, str | None, Any]]]:
+    """
+    (month dates present in [start, before), [(month_date, key, SUM(amount))]).
+    Months without a month_date are skipped.
+    """
+    model, dims, _ = LEDGERS[kind]
+    key_col = dims[by]
+
+    def window(stmt):
+        stmt = stmt.where(Month.month_date.is_not(None))
+        if start is not None:
+            stmt = stmt.where(Month.month_date >= start)
+        if before is not None:
+            stmt = stmt.where(Month.month_date < before)
+        return stmt
+
+    months = db.session.scalars(window(select(Month.month_date))).all()
+    stmt = window(
+        select(Month.month_date, key_col, func.sum(model.amount))
+        .join(Month, Month.id == model.month_id)
+        .group_by(Month.month_date, key_col)
+    )
+    keys = list(keys)
+    if keys:
+        stmt = stmt.where(key_col.in_(keys))
+    return list(months), [tuple(r) for r in db.session.execute(stmt).all()]
+
+
+def _series(values: pd.Series, cols, rolling: int | None, yoy: bool) -> dict:
+    def out(s: pd.Series) -> list[float | None]:
+        s = s[cols].round(2)
+        return [None if np.isnan(v) else float(v) for v in s.to_numpy()]
+
+    row: dict[str, Any] = {
+        "values": out(values),
+        "sum": round(float(np.nansum(values[cols].to_numpy())), 2),
+    }
+    if rolling:
+        row["rolling_avg"] = out(values.rolling(rolling, min_periods=1).mean())
+    if yoy:
+        row["yoy_delta"] = out(values - values.shift(YOY_LAG))
+    return row
+
+
+def month_pivot(
+    months: Iterable[date],
+    rows: Iterable[tuple[date, str | None, Any]],
+    *,
+    start: date | None = None,
+    end: date | None = None,
+    rolling: int | None = None,
+    yoy: bool = False,
+    null_key: str = "Other",
+) -> dict[str, Any]:
+    """
+    {months: ["YYYY-MM", ...], series: [{key, values, sum, rolling_avg?,
+    yoy_delta?}, ...] (largest sum first), total: {...}} for the months in
+    [start, end] (first-of-month dates, inclusive). `months`/`rows` should
+    reach lookback_months() earlier for complete rolling/YoY figures.
+    """
+    present = pd.PeriodIndex(sorted({pd.Period(m, "M") for m in months}), freq="M")
+    mask = np.ones(len(present), dtype=bool)
+    if start is not None:
+        mask &= present >= pd.Period(start, "M")
+    if end is not None:
+        mask &= present <= pd.Period(end, "M")
+    shown = present[mask]
+    empty = {"months": [], "series": [], "total": {"values": [], "sum": 0.0}}
+    if shown.empty:
+        return empty
+
+    calendar = pd.period_range(present.min(), present.max(), freq="M")
+    df = pd.DataFrame(list(rows), columns=["month", "key", "amount"])
+    if df.empty:
+        table = pd.DataFrame(columns=calendar, dtype=float)
+    else:
+        df["month"] = pd.PeriodIndex(pd.to_datetime(df["month"]), freq="M")
+        df["key"] = df["key"].fillna(null_key).astype(str)
+        df["amount"] = pd.to_numeric(df["amount"], errors="coerce").astype(float)
+        table = df.pivot_table(
+            index="key", columns="month", values="amount", aggfunc="sum"
+        ).reindex(columns=calendar)
+    # months with a Month row and no entries are 0; months without one unknown
+    known = calendar.isin(present)
+    table.loc[:, known] = table.loc[:, known].fillna(0.0)
+    table.loc[:, ~known] = np.nan
+
+    series = [
+        {"key": key, **_series(values, shown, rolling, yoy)}
+        for key, values in table.iterrows()
+    ]
+    series.sort(key=lambda r: (-r["sum"], r["key"]))
+
+    total = table.sum(axis=0, min_count=0).where(known)
+    return {
+        "months": [str(p) for p in shown],
+        "series": series,
+        "total": _series(total, shown, rolling, yoy),
+    }
@@ -0,0 +1,245 @@
+# backend/utils/balances.py
+"""
+Running month balances, maintained on write.
+
+Each month's surplus is Σ incomes − Σ expenses; balances chain in month order
+(month_date, id): the first month keeps its own starting_funds and opens the
+loan at Financing 'loans_taken' (0 if unset), every later month starts from
+the previous ending_funds / loan_remaining, and loan_remaining moves by the
+month's adjustments (disbursement +, payment −). Adjustments linked to a
+scheduled Loan belong to that loan's schedule instead (utils.loans).
+
+The stored columns (surplus, starting_funds, ending_funds, loan_remaining)
+are the source of truth for the chain. Writers call
+recompute_balances(month_id) inside their transaction: the chain is
+re-derived from that month onward with three GROUP BY sums and one
+executemany UPDATE, seeded from the previous month's stored row.
+
+month_summaries() reads those columns as they are and only sums the
+per-month totals (GROUP BY, restricted to the months it returns) in the
+same statement; no line items are loaded and nothing is re-chained on read.
+Scheduled loans are added on read: each month's loan_remaining gains their
+closing balance, and loan_interest / loan_amortization report their cost.
+"""
+
+from __future__ import annotations
+
+from datetime import date
+from decimal import Decimal
+from typing import Any
+
+from sqlalchemy import case, func, select, update
+
+from backend.models.models import Expense, Financing, Income, LoanAdjustment, Month, db
+
+from .loans import first_of_month, month_totals
+
+# Month order shared with /api/months
+MONTH_ORDER = (Month.month_date.asc(), Month.id.asc())
+
+LOAN_SEED_KEY = "loans_taken"
+
+# Signed effect of an adjustment on loan_remaining (unless it is a Loan's)
+_UNLINKED = LoanAdjustment.loan_id.is_(None)
+_LOAN_DELTA = case(
+    (_UNLINKED & (LoanAdjustment.type == "disbursement"), LoanAdjustment.amount),
+    (_UNLINKED & (LoanAdjustment.type == "payment"), -LoanAdjustment.amount),
+    else_=0,
+)
+
+
+def _f(v: Any) -> float:
+    if v is None:
+        return 0.0
+    if isinstance(v, Decimal):
+        return float(v)
+    try:
+        return float(v)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _sums(value, month_col, ids: list[int]) -> dict[int, float]:
+    rows = db.session.execute(
+        select(month_col, func.sum(value)).where(month_col.in_(ids)).group_by(month_col)
+    ).all()
+    return {mid: _f(total) for mid, total in rows}
+
+
+def _opening_loan() -> float:
+    value = db.session.execute(
+        select(Financing.value).where(Financing.name == LOAN_SEED_KEY).limit(1)
+    ).scalar()
+    return _f(value)
+
+
+def recompute_balances(from_month_id: int | None = None) -> int:
+    """
+    Re-chain surplus / starting_funds / ending_funds / loan_remaining for the
+    month `from_month_id` and every later month (all months when None), in
+    the caller's transaction. Returns the number of rows updated; 0 for an
+    unknown month. Month rows are locked FOR UPDATE (no-op on SQLite) so
+    concurrent writers serialize on the chain.
+    """
+    months = db.session.execute(
+        select(
+            Month.id,
+            Month.starting_funds,
+            Month.ending_funds,
+            Month.surplus,
+            Month.loan_remaining,
+        )
+        .order_by(*MONTH_ORDER)
+        .with_for_update()
+    ).all()
+    if from_month_id is None:
+        start = 0
+    else:
+        start = next(
+            (i for i, m in enumerate(months) if str(m.id) == str(from_month_id)),
+            None,
+        )
+        if start is None:
+            return 0
+    tail = months[start:]
+    if not tail:
+        return 0
+
+    ids = [m.id for m in tail]
+    incomes = _sums(Income.amount, Income.month_id, ids)
+    expenses = _sums(Expense.amount, Expense.month_id, ids)
+    loans = _sums(_LOAN_DELTA, LoanAdjustment.month_id, ids)
+
+    if start == 0:
+        funds = _f(tail[0].starting_funds)
+        loan = _opening_loan()
+    else:
+        funds = _f(months[start - 1].ending_funds)
+        loan = _f(months[start - 1].loan_remaining)
+
+    changes: list[dict[str, Any]] = []
+    for m in tail:
+        surplus = incomes.get(m.id, 0.0) - expenses.get(m.id, 0.0)
+        ending = funds + surplus
+        loan += loans.get(m.id, 0.0)
+        row = {
+            "starting_funds": funds,
+            "ending_funds": ending,
+            "surplus": surplus,
+            "loan_remaining": loan,
+        }
+        if any(_f(getattr(m, k)) != v for k, v in row.items()):
+            changes.append({"id": m.id, **row})
+        funds = ending
+
+    if changes:
+        db.session.execute(update(Month), changes)
+    return len(changes)
+
+
+# ---------- read path ----------
+def _grouped(value, month_col, month_ids, name):
+    return (
+        select(month_col.label("month_id"), func.sum(value).label("total"))
+        .where(month_col.in_(month_ids))
+        .group_by(month_col)
+        .subquery(name)
+    )
+
+
+_SUMMARY_NUMBERS = (
+    "income",
+    "expenses",
+    "surplus",
+    "loan_delta",
+    "starting_funds",
+    "ending_funds",
+    "loan_remaining",
+)
+
+
+def _summary_statement(
+    date_from: date | None = None,
+    date_before: date | None = None,
+    month_id: int | None = None,
+    limit: int | None = None,
+):
+    """Stored balances plus GROUP BY totals for the selected months, in order."""
+    chosen = select(Month.id).order_by(*MONTH_ORDER)
+    if month_id is not None:
+        chosen = chosen.where(Month.id == month_id)
+    if date_from is not None:
+        chosen = chosen.where(Month.month_date >= date_from)
+    if date_before is not None:
+        chosen = chosen.where(Month.month_date < date_before)
+    if limit is not None:
+        chosen = chosen.limit(limit)
+    ids = select(chosen.subquery("chosen").c.id)
+
+    inc = _grouped(Income.amount, Income.month_id, ids, "inc")
+    exp = _grouped(Expense.amount, Expense.month_id, ids, "exp")
+    adj = _grouped(_LOAN_DELTA, LoanAdjustment.month_id, ids, "adj")
+    income = func.coalesce(inc.c.total, 0)
+    expenses = func.coalesce(exp.c.total, 0)
+    return (
+        select(
+            Month.id,
+            Month.name,
+            Month.month_date,
+            Month.is_current,
+            income.label("income"),
+            expenses.label("expenses"),
+            (income - expenses).label("surplus"),
+            func.coalesce(adj.c.total, 0).label("loan_delta"),
+            func.coalesce(Month.starting_funds, 0).label("starting_funds"),
+            func.coalesce(Month.ending_funds, 0).label("ending_funds"),
+            func.coalesce(Month.loan_remaining, 0).label("loan_remaining"),
+        )
+        .outerjoin(inc, inc.c.month_id == Month.id)
+        .outerjoin(exp, exp.c.month_id == Month.id)
+        .outerjoin(adj, adj.c.month_id == Month.id)
+        .where(Month.id.in_(ids))
+        .order_by(*MONTH_ORDER)
+    )
+
+
+def month_summaries(
+    *,
+    date_from: date | None = None,
+    date_before: date | None = None,
+    month_id: int | None = None,
+    limit: int | None = None,
+) -> list[dict[str, Any]]:
+    """
+    Per-month totals and balances in month order, in one SQL statement: id,
+    name, month_date, is_current, income, expenses, surplus, loan_delta,
+    starting_funds, ending_funds, loan_remaining (+ loan_interest,
+    loan_amortization and loan_scheduled, the scheduled loans' share of
+    loan_remaining).
+
+    The balances are the stored columns recompute_balances() keeps chained;
+    only the per-month totals are summed here (GROUP BY), and only for the
+    selected months. `date_from` (inclusive), `date_before` (exclusive),
+    `month_id` and `limit` select the rows (a bound excludes months without
+    a month_date).
+    """
+    stmt = _summary_statement(date_from, date_before, month_id, limit)
+    out = [dict(r) for r in db.session.execute(stmt).mappings().all()]
+    for row in out:
+        for key in _SUMMARY_NUMBERS:
+            row[key] = _f(row[key])
+        row["is_current"] = bool(row["is_current"])
+    _add_schedules(out)
+    return out
+
+
+def _add_schedules(rows: list[dict[str, Any]]) -> None:
+    dates = [r["month_date"] for r in rows if r["month_date"] is not None]
+    totals = month_totals(max(dates)) if dates else {}
+    for row in rows:
+        d = row["month_date"]
+        t = totals.get(first_of_month(d)) if d is not None else None
+        row["loan_interest"] = t["interest"] if t else 0.0
+        row["loan_amortization"] = t["amortization"] if t else 0.0
+        row["loan_scheduled"] = t["balance"] if t else 0.0
+        row["loan_remaining"] += row["loan_scheduled"]
@@ -0,0 +1,233 @@
+# backend/utils/bulk.py
+"""
+Bulk ingestion for the ledger tables (POST /api/<ledger>/bulk).
+
+One pass validates every row (field checks plus a single IN query each for
+the referenced months and loans) and collects per-row errors. By default any
+error rejects the whole batch (400, nothing written); with ?partial=1 the
+valid rows are written and the errors reported alongside.
+
+The valid rows go in with one executemany INSERT (insertmanyvalues batches),
+or COPY ... FROM STDIN on Postgres for large batches, inside one transaction
+that also re-chains the balances once from the earliest affected month and
+bumps the table's data version.
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+import math
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from flask import current_app, jsonify, request
+from sqlalchemy import insert, select
+
+from backend.models.models import Expense, Income, Loan, LoanAdjustment, Month, db
+
+from .balances import MONTH_ORDER, recompute_balances
+from .versions import bump
+
+MAX_ROWS = 10_000
+MAX_ERRORS = 200  # reported; error_count has the full number
+COPY_MIN_ROWS = 2_000  # Postgres: COPY beats executemany from here on
+
+_TRUE = {"1", "true", "yes", "on"}
+
+
+# ---------- row parsing ----------
+def _text(row: dict, *keys: str, required: str | None = None, max_len: int = 0):
+    for key in keys:
+        v = row.get(key)
+        if isinstance(v, str | int | float) and str(v).strip():
+            s = str(v).strip()
+            if max_len and len(s) > max_len:
+                raise ValueError(f"{keys[0]} longer than {max_len} characters")
+            return s
+    if required:
+        raise ValueError(f"{required} is required")
+    return None
+
+
+def _amount(row: dict) -> float:
+    v = row.get("amount")
+    if isinstance(v, bool) or v is None or v == "":
+        raise ValueError("amount is required")
+    try:
+        out = float(str(v).replace("\u00a0", "").replace(" ", "").replace(",", "."))
+    except ValueError:
+        raise ValueError("amount must be a number") from None
+    if not math.isfinite(out):
+        raise ValueError("amount must be finite")
+    return out
+
+
+def _id(row: dict, key: str, *, required: bool = True) -> int | None:
+    v = row.get(key)
+    if v is None or v == "":
+        if required:
+            raise ValueError(f"{key} is required")
+        return None
+    if isinstance(v, bool):
+        raise ValueError(f"{key} must be an integer")
+    try:
+        out = int(v)
+    except (TypeError, ValueError):
+        raise ValueError(f"{key} must be an integer") from None
+    if out != float(v):
+        raise ValueError(f"{key} must be an integer")
+    return out
+
+
+def _expense(row: dict) -> dict[str, Any]:
+    return {
+        "month_id": _id(row, "month_id"),
+        "category": _text(row, "category", required="category", max_len=64),
+        "name": _text(row, "name", "description", required="name"),
+        "amount": _amount(row),
+    }
+
+
+def _income(row: dict) -> dict[str, Any]:
+    source = _text(row, "source", required="source")
+    return {
+        "month_id": _id(row, "month_id"),
+        "name": source,
+        "source": source,
+        "amount": _amount(row),
+    }
+
+
+def _loan_adjustment(row: dict) -> dict[str, Any]:
+    kind = _text(row, "type", required="type", max_len=32)
+    return {
+        "month_id": _id(row, "month_id"),
+        "name": _text(row, "name", max_len=100) or kind,
+        "type": kind,
+        "amount": _amount(row),
+        "note": _text(row, "note", max_len=128),
+        "loan_id": _id(row, "loan_id", required=False),
+    }
+
+
+@dataclass(frozen=True)
+class BulkTarget:
+    model: Any
+    parse: Callable[[dict], dict[str, Any]]
+    version: str | None  # data version bumped on insert
+
+
+TARGETS: dict[str, BulkTarget] = {
+    "expenses": BulkTarget(Expense, _expense, "expenses"),
+    "incomes": BulkTarget(Income, _income, "incomes"),
+    "loan_adjustments": BulkTarget(LoanAdjustment, _loan_adjustment, None),
+}
+
+
+# ---------- validation ----------
+def _existing(column, ids: set[int]) -> set[int]:
+    if not ids:
+        return set()
+    return set(db.session.scalars(select(column).where(column.in_(ids))).all())
+
+
+def validate(
+    target: BulkTarget, rows: list[Any]
+) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+    """([valid row dicts], [{index, error}]) in input order."""
+    parsed: list[tuple[int, dict[str, Any]]] = []
+    errors: list[dict[str, Any]] = []
+    for i, row in enumerate(rows):
+        try:
+            if not isinstance(row, dict):
+                raise ValueError("row must be an object")
+            parsed.append((i, target.parse(row)))
+        except ValueError as e:
+            errors.append({"index": i, "error": str(e)})
+
+    months = _existing(Month.id, {r["month_id"] for _, r in parsed})
+    loans = _existing(Loan.id, {r["loan_id"] for _, r in parsed if r.get("loan_id")})
+    valid = []
+    for i, r in parsed:
+        if r["month_id"] not in months:
+            errors.append({"index": i, "error": f"Unknown month_id: {r['month_id']}"})
+        elif r.get("loan_id") is not None and r["loan_id"] not in loans:
+            errors.append({"index": i, "error": f"Unknown loan_id: {r['loan_id']}"})
+        else:
+            valid.append(r)
+    errors.sort(key=lambda e: e["index"])
+    return valid, errors
+
+
+# ---------- writing ----------
+def _copy(model, rows: list[dict[str, Any]]) -> None:
+    """COPY ... FROM STDIN (csv) on the session's own connection/transaction."""
+    cols = list(rows[0])
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    for r in rows:
+        writer.writerow(["" if r[c] is None else r[c] for c in cols])
+    buf.seek(0)
+    dbapi = db.session.connection().connection
+    with dbapi.cursor() as cur:
+        cur.copy_expert(
+            f"COPY {model.__tablename__} ({', '.join(cols)}) FROM STDIN WITH (FORMAT csv)",
+            buf,
+        )
+
+
+def write(target: BulkTarget, rows: list[dict[str, Any]]) -> int:
+    """
+    Insert `rows`, re-chain balances from the earliest affected month and
+    bump the data version, all in the caller's transaction. Returns the
+    number of months whose stored balances changed.
+    """
+    if not rows:
+        return 0
+    dialect = db.session.get_bind().dialect.name
+    if dialect == "postgresql" and len(rows) >= COPY_MIN_ROWS:
+        _copy(target.model, rows)
+    else:
+        db.session.execute(insert(target.model), rows)
+    first = db.session.scalars(
+        select(Month.id)
+        .where(Month.id.in_({r["month_id"] for r in rows}))
+        .order_by(*MONTH_ORDER)
+        .limit(1)
+    ).first()
+    changed = recompute_balances(first)
+    if target.version:
+        bump(target.version)
+    return changed
+
+
+def bulk_response(kind: str):
+    """
+    Shared view body. Body: a JSON list of rows or {"rows": [...]}.
+    201 {inserted, months_updated, errors, error_count}; 400 when the
+    envelope is malformed or (without ?partial=1) any row is invalid.
+    """
+    target = TARGETS[kind]
+    data = request.get_json(silent=True)
+    rows = data.get("rows") if isinstance(data, dict) else data
+    if not isinstance(rows, list):
+        return jsonify({"error": "Expected a list of rows or {'rows': [...]}"}), 400
+    if len(rows) > MAX_ROWS:
+        return jsonify({"error": f"At most {MAX_ROWS} rows per request"}), 400
+    partial = str(request.args.get("partial") or "").strip().lower() in _TRUE
+
+    try:
+        valid, errors = validate(target, rows)
+        report = {"errors": errors[:MAX_ERRORS], "error_count": len(errors)}
+        if errors and not partial:
+            db.session.rollback()
+            return jsonify({"error": f"{len(errors)} invalid rows", **report}), 400
+        changed = write(target, valid)
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.exception("POST /api/%s/bulk failed: %s", kind, e)
+        return jsonify({"error": "Internal Server Error"}), 500
+    return jsonify({"inserted": len(valid), "months_updated": changed, **report}), 201
@@ -1,7 +1,12 @@
 from __future__ import annotations
 
+import math
+from collections.abc import Sequence
 from dataclasses import dataclass
 from datetime import date
+from functools import lru_cache
+
+import numpy as np
 
 from .format import to_num
 
@@ -34,7 +39,7 @@ def estimate_new_price_from_today_price(
     key = vehicle_key(type_of_vehicle)
     grid = params.retention.get(key, RETENTION["PETROL"])
     now_m = months_since_year(int(to_num(car_year, 0)), today=today)
-    r_now = _retention_at(grid, now_m)
+    r_now = compile_curve(grid).at(now_m)
     if r_now <= 0:
         return today_price
     return today_price / r_now
@@ -124,8 +129,9 @@ def predict_future_value_from_today_price(
     grid = params.retention.get(key, RETENTION["PETROL"])
     now_m = months_since_year(int(to_num(car_year, 0)), today=today)
     fut_m = now_m + years_ahead * 12
-    r_now = _retention_at(grid, now_m)
-    r_fut = _retention_at(grid, fut_m)
+    curve = compile_curve(grid)
+    r_now = curve.at(now_m)
+    r_fut = curve.at(fut_m)
     if key in ("BEV", "PHEV") and now_m < WARRANTY_MONTHS <= fut_m:
         r_fut = max(params.salvage_floor, r_fut - params.bev_warranty_kink_pp)
     ratio = (r_fut / r_now) if r_now > 0 else 0.0
@@ -135,3 +141,116 @@ def predict_future_value_from_today_price(
     if delta10k > 0:
         expected *= max(0.0, 1.0 - params.mileage_slope_per_10k * delta10k)
     return expected
+
+
+# ---------- compiled curves ----------
+class RetentionCurve:
+    """
+    `_retention_at` sampled once per integer month. Lookups are an index (or a
+    linear interpolation between neighbouring months); ages outside the axis
+    fall back to the scalar formula.
+    """
+
+    def __init__(self, anchors: tuple[tuple[int, float], ...]):
+        self.anchors = anchors
+        grid = dict(anchors)
+        last_m, last_r = max(anchors)
+        # The tail decays linearly to the salvage floor, then stays flat
+        to_floor = max(0.0, last_r - SALVAGE_FLOOR) / TAIL_DECAY_PP_PER_YEAR * 12
+        self.max_month = int(last_m + math.ceil(to_floor)) + 12
+        self.months = np.arange(self.max_month + 1)
+        self.values = np.array([_retention_at(grid, int(m)) for m in self.months])
+        self.values.setflags(write=False)
+
+    def at(self, months: float) -> float:
+        if 0 <= months <= self.max_month:
+            if months == int(months):
+                return float(self.values[int(months)])
+            return float(np.interp(months, self.months, self.values))
+        return _retention_at(dict(self.anchors), months)
+
+    def at_many(self, months: np.ndarray) -> np.ndarray:
+        m = np.asarray(months, dtype=float)
+        out = np.interp(m, self.months, self.values)
+        outside = (m < 0) | (m > self.max_month)
+        if outside.any():
+            grid = dict(self.anchors)
+            out[outside] = [_retention_at(grid, float(x)) for x in m[outside]]
+        return out
+
+
+@lru_cache(maxsize=64)
+def _compile(anchors: tuple[tuple[int, float], ...]) -> RetentionCurve:
+    return RetentionCurve(anchors)
+
+
+def compile_curve(grid: dict[int, float]) -> RetentionCurve:
+    """Cached RetentionCurve for an anchor grid (RETENTION entry or custom)."""
+    return _compile(tuple(sorted((int(m), float(r)) for m, r in grid.items())))
+
+
+def retention_curve(
+    type_of_vehicle: str | None, params: DepreciationParams | None = None
+) -> RetentionCurve:
+    params = params or DepreciationParams()
+    key = vehicle_key(type_of_vehicle)
+    return compile_curve(params.retention.get(key, RETENTION["PETROL"]))
+
+
+def predict_future_values(
+    *,
+    today_price: Sequence[float] | np.ndarray,
+    car_year: Sequence[int] | np.ndarray,
+    years_ahead: Sequence[float] | np.ndarray | float,
+    yearly_km_future: Sequence[float] | np.ndarray | float,
+    type_of_vehicle: Sequence[str | None] | str | None,
+    params: DepreciationParams | None = None,
+    today: date | None = None,
+) -> np.ndarray:
+    """
+    Batch predict_future_value_from_today_price: array (or scalar) inputs are
+    broadcast together; `type_of_vehicle` is one type or one per row.
+    """
+    params = params or DepreciationParams()
+    today = today or date.today()
+    if type_of_vehicle is None or isinstance(type_of_vehicle, str):
+        keys = np.asarray(vehicle_key(type_of_vehicle), dtype=object)
+    else:
+        keys = np.asarray([vehicle_key(t) for t in type_of_vehicle], dtype=object)
+    price, years, ahead, km, keys = np.broadcast_arrays(
+        np.asarray(today_price, dtype=float),
+        np.asarray(car_year, dtype=float),
+        np.asarray(years_ahead, dtype=float),
+        np.asarray(yearly_km_future, dtype=float),
+        keys,
+    )
+    shape = price.shape
+    price, years, ahead, km, keys = (a.ravel() for a in (price, years, ahead, km, keys))
+
+    # months_since_year, vectorized (July registration; 0 for missing years)
+    y = np.nan_to_num(years).astype(int)
+    now_m = np.where(y > 0, np.maximum(0, (today.year - y) * 12 + today.month - 7), 0)
+    fut_m = now_m + ahead * 12
+
+    r_now = np.empty(price.size)
+    r_fut = np.empty(price.size)
+    for key in set(keys.tolist()):
+        rows = keys == key
+        curve = compile_curve(params.retention.get(key, RETENTION["PETROL"]))
+        r_now[rows] = curve.at_many(now_m[rows])
+        r_fut[rows] = curve.at_many(fut_m[rows])
+
+    kink = np.isin(keys, ("BEV", "PHEV")) & (now_m < WARRANTY_MONTHS)
+    kink &= fut_m >= WARRANTY_MONTHS
+    r_fut = np.where(
+        kink,
+        np.maximum(params.salvage_floor, r_fut - params.bev_warranty_kink_pp),
+        r_fut,
+    )
+
+    ratio = np.divide(r_fut, r_now, out=np.zeros_like(r_fut), where=r_now > 0)
+    expected = price * ratio
+    delta10k = np.maximum(0, km - params.std_km_per_year) * ahead / 10_000.0
+    factor = np.maximum(0.0, 1.0 - params.mileage_slope_per_10k * delta10k)
+    expected = np.where(delta10k > 0, expected * factor, expected)
+    return expected.reshape(shape)
@@ -1,56 +1,48 @@
 from __future__ import annotations
 
-from .format import to_num
+from typing import Any
+
 from .settings import get_prices, get_yearly_km
+from .spot_prices import configured_spot_profile
+from .tco_kernel import (
+    COMMUTE_DAYS_PER_MONTH,
+    charging_loss_factor,
+    energy_year,
+    load_columns,
+    smart_elec_price,
+)
+from .trips import configured_trip_distribution
 
-DEFAULT_COMMUTE_DAYS_PER_MONTH = 22
+# Kept for callers that imported the constant from here
+DEFAULT_COMMUTE_DAYS_PER_MONTH = COMMUTE_DAYS_PER_MONTH
 
 
 def energy_cost_per_month(car) -> float:
+    """Monthly energy/fuel cost; same model as /api/cars (utils.tco_kernel)."""
     prices = get_prices()
-    monthly_km = get_yearly_km() / 12.0
-    vehicle_type = (getattr(car, "type_of_vehicle", "EV") or "EV").strip().upper()
-
-    # EV: electricity only
-    if vehicle_type in ("EV", "BEV", "ELECTRIC"):
-        kwh_per_month = (
-            to_num(getattr(car, "consumption_kwh_per_100km", 0.0)) / 100.0
-        ) * monthly_km
-        return kwh_per_month * prices["el_price_sek"]
-
-    # PHEV: split between EV commute and petrol
-    if vehicle_type == "PHEV":
-        cons_kwh_100 = to_num(getattr(car, "consumption_kwh_per_100km", 0.0))
-        batt_kwh = to_num(getattr(car, "battery_capacity_kwh", 0.0))
-        assumed_ev_range_km = 40.0
-        if cons_kwh_100 > 0 and batt_kwh > 0:
-            ev_range_km = 100.0 * batt_kwh / cons_kwh_100
-        else:
-            ev_range_km = assumed_ev_range_km
-
-        daily_commute_km = float(prices["daily_commute_km"]) or 0.0
-        commute_days = DEFAULT_COMMUTE_DAYS_PER_MONTH
-
-        ev_km_per_day = min(daily_commute_km, ev_range_km)
-        ev_km_month = min(ev_km_per_day * commute_days, monthly_km)
-
-        kwh_per_km = (cons_kwh_100 / 100.0) if cons_kwh_100 else 0.0
-        kwh_month = ev_km_month * kwh_per_km
-        el_cost = kwh_month * prices["el_price_sek"]
-
-        l_per_100 = to_num(getattr(car, "consumption_l_per_100km", 0.0))
-        fuel_price = prices["bensin_price_sek_litre"]
-        fuel_km = max(monthly_km - ev_km_month, 0.0)
-        litres = (l_per_100 / 100.0) * fuel_km
-        fuel_cost = litres * fuel_price
-        return el_cost + fuel_cost
-
-    # ICE / HEV: liquid fuel only
-    l_per_100 = to_num(getattr(car, "consumption_l_per_100km", 0.0))
-    litres_per_month = (l_per_100 / 100.0) * monthly_km
-    price = (
-        prices["diesel_price_sek_litre"]
-        if vehicle_type == "DIESEL"
-        else prices["bensin_price_sek_litre"]
+    cols = load_columns([car])
+    km = float(get_yearly_km())
+    commute_km = float(prices["daily_commute_km"]) or 0.0
+    trips = configured_trip_distribution()
+
+    elec: Any = float(prices["el_price_sek"])
+    profile = configured_spot_profile()
+    if profile is not None:
+        elec = smart_elec_price(
+            cols,
+            km=km,
+            commute_km=commute_km,
+            trips=trips,
+            profile=profile,
+            loss=charging_loss_factor(),
+        )
+    yearly = energy_year(
+        cols,
+        km100=km / 100.0,
+        elec=elec,
+        bensin=float(prices["bensin_price_sek_litre"]),
+        diesel=float(prices["diesel_price_sek_litre"]),
+        commute_km=commute_km,
+        trips=trips,
     )
-    return litres_per_month * price
+    return float(yearly[0]) / 12.0
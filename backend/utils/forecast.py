@@ -0,0 +1,333 @@
+# backend/utils/forecast.py
+"""
+Long-horizon cash-flow forecast, several named scenarios side by side.
+
+The basis comes from the ledger: the last Month row supplies the opening
+funds and loan (month_summaries), the last `lookback` months supply the
+recurring incomes (by source), expenses (by category) and loan payment,
+dated PlannedPurchase rows become one-off outflows, and Financing
+'loans_taken' opens the loan when there are no months yet.
+
+Scheduled Loan rows (utils.loans) are not part of that annuity: their
+balance is left out of the opening loan and each month follows the loan's
+own schedule instead, with its interest and amortization paid from funds.
+The inferred loan payment likewise only counts adjustments not linked to a
+loan.
+
+A line counts as recurring when it shows up in at least RECURRING_SHARE of
+the lookback months; its amount is the median of those months. One-offs
+(a single big purchase, a bonus) therefore do not leak into the projection.
+
+project() is closed form over a (scenarios × months) grid: funds are a
+cumulative sum of the monthly net, the loan an annuity balance
+B(t) = B0·(1+r)^t − P·((1+r)^t − 1)/r clipped at 0. No per-month loop.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import date
+from statistics import median
+from typing import Any
+
+import numpy as np
+from sqlalchemy import func, select
+
+from backend.models.models import LoanAdjustment, Month, PlannedPurchase, db
+
+from .analytics import add_months, ledger_sums
+from .balances import _opening_loan, month_summaries
+from .loans import (
+    PAID_EPS,
+    LoanTerms,
+    household_income,
+    load_terms,
+    month_index,
+    monthly_events,
+    schedule,
+)
+
+MAX_YEARS = 30
+DEFAULT_YEARS = 10
+DEFAULT_LOOKBACK = 6
+MAX_LOOKBACK = 24
+MAX_SCENARIOS = 8
+RECURRING_SHARE = 0.5
+
+
+def _num(d: dict, key: str, default: float = 0.0) -> float:
+    v = d.get(key, default)
+    if v is None or v == "":
+        return float(default)
+    try:
+        out = float(v)
+    except (TypeError, ValueError):
+        raise ValueError(f"{key} must be a number") from None
+    if not np.isfinite(out):
+        raise ValueError(f"{key} must be finite")
+    return out
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """Adjustments on top of the inferred basis (all optional)."""
+
+    name: str = "baseline"
+    income_growth_pct: float = 0.0  # per year, compounded monthly
+    expense_growth_pct: float = 0.0  # per year (inflation)
+    extra_income: float = 0.0  # per month
+    extra_expense: float = 0.0  # per month
+    loan_payment: float | None = None  # per month; None -> inferred
+    loan_rate_pct: float = 0.0  # per year, on the remaining balance
+    include_planned: bool = True
+    # (first-of-month, amount): + inflow / - outflow
+    one_offs: tuple[tuple[date, float], ...] = ()
+
+    @classmethod
+    def from_dict(cls, d: dict[str, Any]) -> Scenario:
+        """Raises ValueError on malformed fields."""
+        if not isinstance(d, dict):
+            raise ValueError("scenario must be an object")
+        name = str(d.get("name") or "baseline").strip()[:64] or "baseline"
+        one_offs = []
+        for item in d.get("one_offs") or []:
+            try:
+                s = str(item["month"])
+                when = date(int(s[0:4]), int(s[5:7]), 1)
+            except (KeyError, TypeError, ValueError):
+                raise ValueError("one_offs need month (YYYY-MM) and amount") from None
+            one_offs.append((when, _num(item, "amount")))
+        payment = d.get("loan_payment")
+        return cls(
+            name=name,
+            income_growth_pct=_num(d, "income_growth_pct"),
+            expense_growth_pct=_num(d, "expense_growth_pct"),
+            extra_income=_num(d, "extra_income"),
+            extra_expense=_num(d, "extra_expense"),
+            loan_payment=None if payment is None else _num(d, "loan_payment"),
+            loan_rate_pct=_num(d, "loan_rate_pct"),
+            include_planned=bool(d.get("include_planned", True)),
+            one_offs=tuple(one_offs),
+        )
+
+
+@dataclass(frozen=True)
+class Basis:
+    start: date  # first projected month
+    opening_funds: float
+    opening_loan: float
+    from_month: date | None = None  # last Month row the basis starts after
+    lookback_months: int = 0
+    incomes: dict[str, float] = field(default_factory=dict)
+    expenses: dict[str, float] = field(default_factory=dict)
+    loan_payment: float = 0.0
+    planned: tuple[tuple[date, float], ...] = ()
+    loans: tuple[LoanTerms, ...] = ()  # scheduled, projected by utils.loans
+    scheduled_loan: float = 0.0  # their balance at from_month
+    yearly_income: float | None = None  # for the schedules' DTI add-on
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "start": self.start.strftime("%Y-%m"),
+            "from_month": (
+                self.from_month.strftime("%Y-%m") if self.from_month else None
+            ),
+            "starting_funds": round(self.opening_funds, 2),
+            "loan_remaining": round(self.opening_loan + self.scheduled_loan, 2),
+            "lookback_months": self.lookback_months,
+            "recurring_incomes": self.incomes,
+            "recurring_expenses": self.expenses,
+            "loan_payment": self.loan_payment,
+            "planned_purchases": len(self.planned),
+            "scheduled_loans": len(self.loans),
+        }
+
+
+def _recurring(rows, min_count: int) -> dict[str, float]:
+    per_key: dict[str, dict[date, float]] = {}
+    for when, key, amount in rows:
+        slot = per_key.setdefault(key or "Other", {})
+        slot[when] = slot.get(when, 0.0) + float(amount or 0)
+    return {
+        key: round(median(by_month.values()), 2)
+        for key, by_month in sorted(per_key.items())
+        if len(by_month) >= min_count
+    }
+
+
+def infer_basis(lookback: int = DEFAULT_LOOKBACK, today: date | None = None) -> Basis:
+    """Read the forecast basis from the ledger (see module docstring)."""
+    planned = tuple(
+        (date(d.year, d.month, 1), float(amount or 0))
+        for d, amount in db.session.execute(
+            select(PlannedPurchase.date, PlannedPurchase.amount).where(
+                PlannedPurchase.date.is_not(None)
+            )
+        ).all()
+    )
+    loans = tuple(load_terms())
+    yearly_income = household_income() if loans else None
+    last = db.session.execute(select(func.max(Month.month_date))).scalar()
+    if last is None:
+        start = (today or date.today()).replace(day=1)
+        return Basis(
+            start,
+            0.0,
+            _opening_loan(),
+            planned=planned,
+            loans=loans,
+            yearly_income=yearly_income,
+        )
+
+    last = date(last.year, last.month, 1)
+    rows = month_summaries(date_from=last)  # several Month rows may share it
+    tail = rows[-1] if rows else None
+    window = add_months(last, 1 - lookback)
+    before = add_months(last, 1)
+    months, inc_rows = ledger_sums("incomes", "source", start=window, before=before)
+    _, exp_rows = ledger_sums("expenses", "category", start=window, before=before)
+    month_keys = sorted({date(m.year, m.month, 1) for m in months})
+    min_count = max(1, int(np.ceil(RECURRING_SHARE * len(month_keys))))
+
+    def by_month(rows):
+        return [(date(m.year, m.month, 1), key, amount) for m, key, amount in rows]
+
+    payments = db.session.execute(
+        select(Month.month_date, func.sum(LoanAdjustment.amount))
+        .join(Month, Month.id == LoanAdjustment.month_id)
+        .where(
+            LoanAdjustment.type == "payment",
+            LoanAdjustment.loan_id.is_(None),
+            Month.month_date >= window,
+            Month.month_date < before,
+        )
+        .group_by(Month.month_date)
+    ).all()
+    loan = _recurring([(m, "loan", a) for m, a in payments], min_count)
+    scheduled = tail["loan_scheduled"] if tail else 0.0
+    return Basis(
+        start=before,
+        opening_funds=tail["ending_funds"] if tail else 0.0,
+        opening_loan=tail["loan_remaining"] - scheduled if tail else _opening_loan(),
+        from_month=last,
+        lookback_months=len(month_keys),
+        incomes=_recurring(by_month(inc_rows), min_count),
+        expenses=_recurring(by_month(exp_rows), min_count),
+        loan_payment=loan.get("loan", 0.0),
+        planned=planned,
+        loans=loans,
+        scheduled_loan=scheduled,
+        yearly_income=yearly_income,
+    )
+
+
+def _scheduled(basis: Basis, n: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Scheduled loans' (balance, interest, amortization) over the n months."""
+    out = tuple(np.zeros(n) for _ in range(3))
+    if not basis.loans:
+        return out
+    first = min(ln.start for ln in basis.loans)
+    offset = month_index(first, basis.start)
+    total = offset + n
+    if total <= 0:
+        return out
+    s = schedule(list(basis.loans), months=total, yearly_income=basis.yearly_income)
+    lo = max(offset, 0)
+    for dst, src in zip(out, (s.balance, s.interest, s.amortization), strict=True):
+        dst[lo - offset :] = src.sum(axis=0)[lo:]
+    return out
+
+
+def project(basis: Basis, scenarios: list[Scenario], years: int) -> dict[str, Any]:
+    """Monthly projection for every scenario; arrays are (scenarios, months)."""
+    n = 12 * years
+    t = np.arange(1, n + 1, dtype=np.float64)[None, :]
+
+    def col(attr: str) -> np.ndarray:
+        return np.array([getattr(s, attr) for s in scenarios], dtype=np.float64)[
+            :, None
+        ]
+
+    base_in = sum(basis.incomes.values())
+    base_out = sum(basis.expenses.values())
+    income = base_in * (1 + col("income_growth_pct") / 100) ** (t / 12) + col(
+        "extra_income"
+    )
+    expenses = base_out * (1 + col("expense_growth_pct") / 100) ** (t / 12) + col(
+        "extra_expense"
+    )
+    planned = monthly_events(basis.start, n, [(d, -a) for d, a in basis.planned])
+    one_offs = np.stack(
+        [
+            (planned if s.include_planned else 0.0)
+            + monthly_events(basis.start, n, s.one_offs)
+            for s in scenarios
+        ]
+    )
+    sched_balance, sched_interest, sched_amort = _scheduled(basis, n)
+    loan_cost = sched_interest + sched_amort
+    net = income - expenses - loan_cost + one_offs
+    ending = basis.opening_funds + np.cumsum(net, axis=1)
+    starting = ending - net
+
+    # Annuity balance, clipped once paid off
+    r = col("loan_rate_pct") / 100 / 12
+    payment = np.array(
+        [
+            basis.loan_payment if s.loan_payment is None else s.loan_payment
+            for s in scenarios
+        ]
+    )[:, None]
+    growth = (1 + r) ** t
+    annuity = np.where(r > 0, (growth - 1) / np.where(r > 0, r, 1.0), t)
+    loan = np.maximum(basis.opening_loan * growth - payment * annuity, 0.0)
+    loan = loan + sched_balance
+    has_loan = basis.opening_loan > 0 or bool(basis.loans)
+    # A schedule only counts as paid off after the last loan has started
+    since = max([0] + [month_index(basis.start, ln.start) + 1 for ln in basis.loans])
+
+    labels = [add_months(basis.start, i).strftime("%Y-%m") for i in range(n)]
+    out = []
+    for i, s in enumerate(scenarios):
+        paid = since + np.flatnonzero(loan[i, since:] <= PAID_EPS)
+        low = int(np.argmin(ending[i]))
+        out.append(
+            {
+                "name": s.name,
+                "income": np.round(income[i], 2).tolist(),
+                "expenses": np.round(expenses[i] - one_offs[i], 2).tolist(),
+                "loan_interest": np.round(sched_interest, 2).tolist(),
+                "loan_amortization": np.round(sched_amort, 2).tolist(),
+                "starting_funds": np.round(starting[i], 2).tolist(),
+                "ending_funds": np.round(ending[i], 2).tolist(),
+                "loan_remaining": np.round(loan[i], 2).tolist(),
+                "summary": {
+                    "ending_funds": round(float(ending[i, -1]), 2),
+                    "min_funds": round(float(ending[i, low]), 2),
+                    "min_funds_month": labels[low],
+                    "loan_paid_off": (
+                        labels[int(paid[0])] if has_loan and paid.size else None
+                    ),
+                },
+            }
+        )
+    return {"months": labels, "basis": basis.to_dict(), "scenarios": out}
+
+
+def forecast(
+    scenarios: list[dict[str, Any]] | None = None,
+    *,
+    years: int = DEFAULT_YEARS,
+    lookback: int = DEFAULT_LOOKBACK,
+) -> dict[str, Any]:
+    """Validate, infer the basis and project. Raises ValueError on bad input."""
+    if not 1 <= years <= MAX_YEARS:
+        raise ValueError(f"years must be 1..{MAX_YEARS}")
+    if not 1 <= lookback <= MAX_LOOKBACK:
+        raise ValueError(f"lookback must be 1..{MAX_LOOKBACK}")
+    specs = [Scenario.from_dict(d) for d in (scenarios or [{}])]
+    if len(specs) > MAX_SCENARIOS:
+        raise ValueError(f"at most {MAX_SCENARIOS} scenarios")
+    if len({s.name for s in specs}) != len(specs):
+        raise ValueError("scenario names must be unique")
+    return project(infer_basis(lookback), specs, years)
@@ -0,0 +1,103 @@
+# backend/utils/json_provider.py
+"""
+App-wide JSON provider (installed by create_app via install_json_provider).
+
+JSON_PROVIDER selects it: "fast" (default) encodes with orjson when it is
+installed, "stdlib" keeps Flask's DefaultJSONProvider. Both serialize
+Decimal as a number, date/datetime as ISO 8601 and Enum members as their
+value, so routes can hand rows to jsonify without converting them first.
+orjson also writes numpy scalars/arrays directly; NaN/inf become null.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import decimal
+import enum
+import uuid
+from datetime import date, datetime, time
+from typing import Any
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+
+def _default(o: Any) -> Any:
+    """Types neither encoder handles natively (shared fallback)."""
+    if isinstance(o, decimal.Decimal):
+        return float(o)
+    if isinstance(o, datetime | date | time):
+        return o.isoformat()
+    if isinstance(o, enum.Enum):
+        return o.value
+    if isinstance(o, uuid.UUID):
+        return str(o)
+    if dataclasses.is_dataclass(o) and not isinstance(o, type):
+        return dataclasses.asdict(o)
+    if hasattr(o, "__html__"):
+        return str(o.__html__())
+    if hasattr(o, "tolist"):  # numpy scalars / arrays on the stdlib path
+        return o.tolist()
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+
+class StdlibJSONProvider(DefaultJSONProvider):
+    """Flask's provider with ISO dates and numeric Decimals."""
+
+    default = staticmethod(_default)  # type: ignore[assignment]
+
+
+class OrjsonProvider(StdlibJSONProvider):
+    """
+    orjson-backed dumps/response. Keys are sorted like Flask's default;
+    non-str keys are stringified. dumps() returns str per the provider API,
+    response() writes bytes straight into the body.
+    """
+
+    def _options(self, indent: bool = False) -> int:
+        opts = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            opts |= orjson.OPT_SORT_KEYS
+        if indent:
+            opts |= orjson.OPT_INDENT_2
+        return opts
+
+    def dumps_bytes(self, obj: Any, *, indent: bool = False) -> bytes:
+        return orjson.dumps(obj, default=_default, option=self._options(indent))
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        # Layout kwargs only; anything else (cls=, default=, ...) -> stdlib
+        if set(kwargs) - {"separators", "indent"}:
+            return super().dumps(obj, **kwargs)
+        return self.dumps_bytes(obj, indent=bool(kwargs.get("indent"))).decode()
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any):
+        obj = self._prepare_response_obj(args, kwargs)
+        pretty = self.compact is False or (self.compact is None and self._app.debug)
+        body = self.dumps_bytes(obj, indent=pretty) + b"\n"
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
+PROVIDERS = ("fast", "stdlib")
+
+
+def install_json_provider(app: Flask) -> None:
+    """Set app.json from JSON_PROVIDER ("fast" falls back without orjson)."""
+    choice = str(app.config.get("JSON_PROVIDER") or "fast").lower()
+    if choice not in PROVIDERS:
+        app.logger.warning("unknown JSON_PROVIDER %r; using 'fast'", choice)
+        choice = "fast"
+    use_orjson = choice == "fast" and orjson is not None
+    cls = OrjsonProvider if use_orjson else StdlibJSONProvider
+    app.json_provider_class = cls
+    app.json = cls(app)
@@ -0,0 +1,274 @@
+# backend/utils/loans.py
+"""
+Month-by-month amortization schedules for Loan rows.
+
+Each loan is disbursed in its start month and pays from the month after:
+interest on the opening balance at the rate in force (Loan.rate_pct, then
+each LoanRateReset from its effective month), then amortization, then extra
+payments. Amortization follows the Swedish requirement (amorteringskravet):
+2 % a year of the original principal while the balance is above 70 % of the
+property value, 1 % above 50 %, plus 1 % when household debt exceeds 4.5×
+gross yearly income (Financing 'yearly_income'). Loan.amortization_monthly,
+when set, is paid instead if it is larger.
+
+LoanAdjustment rows linked to a loan are its recorded extra payments
+(type 'payment') and extra draws ('disbursement'); they feed the schedule and
+no longer move the ledger's own loan chain (see utils.balances).
+
+schedule() steps through the months once with every loan (and every what-if
+scenario) as a row of the same arrays, so many loans cost one loop of numpy
+operations rather than one loop per loan.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Any
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
+
+from backend.models.models import Financing, Loan, LoanAdjustment, Month, db
+
+from .analytics import add_months
+
+# (LTV above, % of the original principal per year), strictest first
+REQUIREMENT_TIERS = ((0.70, 2.0), (0.50, 1.0))
+DTI_LIMIT = 4.5  # debt / gross yearly income
+DTI_EXTRA_PCT = 1.0
+INCOME_KEY = "yearly_income"
+PAID_EPS = 0.005
+
+
+def _f(v: Any) -> float:
+    return float(v) if v is not None else 0.0
+
+
+def first_of_month(d: date) -> date:
+    return date(d.year, d.month, 1)
+
+
+def month_index(start: date, when: date) -> int:
+    return (when.year - start.year) * 12 + when.month - start.month
+
+
+@dataclass(frozen=True)
+class LoanTerms:
+    name: str
+    principal: float
+    start: date
+    rate_pct: float = 0.0
+    resets: tuple[tuple[date, float], ...] = ()
+    property_value: float | None = None
+    amortization_monthly: float | None = None
+    # (month, amount): + extra payment / - extra draw
+    events: tuple[tuple[date, float], ...] = ()
+    id: int | None = None
+
+    @classmethod
+    def from_model(cls, loan: Loan, events=()) -> LoanTerms:
+        return cls(
+            id=loan.id,
+            name=loan.name,
+            principal=_f(loan.principal),
+            start=first_of_month(loan.start_date),
+            rate_pct=_f(loan.rate_pct),
+            resets=tuple(
+                (first_of_month(r.effective_date), _f(r.rate_pct))
+                for r in loan.rate_resets
+            ),
+            property_value=(
+                _f(loan.property_value) if loan.property_value is not None else None
+            ),
+            amortization_monthly=(
+                _f(loan.amortization_monthly)
+                if loan.amortization_monthly is not None
+                else None
+            ),
+            events=tuple(events),
+        )
+
+
+@dataclass
+class Schedule:
+    """Arrays are (rows, months); balance is the closing balance."""
+
+    months: list[date]
+    balance: np.ndarray
+    interest: np.ndarray
+    amortization: np.ndarray
+    extra: np.ndarray
+    rate: np.ndarray
+    starts: np.ndarray = field(repr=False)
+
+    def paid_off(self, i: int) -> date | None:
+        t = np.arange(len(self.months))
+        done = np.flatnonzero((t > self.starts[i]) & (self.balance[i] <= PAID_EPS))
+        return self.months[int(done[0])] if done.size else None
+
+    def row(self, i: int) -> dict[str, Any]:
+        def out(a: np.ndarray) -> list[float]:
+            return np.round(a[i], 2).tolist()
+
+        paid_off = self.paid_off(i)
+        return {
+            "balance": out(self.balance),
+            "interest": out(self.interest),
+            "amortization": out(self.amortization),
+            "extra": out(self.extra),
+            "rate_pct": np.round(self.rate[i], 3).tolist(),
+            "summary": {
+                "interest_total": round(float(self.interest[i].sum()), 2),
+                "paid_total": round(
+                    float(
+                        self.interest[i].sum()
+                        + self.amortization[i].sum()
+                        + np.clip(self.extra[i], 0, None).sum()
+                    ),
+                    2,
+                ),
+                "paid_off": paid_off.strftime("%Y-%m") if paid_off else None,
+            },
+        }
+
+
+def monthly_events(start: date, n: int, events) -> np.ndarray:
+    """(first-of-month, amount) pairs summed onto n months from `start`."""
+    out = np.zeros(n)
+    for when, amount in events:
+        t = month_index(start, when)
+        if 0 <= t < n:
+            out[t] += amount
+    return out
+
+
+def schedule(
+    loans: list[LoanTerms],
+    *,
+    months: int,
+    yearly_income: float | None = None,
+    rate_shift_pct: np.ndarray | float = 0.0,
+    extra_monthly: np.ndarray | float = 0.0,
+    extra: np.ndarray | None = None,
+) -> Schedule:
+    """
+    Amortize every loan over `months` months from the earliest loan start.
+    `rate_shift_pct` / `extra_monthly` are scalars or one value per loan,
+    `extra` a (loans, months) array of additional one-off payments.
+    """
+    start = min((ln.start for ln in loans), default=first_of_month(date.today()))
+    rows, n = len(loans), months
+    grid = [add_months(start, t) for t in range(n)]
+
+    principal = np.array([ln.principal for ln in loans], dtype=np.float64)
+    value = np.array([ln.property_value or 0.0 for ln in loans], dtype=np.float64)
+    fixed = np.array([ln.amortization_monthly or 0.0 for ln in loans])
+    starts = np.array([month_index(start, ln.start) for ln in loans], dtype=np.int64)
+
+    rate = np.empty((rows, n))
+    for i, ln in enumerate(loans):
+        rate[i] = ln.rate_pct
+        for when, pct in sorted(ln.resets):
+            rate[i, max(month_index(start, when), 0) :] = pct
+    rate = rate + np.broadcast_to(np.asarray(rate_shift_pct, float), (rows,))[:, None]
+    events = np.zeros((rows, n)) + (extra if extra is not None else 0.0)
+    for i, ln in enumerate(loans):
+        events[i] += monthly_events(start, n, ln.events)
+    monthly_extra = np.broadcast_to(np.asarray(extra_monthly, float), (rows,))
+
+    # Household debt-to-income add-on (original principals, distinct loans)
+    debt = sum({(ln.id, ln.name): ln.principal for ln in loans}.values())
+    dti_pct = DTI_EXTRA_PCT if yearly_income and debt > DTI_LIMIT * yearly_income else 0
+
+    shape = (rows, n)
+    balance, interest, amort, paid = (np.zeros(shape) for _ in range(4))
+    bal = np.zeros(rows)
+    has_value = value > 0
+    for t in range(n):
+        bal = bal + np.where(starts == t, principal, 0.0)
+        live = (t > starts) & (bal > PAID_EPS)
+        interest[:, t] = np.where(live, bal * np.maximum(rate[:, t], 0) / 1200, 0.0)
+
+        ltv = np.divide(bal, value, out=np.zeros(rows), where=has_value)
+        pct = np.select(
+            [ltv > lim for lim, _ in REQUIREMENT_TIERS],
+            [p for _, p in REQUIREMENT_TIERS],
+            0.0,
+        )
+        required = (pct + dti_pct) * principal / 1200
+        a = np.where(live, np.minimum(np.maximum(required, fixed), bal), 0.0)
+        bal = bal - a
+        amort[:, t] = a
+
+        x = np.where(t >= starts, events[:, t], 0.0) + np.where(
+            live, monthly_extra, 0.0
+        )
+        x = np.where(x > 0, np.minimum(x, bal), x)  # draws (x < 0) always apply
+        bal = bal - x
+        paid[:, t] = x
+        balance[:, t] = bal
+
+    return Schedule(grid, balance, interest, amort, paid, rate, starts)
+
+
+# ---------- ledger ----------
+def household_income() -> float | None:
+    value = db.session.execute(
+        select(Financing.value).where(Financing.name == INCOME_KEY).limit(1)
+    ).scalar()
+    return _f(value) or None
+
+
+def load_terms() -> list[LoanTerms]:
+    """Every Loan with its rate resets and linked adjustments, by id."""
+    loans = db.session.scalars(
+        select(Loan).options(selectinload(Loan.rate_resets)).order_by(Loan.id)
+    ).all()
+    if not loans:
+        return []
+    rows = db.session.execute(
+        select(
+            LoanAdjustment.loan_id,
+            LoanAdjustment.type,
+            LoanAdjustment.amount,
+            Month.month_date,
+        )
+        .join(Month, Month.id == LoanAdjustment.month_id)
+        .where(LoanAdjustment.loan_id.is_not(None), Month.month_date.is_not(None))
+    ).all()
+    events: dict[int, list[tuple[date, float]]] = {}
+    for loan_id, kind, amount, when in rows:
+        sign = {"payment": 1.0, "disbursement": -1.0}.get(kind)
+        if sign is not None:
+            events.setdefault(loan_id, []).append(
+                (first_of_month(when), sign * _f(amount))
+            )
+    return [LoanTerms.from_model(ln, events.get(ln.id, ())) for ln in loans]
+
+
+def month_totals(until: date) -> dict[date, dict[str, float]]:
+    """
+    {first-of-month: {balance, interest, amortization}} summed over all
+    scheduled loans, from the earliest loan start through `until`.
+    """
+    terms = load_terms()
+    if not terms:
+        return {}
+    first = min(ln.start for ln in terms)
+    n = month_index(first, first_of_month(until)) + 1
+    if n <= 0:
+        return {}
+    s = schedule(terms, months=n, yearly_income=household_income())
+    balance, interest, amort = (
+        a.sum(axis=0) for a in (s.balance, s.interest, s.amortization)
+    )
+    return {
+        d: {
+            "balance": float(balance[t]),
+            "interest": float(interest[t]),
+            "amortization": float(amort[t]),
+        }
+        for t, d in enumerate(s.months)
+    }
@@ -0,0 +1,293 @@
+# backend/utils/pagination.py
+"""
+Shared filtering and keyset pagination for the plain list endpoints
+(incomes, expenses, loan adjustments, planned purchases, house/land costs,
+account info).
+
+Query string, all optional:
+  sort=[-]key        one of the endpoint's ListSpec.sort_keys; ties break on id
+  limit, cursor      keyset page on (sort key, id); cursor is next_cursor from
+                     the previous page (opaque, tied to the sort)
+  total=1            also count the filtered rows (one COUNT query)
+  from, to           date range, YYYY-MM or YYYY-MM-DD, both inclusive, on the
+                     endpoint's date column (the month's date for ledger rows)
+  <filter>=a,b       equality filters from ListSpec.filters (comma-separated
+                     and/or repeated), e.g. month_id=3,4&category=Food
+
+Any of limit/cursor/total switches the response to the page envelope
+{items, next_cursor, limit[, total]}, like /api/cars; without them the
+endpoint returns its plain list as before.
+"""
+
+from __future__ import annotations
+
+import base64
+import json
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from typing import Any
+
+from sqlalchemy import Date, DateTime, Float, Integer, Numeric, and_, func, or_
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 500
+MAX_FILTER_VALUES = 200
+
+_TRUE = {"1", "true", "yes", "on"}
+
+
+# ---------- cursors ----------
+def encode_cursor(sort: str, value: Any, last_id: int) -> str:
+    raw = json.dumps([sort, value, last_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(token: str, sort: str) -> tuple[Any, int]:
+    try:
+        key, value, last_id = json.loads(base64.urlsafe_b64decode(token.encode()))
+        last_id = int(last_id)
+    except Exception as e:
+        raise ValueError("invalid cursor") from e
+    if key != sort:
+        raise ValueError("cursor does not match sort")
+    return value, last_id
+
+
+def _to_json(v: Any) -> Any:
+    if isinstance(v, datetime | date):
+        return v.isoformat()
+    if isinstance(v, Decimal):
+        return str(v)  # exact; floats would break ties on Numeric keys
+    return v
+
+
+def _from_json(column, v: Any) -> Any:
+    """Cursor value back to the column's Python type."""
+    try:
+        if v is None:
+            return None
+        if isinstance(column.type, DateTime):
+            return datetime.fromisoformat(v)
+        if isinstance(column.type, Date):
+            return date.fromisoformat(v)
+        if isinstance(column.type, Numeric) and not isinstance(column.type, Float):
+            return Decimal(str(v))
+        return v
+    except (TypeError, ValueError) as e:
+        raise ValueError("invalid cursor") from e
+
+
+# ---------- spec ----------
+@dataclass(frozen=True)
+class SortKey:
+    """
+    Sortable column. NULLs order as `null` (and the cursor carries that
+    value), so the keyset comparison never meets a NULL.
+    """
+
+    column: Any
+    null: Any = None
+
+    @property
+    def expr(self):
+        if self.null is None:
+            return self.column
+        return func.coalesce(self.column, self.null)
+
+    def value(self, row) -> Any:
+        v = getattr(row, self.column.key)
+        return self.null if v is None else v
+
+
+@dataclass(frozen=True)
+class ListSpec:
+    """What one list endpoint can be sorted and filtered by."""
+
+    model: Any
+    sort_keys: dict[str, SortKey]
+    default_sort: str = "id"
+    filters: dict[str, Any] = field(default_factory=dict)  # ?name=a,b -> IN
+    date_column: Any = None  # ?from/?to; may live on a joined model (Month)
+
+
+def _list_arg(args, key: str) -> list[str]:
+    out: list[str] = []
+    for raw in args.getlist(key):
+        out.extend(s.strip() for s in str(raw).split(",") if s.strip())
+    return out
+
+
+def _coerce(name: str, column, raw: str) -> Any:
+    if isinstance(column.type, Integer):
+        try:
+            return int(raw)
+        except ValueError:
+            raise ValueError(f"{name} must be an integer") from None
+    return raw
+
+
+def _parse_bound(key: str, raw: str, *, end: bool) -> date:
+    """
+    YYYY-MM or YYYY-MM-DD. `end` returns the exclusive upper bound (the day
+    after, or the first of the next month) so `to` is inclusive.
+    """
+    raw = raw.strip()
+    try:
+        if len(raw) == 7:
+            d = datetime.strptime(raw, "%Y-%m").date()
+            if end:
+                return date(d.year + d.month // 12, d.month % 12 + 1, 1)
+            return d
+        d = date.fromisoformat(raw)
+    except ValueError:
+        raise ValueError(f"{key} must be YYYY-MM or YYYY-MM-DD") from None
+    return d + timedelta(days=1) if end else d
+
+
+# ---------- query ----------
+@dataclass
+class ListQuery:
+    """Parsed list query string for one ListSpec."""
+
+    spec: ListSpec
+    sort: str
+    desc: bool = False
+    limit: int | None = None
+    cursor: str | None = None
+    with_total: bool = False
+    filters: dict[str, list[Any]] = field(default_factory=dict)
+    date_from: date | None = None
+    date_before: date | None = None  # exclusive
+
+    @classmethod
+    def from_args(cls, args, spec: ListSpec) -> ListQuery:
+        """Raises ValueError with a client-facing message on bad input."""
+        sort = (args.get("sort") or spec.default_sort).strip()
+        desc = sort.startswith("-")
+        sort = sort.lstrip("-")
+        if sort not in spec.sort_keys:
+            raise ValueError(
+                f"sort must be one of: {', '.join(sorted(spec.sort_keys))}"
+            )
+
+        filters = {}
+        for name, column in spec.filters.items():
+            values = _list_arg(args, name)
+            if len(values) > MAX_FILTER_VALUES:
+                raise ValueError(f"at most {MAX_FILTER_VALUES} values for {name}")
+            if values:
+                filters[name] = sorted({_coerce(name, column, v) for v in values})
+
+        bounds = {}
+        for key in ("from", "to"):
+            if args.get(key):
+                if spec.date_column is None:
+                    raise ValueError(f"{key} is not supported for this list")
+                bounds[key] = _parse_bound(key, args[key], end=key == "to")
+        if "from" in bounds and "to" in bounds and bounds["to"] <= bounds["from"]:
+            raise ValueError("to must not be before from")
+
+        cursor = args.get("cursor") or None
+        with_total = str(args.get("total") or "").strip().lower() in _TRUE
+        limit = None
+        if args.get("limit") not in (None, "") or cursor or with_total:
+            try:
+                limit = int(args.get("limit") or DEFAULT_LIMIT)
+            except ValueError:
+                raise ValueError(f"limit must be 1..{MAX_LIMIT}") from None
+            if not 1 <= limit <= MAX_LIMIT:
+                raise ValueError(f"limit must be 1..{MAX_LIMIT}")
+
+        return cls(
+            spec=spec,
+            sort=sort,
+            desc=desc,
+            limit=limit,
+            cursor=cursor,
+            with_total=with_total,
+            filters=filters,
+            date_from=bounds.get("from"),
+            date_before=bounds.get("to"),
+        )
+
+    @property
+    def paginated(self) -> bool:
+        return self.limit is not None
+
+    @property
+    def _cursor_sort(self) -> str:
+        return f"-{self.sort}" if self.desc else self.sort
+
+    def filtered(self):
+        """Model query with the filters and date range applied (no order)."""
+        spec = self.spec
+        q = spec.model.query
+        for name, values in self.filters.items():
+            q = q.filter(spec.filters[name].in_(values))
+        if self.date_from or self.date_before:
+            col = spec.date_column
+            if col.class_ is not spec.model:
+                q = q.join(col.class_)
+            lo, hi = self.date_from, self.date_before
+            if isinstance(col.type, DateTime):
+                lo = lo and datetime.combine(lo, time.min)
+                hi = hi and datetime.combine(hi, time.min)
+            if lo:
+                q = q.filter(col >= lo)
+            if hi:
+                q = q.filter(col < hi)
+        return q
+
+    def ordered(self):
+        """filtered() after the cursor, in (sort key, id) order."""
+        key = self.spec.sort_keys[self.sort]
+        expr, pk = key.expr, self.spec.model.id
+        q = self.filtered()
+        if self.cursor:
+            value, last_id = decode_cursor(self.cursor, self._cursor_sort)
+            value = _from_json(key.column, value)
+            if self.desc:
+                q = q.filter(or_(expr < value, and_(expr == value, pk < last_id)))
+            else:
+                q = q.filter(or_(expr > value, and_(expr == value, pk > last_id)))
+        direction = "desc" if self.desc else "asc"
+        return q.order_by(getattr(expr, direction)(), getattr(pk, direction)())
+
+    def page(self) -> tuple[list[Any], str | None]:
+        """(rows, next cursor); the whole ordered list when not paginated."""
+        q = self.ordered()
+        if not self.paginated:
+            return q.all(), None
+        rows = q.limit(self.limit + 1).all()
+        if len(rows) <= self.limit:
+            return rows, None
+        last = rows[self.limit - 1]
+        value = _to_json(self.spec.sort_keys[self.sort].value(last))
+        return rows[: self.limit], encode_cursor(self._cursor_sort, value, last.id)
+
+    def total(self) -> int | None:
+        if not self.with_total:
+            return None
+        return self.filtered().order_by(None).count()
+
+    def envelope(self, next_cursor: str | None, total: int | None) -> dict[str, Any]:
+        """Page metadata (everything but items)."""
+        out: dict[str, Any] = {"next_cursor": next_cursor, "limit": self.limit}
+        if self.with_total:
+            out["total"] = total
+        return out
+
+    def payload(self, serialize) -> list[Any] | dict[str, Any]:
+        """Serialized rows: the plain list, or the page envelope with items."""
+        rows, next_cursor = self.page()
+        items = [serialize(r) for r in rows]
+        if not self.paginated:
+            return items
+        return {"items": items, **self.envelope(next_cursor, self.total())}
+
+    def empty(self) -> list[Any] | dict[str, Any]:
+        """The CI-safe fallback body in this query's shape."""
+        if not self.paginated:
+            return []
+        return {"items": [], **self.envelope(None, 0)}
@@ -1,6 +1,14 @@
 from __future__ import annotations
 
-from backend.models.models import PriceSettings, db
+from dataclasses import asdict, dataclass
+from decimal import Decimal
+from typing import Any
+
+from flask import g, has_app_context
+
+from backend.models.models import AppSettings, PriceSettings, db
+
+from .tco_kernel import charging_loss_factor
 
 DEFAULTS = dict(
     el_price_ore_kwh=250,  # öre/kWh
@@ -11,18 +19,91 @@ DEFAULTS = dict(
 )
 
 
+@dataclass(frozen=True)
+class PriceSnapshot:
+    """Detached, read-only copy of PriceSettings(1); duck-types the model row."""
+
+    el_price_ore_kwh: float | None
+    diesel_price_sek_litre: float | None
+    bensin_price_sek_litre: float | None
+    yearly_km: int | None
+    daily_commute_km: int | None
+    downpayment_sek: float | None
+    interest_rate_pct: float | None
+
+    @classmethod
+    def from_row(cls, row: PriceSettings) -> PriceSnapshot:
+        return cls(**row.to_dict())
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass(frozen=True)
+class SettingsSnapshot:
+    """Everything the pricing paths read from the settings tables."""
+
+    prices: PriceSnapshot | None = None
+    tire_change_price_year: Decimal = Decimal(0)
+
+
+_G_KEY = "_settings_snapshot"
+
+
+def _load_snapshot() -> SettingsSnapshot:
+    """CI-safe: missing tables/rows (or no app context) fall back to defaults."""
+    if not has_app_context():
+        return SettingsSnapshot()
+    try:
+        row = db.session.get(PriceSettings, 1)
+        prices = PriceSnapshot.from_row(row) if row is not None else None
+    except Exception:
+        db.session.rollback()
+        prices = None
+    try:
+        app = db.session.get(AppSettings, 1)
+        fee = Decimal(str(app.tire_change_price_year or 0)) if app else Decimal(0)
+    except Exception:
+        db.session.rollback()
+        fee = Decimal(0)
+    return SettingsSnapshot(prices=prices, tire_change_price_year=fee)
+
+
+def settings_snapshot() -> SettingsSnapshot:
+    """
+    Settings for the current request: loaded at most once and kept on flask.g
+    (dropped at teardown and whenever settings are written). Outside an app
+    context there is nothing to read and defaults apply.
+    """
+    if not has_app_context():
+        return _load_snapshot()
+    snap = g.get(_G_KEY)
+    if snap is None:
+        snap = _load_snapshot()
+        setattr(g, _G_KEY, snap)
+    return snap
+
+
+def reset_settings_snapshot(_exc: BaseException | None = None) -> None:
+    """Forget the cached snapshot (teardown hook; call after settings writes)."""
+    if has_app_context():
+        g.pop(_G_KEY, None)
+
+
 def _get_or_create_prices_row() -> PriceSettings:
     ps = PriceSettings.query.get(1)
     if not ps:
         ps = PriceSettings(id=1, **DEFAULTS)
         db.session.add(ps)
         db.session.commit()
+        reset_settings_snapshot()
     return ps
 
 
 def get_prices() -> dict:
-    ps = _get_or_create_prices_row()
-    el_price_sek = (ps.el_price_ore_kwh or 0) / 100.0
+    ps = settings_snapshot().prices or _get_or_create_prices_row()
+    # Effective price per kWh drawn from the grid (includes charging loss)
+    el_price_sek = (ps.el_price_ore_kwh or 0) / 100.0 * charging_loss_factor(ps)
     return {
         "el_price_sek": el_price_sek,
         "el_price_ore_kwh": int(ps.el_price_ore_kwh or DEFAULTS["el_price_ore_kwh"]),
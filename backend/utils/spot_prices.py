@@ -0,0 +1,210 @@
+# backend/utils/spot_prices.py
+"""
+Hourly spot electricity prices and the smart (cheapest-hours) overnight
+charging price derived from them.
+
+The source is a local CSV (or Parquet, if pyarrow/fastparquet is installed)
+with a `timestamp` column and one column per bidding zone (SE1..SE4) in
+öre/kWh. It is parsed once onto a gap-free hourly grid starting at local
+midnight and written next to the source as `<file>.<zone>.npy`; later loads
+memory-map that file (np.load(mmap_mode="r")) until the source changes.
+
+A car plugs in at PLUG_IN_HOUR and leaves at DEPART_HOUR, so each night
+offers the same W-hour window. Sorting every night's window once and
+averaging the prefix sums over the year gives, for any number of charging
+hours h, the mean cost of the h cheapest hours per night. Every car's price
+is then one lookup into those averages (see smart_charging_price).
+"""
+
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+
+ZONES: tuple[str, ...] = ("SE1", "SE2", "SE3", "SE4")
+DEFAULT_ZONE = "SE3"
+
+# Overnight plug-in window (local time): 18:00 -> 07:00 the next morning
+PLUG_IN_HOUR = 18
+DEPART_HOUR = 7
+WINDOW_HOURS = (DEPART_HOUR - PLUG_IN_HOUR) % 24
+
+# AC charging power when the car has no ac_onboard_kw (matches utils.charging)
+DEFAULT_AC_KW = 11.0
+
+
+def _read_frame(path: Path):
+    import pandas as pd
+
+    if path.suffix.lower() in {".parquet", ".pq"}:
+        try:
+            return pd.read_parquet(path)
+        except ImportError as e:
+            raise ValueError(
+                f"reading Parquet needs pyarrow or fastparquet: {e}"
+            ) from e
+    return pd.read_csv(path)
+
+
+def _parse_series(path: Path, zone: str) -> np.ndarray:
+    """Hourly öre/kWh from local midnight of the first day; gaps forward-filled."""
+    import pandas as pd
+
+    df = _read_frame(path)
+    cols = {c.strip().lower(): c for c in df.columns}
+    if "timestamp" not in cols or zone.lower() not in cols:
+        raise ValueError(f"{path.name}: need 'timestamp' and '{zone}' columns")
+    ts = pd.to_datetime(df[cols["timestamp"]], errors="coerce")
+    if ts.dt.tz is not None:
+        ts = ts.dt.tz_localize(None)
+    values = pd.to_numeric(df[cols[zone.lower()]], errors="coerce")
+    s = pd.Series(values.to_numpy(), index=ts)
+    s = s[s.index.notna()].dropna().sort_index()
+    s = s[~s.index.duplicated()]
+    if s.empty:
+        raise ValueError(f"{path.name}: no {zone} prices")
+    hours = pd.date_range(s.index.min().floor("D"), s.index.max().floor("h"), freq="h")
+    s = s.resample("h").mean().reindex(hours).ffill().bfill()
+    return s.to_numpy(dtype=np.float64)
+
+
+def load_series(path: str | os.PathLike, zone: str = DEFAULT_ZONE) -> np.ndarray:
+    """
+    Memory-mapped hourly öre/kWh for `zone`. Converts the source once into a
+    `.npy` sidecar; falls back to an in-memory array if it cannot be written.
+    Raises ValueError for unreadable sources or unknown zones.
+    """
+    zone = zone.upper()
+    if zone not in ZONES:
+        raise ValueError(f"unknown zone {zone!r} (choose from {', '.join(ZONES)})")
+    src = Path(path)
+    if not src.is_file():
+        raise ValueError(f"spot price file not found: {src}")
+    npy = src.with_name(f"{src.name}.{zone}.npy")
+    if npy.is_file() and npy.stat().st_mtime_ns >= src.stat().st_mtime_ns:
+        return np.load(npy, mmap_mode="r")
+
+    arr = _parse_series(src, zone)
+    try:
+        tmp = npy.with_name(npy.name + ".tmp")
+        with open(tmp, "wb") as fh:
+            np.save(fh, arr)
+        os.replace(tmp, npy)
+    except OSError:
+        return arr
+    return np.load(npy, mmap_mode="r")
+
+
+@dataclass(frozen=True)
+class NightProfile:
+    """
+    Year-averaged cheapest-hours costs over the overnight window (öre/kWh):
+    cheapest_sum[k] = mean over nights of the k cheapest hours' price sum,
+    kth_cheapest[k] = mean over nights of the (k+1)-th cheapest hour.
+    """
+
+    source: str
+    zone: str
+    nights: int
+    mean_price: float  # all hours, for energy that does not fit the window
+    cheapest_sum: tuple[float, ...]
+    kth_cheapest: tuple[float, ...]
+    mtime_ns: int = 0
+
+    @property
+    def fingerprint(self) -> str:
+        """Stable across processes (cache keys / ETags)."""
+        return f"{self.source}:{self.zone}:{self.mtime_ns}:{self.nights}"
+
+
+def night_profile(
+    hourly: np.ndarray, source: str = "", zone: str = "", mtime_ns: int = 0
+) -> NightProfile:
+    """Sort every night's window once; average the prefix sums over the year."""
+    hourly = np.asarray(hourly, dtype=np.float64)
+    nights = (len(hourly) - PLUG_IN_HOUR - WINDOW_HOURS) // 24 + 1
+    if nights < 1:
+        raise ValueError("spot price series is shorter than one night")
+    starts = PLUG_IN_HOUR + 24 * np.arange(nights)
+    windows = hourly[starts[:, None] + np.arange(WINDOW_HOURS)]
+    ordered = np.sort(windows, axis=1)
+    prefix = np.concatenate(
+        (np.zeros((nights, 1)), np.cumsum(ordered, axis=1)), axis=1
+    ).mean(axis=0)
+    return NightProfile(
+        source=source,
+        zone=zone,
+        nights=int(nights),
+        mean_price=float(hourly.mean()),
+        cheapest_sum=tuple(prefix.tolist()),
+        kth_cheapest=tuple(ordered.mean(axis=0).tolist()),
+        mtime_ns=mtime_ns,
+    )
+
+
+@lru_cache(maxsize=4)
+def _profile_for(path: str, zone: str, mtime_ns: int) -> NightProfile:
+    return night_profile(
+        load_series(path, zone), source=Path(path).name, zone=zone, mtime_ns=mtime_ns
+    )
+
+
+def load_profile(path: str | os.PathLike, zone: str = DEFAULT_ZONE) -> NightProfile:
+    """Cached per (file, zone, modification time). Raises ValueError."""
+    try:
+        mtime = Path(path).stat().st_mtime_ns
+    except OSError:
+        raise ValueError(f"spot price file not found: {path}") from None
+    return _profile_for(str(path), zone.upper(), mtime)
+
+
+def smart_charging_price(
+    profile: NightProfile, grid_kwh_per_day: np.ndarray, charger_kw: np.ndarray
+) -> np.ndarray:
+    """
+    Mean SEK/kWh when each car charges its daily grid energy in the cheapest
+    hours of every night at its onboard AC power; what does not fit the window
+    is bought at the year's mean price. Vectorized over cars.
+    """
+    kwh = np.asarray(grid_kwh_per_day, dtype=np.float64)
+    kw = np.asarray(charger_kw, dtype=np.float64)
+    kw = np.where(kw > 0, kw, DEFAULT_AC_KW)
+    csum = np.asarray(profile.cheapest_sum)
+    kth = np.asarray(profile.kth_cheapest)
+
+    hours = np.minimum(kwh / kw, float(WINDOW_HOURS))
+    k = np.minimum(np.floor(hours).astype(np.intp), WINDOW_HOURS - 1)
+    frac = hours - k
+    window_ore = (csum[k] + frac * kth[k]) * kw  # öre per night
+    rest_kwh = np.maximum(kwh - hours * kw, 0.0)
+    total_ore = window_ore + rest_kwh * profile.mean_price
+    # no demand -> the price of the cheapest hour (keeps the array finite)
+    per_kwh = np.where(kwh > 0, total_ore / np.where(kwh > 0, kwh, 1.0), kth[0])
+    return per_kwh / 100.0
+
+
+def configured_spot_profile() -> NightProfile | None:
+    """
+    The app's profile when ENERGY_MODE=spot and SPOT_PRICE_FILE is readable.
+    CI-safe: otherwise None (flat el_price_ore_kwh), with a warning on errors.
+    """
+    from flask import current_app, has_app_context
+
+    if not has_app_context():
+        return None
+    cfg = current_app.config
+    if str(cfg.get("ENERGY_MODE") or "flat").lower() != "spot":
+        return None
+    path = cfg.get("SPOT_PRICE_FILE")
+    if not path:
+        current_app.logger.warning("ENERGY_MODE=spot without SPOT_PRICE_FILE")
+        return None
+    try:
+        return load_profile(path, cfg.get("SPOT_PRICE_ZONE") or DEFAULT_ZONE)
+    except ValueError as e:
+        current_app.logger.warning("spot prices unavailable: %s", e)
+        return None
@@ -0,0 +1,74 @@
+# backend/utils/streaming.py
+"""
+Chunked JSON responses for large list endpoints (opt in with ?stream=1).
+
+Items are serialized one at a time with the app's JSON provider and flushed
+in CHUNK_BYTES pieces, so a response never holds more than one chunk plus
+the current item; callers pass generators (e.g. over a yield_per query).
+The bytes match jsonify() in non-debug mode (compact separators, trailing
+newline), so clients cannot tell the modes apart.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator, Mapping
+from typing import Any
+
+from flask import Response, current_app, stream_with_context
+
+CHUNK_BYTES = 64 * 1024
+
+_TRUE = {"1", "true", "yes", "on"}
+
+
+def wants_stream(args: Mapping[str, str]) -> bool:
+    """True for ?stream=1 (or true/yes/on)."""
+    return str(args.get("stream") or "").strip().lower() in _TRUE
+
+
+def _dumps(obj: Any) -> bytes:
+    provider = current_app.json
+    if hasattr(provider, "dumps_bytes"):  # utils.json_provider.OrjsonProvider
+        return provider.dumps_bytes(obj)
+    return provider.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
+def iter_json_array(
+    items: Iterable[Any],
+    *,
+    envelope: dict[str, Any] | None = None,
+    key: str = "items",
+    chunk_bytes: int = CHUNK_BYTES,
+) -> Iterator[bytes]:
+    """
+    JSON text of `list(items)` in chunks. With `envelope`, the array is
+    emitted as `{key: [...], **envelope}` (keys in the provider's order).
+    """
+    if envelope is None:
+        head, tail = b"[", b"]"
+    else:
+        # Serialize the envelope around a placeholder and split on it
+        marker = "\x00items\x00"
+        text = _dumps({key: marker, **envelope})
+        head, tail = text.split(_dumps(marker), 1)
+        head, tail = head + b"[", b"]" + tail
+
+    buf = bytearray(head)
+    sep = b""
+    for item in items:
+        buf += sep
+        buf += _dumps(item)
+        sep = b","
+        if len(buf) >= chunk_bytes:
+            yield bytes(buf)
+            buf.clear()
+    buf += tail + b"\n"
+    yield bytes(buf)
+
+
+def stream_json(items: Iterable[Any], **kwargs: Any) -> Response:
+    """Streamed application/json response for `items` (see iter_json_array)."""
+    return current_app.response_class(
+        stream_with_context(iter_json_array(items, **kwargs)),
+        mimetype="application/json",
+    )
@@ -0,0 +1,448 @@
+# backend/utils/tco_kernel.py
+"""
+The one TCO / energy pricing kernel. Batch-first: cars become NumPy columns
+once (load_columns), then every output is an array over all cars (and
+optionally a grid of price points). routes/cars (compute_derived, the batch,
+sweep, Monte Carlo and Pareto paths), utils.tco and utils.energy all call it.
+
+Pinned semantics (see backend/tests/test_tco_kernel.py):
+  - energy: EV kWh, Diesel/Bensin litres; PHEV splits the daily commute
+    (up to its electric range, 22 commute days/month) onto electricity and the
+    rest of the yearly km onto petrol; P["trip_distribution"] (utils.trips)
+    replaces the fixed commute with a distribution of daily trip lengths
+  - electricity prices are passed in already including the charging loss
+    (charging_loss_factor), which is a price-normalization concern; with
+    P["spot_profile"] (utils.spot_prices) each car instead pays its
+    cheapest-overnight-hours price for the year
+  - tires: (summer + winter) / per-car replacement interval, else the
+    settings' tire lifespan (3 years by default)
+  - insurance: full if > 0, else half
+  - residuals: explicit expected_value_after_Ny, else 55/40/25% of purchase
+  - TCO = depreciation + N * recurring + annuity interest on (price - downpayment)
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from decimal import Decimal
+from typing import Any
+
+import numpy as np
+
+from .spot_prices import NightProfile, smart_charging_price
+from .trips import TripDistribution, electric_km_year
+
+HORIZONS: tuple[int, ...] = (3, 5, 8)
+
+# Type codes used in the column arrays (order matches norm_type outputs)
+EV, PHEV, DIESEL, BENSIN = 0, 1, 2, 3
+_TYPE_CODES = {"EV": EV, "PHEV": PHEV, "Diesel": DIESEL, "Bensin": BENSIN}
+
+# Numeric car fields the model reads (all coerced like to_float)
+NUMERIC_FIELDS: tuple[str, ...] = (
+    "estimated_purchase_price",
+    "consumption_kwh_per_100km",
+    "consumption_l_per_100km",
+    "battery_capacity_kwh",
+    "ac_onboard_kw",
+    "summer_tires_price",
+    "winter_tires_price",
+    "tire_replacement_interval_years",
+    "full_insurance_year",
+    "half_insurance_year",
+    "car_tax_year",
+    "repairs_year",
+)
+
+# Optional explicit residuals and their fallback retention (~45/60/75% depreciation)
+RESIDUAL_FALLBACKS: dict[int, float] = {3: 0.55, 5: 0.40, 8: 0.25}
+
+# PHEV commute split
+COMMUTE_DAYS_PER_MONTH = 22
+ASSUMED_PHEV_EV_RANGE_KM = 40.0
+
+# Charging system losses, applied on top of the electricity price
+CHARGING_LOSS_PCT = 0.10
+
+
+# ---------- scalar coercion (the only copy) ----------
+def to_float(x, d: float = 0.0) -> float:
+    """Float-ish coercion that tolerates Decimal/None/'1,23'."""
+    if x is None:
+        return d
+    if isinstance(x, Decimal):
+        try:
+            return float(x)
+        except Exception:
+            return d
+    try:
+        v = float(x)
+        return v if v == v else d  # NaN guard
+    except Exception:
+        try:
+            v = float(str(x).replace(",", "."))
+            return v if v == v else d
+        except Exception:
+            return d
+
+
+def as_text(x) -> str | None:
+    """Enum -> str, else str(x), preserving None."""
+    if x is None:
+        return None
+    try:
+        v = getattr(x, "value", None) or getattr(x, "name", None)
+        return str(v) if v is not None else str(x)
+    except Exception:
+        return str(x)
+
+
+def norm_type(v: str | None) -> str:
+    """Canonicalize vehicle type to one of: EV, PHEV, Diesel, Bensin."""
+    s = (v or "").strip().lower()
+    if s in {"ev", "bev", "electric"}:
+        return "EV"
+    if s == "phev" or "plug" in s:
+        return "PHEV"
+    if s.startswith("d"):
+        return "Diesel"
+    if s.startswith("b") or "petrol" in s or "gasoline" in s:
+        return "Bensin"
+    # combustion-only and non-plug hybrids run on petrol
+    if s in {"ice", "hev", "hybrid"}:
+        return "Bensin"
+    # default to EV if unknown
+    return "EV"
+
+
+def charging_loss_factor(ps: Any = None) -> float:
+    """1 + charging loss share, applied on top of the electricity price."""
+    loss_pct = getattr(ps, "charging_loss_pct", CHARGING_LOSS_PCT) or CHARGING_LOSS_PCT
+    return 1.0 + float(loss_pct)
+
+
+# ---------- column loading ----------
+def float_column(cars: Sequence[Any], name: str) -> np.ndarray:
+    """
+    One float64 column with to_float semantics (None/NaN -> 0.0).
+    Fast path lets NumPy convert Decimal/int/float; odd inputs fall back to to_float.
+    """
+    raw = [getattr(c, name, None) for c in cars]
+    try:
+        arr = np.array(raw, dtype=np.float64)
+    except (TypeError, ValueError):
+        return np.fromiter((to_float(v) for v in raw), dtype=np.float64, count=len(raw))
+    arr[np.isnan(arr)] = 0.0
+    return arr
+
+
+def type_codes(cars: Sequence[Any]) -> np.ndarray:
+    """EV / PHEV / DIESEL / BENSIN code per car (int8), via norm_type."""
+    memo: dict[Any, int] = {}
+    out = np.empty(len(cars), dtype=np.int8)
+    for i, c in enumerate(cars):
+        raw = getattr(c, "type_of_vehicle", None)
+        code = memo.get(raw)
+        if code is None:
+            code = _TYPE_CODES[norm_type(as_text(raw))]
+            memo[raw] = code
+        out[i] = code
+    return out
+
+
+def _residual_column(cars: Sequence[Any], years: int) -> np.ndarray | None:
+    """Explicit expected_value_after_Ny as floats, NaN where absent; None if no car has it."""
+    name = f"expected_value_after_{years}y"
+    raw = [getattr(c, name, None) for c in cars]
+    if all(v is None for v in raw):
+        return None
+    return np.array(
+        [np.nan if v is None else to_float(v) for v in raw], dtype=np.float64
+    )
+
+
+def load_columns(cars: Sequence[Any]) -> dict[str, np.ndarray]:
+    """
+    Pull every field the TCO model needs out of `cars` once.
+    Works for ORM rows, Row tuples or any attribute-bearing object.
+    """
+    cols = {name: float_column(cars, name) for name in NUMERIC_FIELDS}
+    cols["type_code"] = type_codes(cars)
+    # int(x or 0) truncation of the per-car tire interval
+    cols["tire_replacement_interval_years"] = np.trunc(
+        cols["tire_replacement_interval_years"]
+    )
+    for y in HORIZONS:
+        res = _residual_column(cars, y)
+        if res is not None:
+            cols[f"expected_value_after_{y}y"] = res
+    return cols
+
+
+# ---------- vectorized model ----------
+def _monthly_factor(apr: float, n: int) -> float | None:
+    """Annuity payment per SEK of principal, or None for a zero-rate loan."""
+    r_annual = max(float(apr), 0.0) / 100.0
+    if r_annual <= 0.0:
+        return None
+    r = r_annual / 12.0
+    return r / (1 - (1 + r) ** (-n))
+
+
+def _interest(principal: np.ndarray, apr: Any, years: int) -> np.ndarray:
+    """
+    Vectorized pricing.amortized_totals(...)[1] for a precomputed principal.
+    `apr` is a scalar or an array broadcasting against principal's last axis.
+    """
+    n = max(int(years) * 12, 1)
+    if np.ndim(apr) == 0:
+        factor = _monthly_factor(apr, n)
+        monthly = principal / n if factor is None else principal * factor
+    else:
+        factors = [_monthly_factor(a, n) for a in np.asarray(apr).tolist()]
+        zero_rate = np.array([f is None for f in factors])
+        per_sek = np.array([0.0 if f is None else f for f in factors])
+        monthly = np.where(zero_rate, principal / n, principal * per_sek)
+    total_paid = monthly * n
+    return np.where(principal > 0, total_paid - principal, 0.0)
+
+
+def electric_range_km(cols: dict[str, np.ndarray]) -> np.ndarray:
+    """PHEV electric range: battery / consumption, else the assumed 40 km."""
+    kwh100 = cols["consumption_kwh_per_100km"]
+    batt = cols["battery_capacity_kwh"]
+    has_range = (kwh100 > 0) & (batt > 0)
+    return np.where(
+        has_range,
+        100.0 * batt / np.where(has_range, kwh100, 1.0),
+        ASSUMED_PHEV_EV_RANGE_KM,
+    )
+
+
+def phev_electric_km(
+    cols: dict[str, np.ndarray],
+    km: Any,
+    commute_km: Any,
+    trips: TripDistribution | None = None,
+) -> np.ndarray:
+    """Yearly km a PHEV drives on electricity (<= km); the rest is petrol."""
+    ev_range = electric_range_km(cols)
+    if trips is None:
+        ev_km = np.minimum(
+            np.minimum(commute_km, ev_range) * COMMUTE_DAYS_PER_MONTH, km / 12.0
+        )
+        return np.where(ev_km > 0, ev_km, 0.0) * 12.0
+    return np.minimum(electric_km_year(ev_range, trips), km)
+
+
+def smart_elec_price(
+    cols: dict[str, np.ndarray],
+    *,
+    km: float,
+    commute_km: float,
+    trips: TripDistribution | None,
+    profile: NightProfile,
+    loss: float,
+) -> np.ndarray:
+    """
+    Per-car SEK/kWh (incl. charging loss) when every night's charge is placed
+    in the cheapest overnight spot hours; EVs charge their full yearly km,
+    PHEVs their electric share, both spread evenly over the year.
+    """
+    ev_km = np.where(
+        cols["type_code"] == PHEV, phev_electric_km(cols, km, commute_km, trips), km
+    )
+    grid_kwh_day = ev_km / 100.0 * cols["consumption_kwh_per_100km"] * loss / 365.0
+    return smart_charging_price(profile, grid_kwh_day, cols["ac_onboard_kw"]) * loss
+
+
+def energy_year(
+    cols: dict[str, np.ndarray],
+    *,
+    km100: Any,
+    elec: Any,
+    bensin: Any,
+    diesel: Any,
+    commute_km: Any,
+    trips: TripDistribution | None = None,
+) -> np.ndarray:
+    """
+    Yearly energy/fuel cost per car. A PHEV drives min(commute, electric range)
+    km per commute day on electricity (capped at the yearly km), the rest on
+    petrol; its electric range is battery / consumption, else 40 km. With a
+    trip-length distribution the electric km come from utils.trips instead.
+    """
+    kwh100 = cols["consumption_kwh_per_100km"]
+    l100 = cols["consumption_l_per_100km"]
+    tc = cols["type_code"]
+
+    km = km100 * 100.0
+    ev_km = phev_electric_km(cols, km, commute_km, trips)
+    fuel_km = np.where(km - ev_km > 0, km - ev_km, 0.0)
+    phev = (ev_km / 100.0) * kwh100 * elec + (fuel_km / 100.0) * l100 * bensin
+
+    return np.select(
+        [tc == EV, tc == DIESEL, tc == BENSIN, tc == PHEV],
+        [
+            km100 * kwh100 * elec,
+            km100 * l100 * diesel,
+            km100 * l100 * bensin,
+            phev,
+        ],
+        default=0.0,
+    )
+
+
+def _model(
+    cols: dict[str, np.ndarray],
+    *,
+    km100: Any,
+    elec: Any,
+    bensin: Any,
+    diesel: Any,
+    downpayment: Any,
+    apr: Any,
+    tire_life: float,
+    commute_km: Any,
+    trips: TripDistribution | None = None,
+    horizons: Sequence[int] = HORIZONS,
+) -> dict[str, np.ndarray]:
+    """
+    The TCO model on arrays. Price inputs are scalars, or arrays that
+    broadcast against the car columns (e.g. cars as (N, 1) x grid points as (G,)).
+    Only the per-horizon outputs for `horizons` are priced.
+    """
+    purchase = cols["estimated_purchase_price"]
+    energy_y = energy_year(
+        cols,
+        km100=km100,
+        elec=elec,
+        bensin=bensin,
+        diesel=diesel,
+        commute_km=commute_km,
+        trips=trips,
+    )
+
+    tires_total = cols["summer_tires_price"] + cols["winter_tires_price"]
+    life = cols["tire_replacement_interval_years"]
+    life = np.where(life > 0, life, tire_life)
+    tires_y = np.where(tires_total > 0, tires_total / life, 0.0)
+
+    full = cols["full_insurance_year"]
+    half = cols["half_insurance_year"]
+    insurance_y = np.where(full > 0, full, np.where(half > 0, half, 0.0))
+
+    recurring_y = (
+        energy_y + insurance_y + cols["car_tax_year"] + cols["repairs_year"] + tires_y
+    )
+
+    principal = purchase - downpayment
+    principal = np.where(principal > 0.0, principal, 0.0)
+
+    out: dict[str, np.ndarray] = {
+        "energy_fuel_year": energy_y,
+        "recurring_year": recurring_y,
+    }
+    for y in horizons:
+        residual = purchase * RESIDUAL_FALLBACKS[y]
+        explicit = cols.get(f"expected_value_after_{y}y")
+        if explicit is not None:
+            residual = np.where(np.isnan(explicit), residual, explicit)
+        dep = purchase - residual
+        dep = np.where(dep > 0.0, dep, 0.0)
+        interest = _interest(principal, apr, y)
+        out[f"expected_value_after_{y}y"] = residual
+        out[f"interest_{y}y"] = interest
+        out[f"tco_total_{y}y"] = dep + y * recurring_y + interest
+    return out
+
+
+def _tire_life(P: dict[str, Any]) -> float:
+    return float(int(P.get("tire_lifespan_years", 3)) or 3)
+
+
+def commute_km_per_day(P: dict[str, Any]) -> float:
+    """The prices dict's daily commute (km), 0 when unset."""
+    return float(P.get("daily_commute_km", 30) or 0.0)
+
+
+def derive_arrays(
+    cols: dict[str, np.ndarray], P: dict[str, Any]
+) -> dict[str, np.ndarray]:
+    """
+    The TCO model for a single price point, one array per output (unrounded).
+    `P` is a routes.cars.pricing.normalize_prices()-style dict; with a
+    "spot_profile" the electricity price is the per-car smart-charging price.
+    """
+    km100 = int(P.get("yearly_km", 18000)) / 100.0
+    elec: Any = float(P["elec_sek_kwh"])
+    profile = P.get("spot_profile")
+    if profile is not None:
+        elec = smart_elec_price(
+            cols,
+            km=km100 * 100.0,
+            commute_km=commute_km_per_day(P),
+            trips=P.get("trip_distribution"),
+            profile=profile,
+            loss=float(P.get("charging_loss_factor") or charging_loss_factor()),
+        )
+    return _model(
+        cols,
+        km100=km100,
+        elec=elec,
+        bensin=float(P["bensin_sek_l"]),
+        diesel=float(P["diesel_sek_l"]),
+        downpayment=float(P.get("downpayment_sek", 0.0) or 0.0),
+        apr=float(P.get("interest_rate_pct", 0.0) or 0.0),
+        tire_life=_tire_life(P),
+        commute_km=commute_km_per_day(P),
+        trips=P.get("trip_distribution"),
+    )
+
+
+def derive_tco_grid(
+    cols: dict[str, np.ndarray],
+    P: dict[str, Any],
+    grid: dict[str, np.ndarray],
+    horizons: Sequence[int] = HORIZONS,
+) -> np.ndarray:
+    """
+    TCO for every car at every grid point in one broadcasted pass.
+    `grid` holds normalize_prices()-style keys (elec_sek_kwh, bensin_sek_l,
+    diesel_sek_l, yearly_km, interest_rate_pct, downpayment_sek), each a (G,)
+    array; anything not swept comes from `P`. Returns (cars, G, len(horizons)).
+    Electricity is always the flat price here (the grid sweeps it).
+    """
+    car_cols = {k: v[:, None] for k, v in cols.items()}
+    out = _model(
+        car_cols,
+        km100=np.asarray(grid["yearly_km"], dtype=np.float64) / 100.0,
+        elec=grid["elec_sek_kwh"],
+        bensin=grid["bensin_sek_l"],
+        diesel=grid["diesel_sek_l"],
+        downpayment=grid["downpayment_sek"],
+        apr=grid["interest_rate_pct"],
+        tire_life=_tire_life(P),
+        commute_km=commute_km_per_day(P),
+        trips=P.get("trip_distribution"),
+        horizons=horizons,
+    )
+    return np.stack([out[f"tco_total_{y}y"] for y in horizons], axis=-1)
+
+
+# ---------- rounding ----------
+def round2(arr: np.ndarray) -> list[float]:
+    """
+    Elementwise round(x, 2) with Python's exact (correctly rounded) semantics.
+    rint(x*100)/100 agrees with round() unless x*100 sits within a few ulps of a
+    .5 tie, so only those (rare) entries go through the builtin.
+    """
+    scaled = arr * 100.0
+    out = np.rint(scaled) / 100.0
+    frac = np.abs(scaled - np.trunc(scaled))
+    tie = np.abs(frac - 0.5) <= 1e-9 + np.abs(scaled) * 1e-15
+    tie |= ~np.isfinite(scaled) | (np.abs(scaled) >= 2.0**52)
+    values = out.tolist()
+    for i in np.flatnonzero(tie).tolist():
+        values[i] = round(float(arr[i]), 2)
+    return values
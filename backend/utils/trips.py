@@ -0,0 +1,224 @@
+# backend/utils/trips.py
+"""
+PHEV electric/fuel split from a distribution of daily trip lengths.
+
+A PHEV starts every driving day with a full battery, so on a day with trip
+length d it drives min(d, electric range) km on electricity. Over a year that
+is days_per_year * E[min(D, range)], capped at the yearly km; the rest runs on
+petrol. E[min(D, r)] = integral_0^r P(D > x) dx, which for the supported shapes
+is piecewise quadratic (histogram: uniform within each bin) or piecewise linear
+(samples: point masses), so it is precompiled once per distribution and then
+evaluated for all cars with one searchsorted.
+
+A point mass at the daily commute over 22 days/month reproduces the kernel's
+default commute split exactly.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any
+
+import numpy as np
+
+MAX_BINS = 1_000
+MAX_SAMPLES = 100_000
+DEFAULT_DAYS_PER_YEAR = 264  # 22 driving days x 12 months
+
+
+@dataclass(frozen=True)
+class TripDistribution:
+    """
+    Daily trip lengths: point masses at `points` (samples), or, with
+    `histogram`, bin edges in `points` and the per-bin mass in `weights`.
+    Weights sum to 1. Hashable, so it keys the caches below.
+    """
+
+    points: tuple[float, ...]
+    weights: tuple[float, ...]
+    days_per_year: int = DEFAULT_DAYS_PER_YEAR
+    histogram: bool = False
+
+    @classmethod
+    def commute(cls, km: float, days_per_year: int = DEFAULT_DAYS_PER_YEAR):
+        return cls((float(km),), (1.0,), days_per_year)
+
+    @classmethod
+    def from_samples(cls, samples: Any, days_per_year: int = DEFAULT_DAYS_PER_YEAR):
+        arr = np.asarray(samples, dtype=np.float64).ravel()
+        if arr.size == 0 or arr.size > MAX_SAMPLES:
+            raise ValueError(f"samples: need 1..{MAX_SAMPLES} values")
+        if not np.isfinite(arr).all() or (arr < 0).any():
+            raise ValueError("samples: trip lengths must be finite and >= 0")
+        points, counts = np.unique(arr, return_counts=True)
+        return cls(
+            tuple(points.tolist()),
+            tuple((counts / arr.size).tolist()),
+            days_per_year,
+        )
+
+    @classmethod
+    def from_histogram(
+        cls, edges: Any, counts: Any, days_per_year: int = DEFAULT_DAYS_PER_YEAR
+    ):
+        e = np.asarray(edges, dtype=np.float64).ravel()
+        c = np.asarray(counts, dtype=np.float64).ravel()
+        if e.size < 2 or e.size - 1 > MAX_BINS or c.size != e.size - 1:
+            raise ValueError(
+                f"histogram: need 2..{MAX_BINS + 1} edges and one count per bin"
+            )
+        if not (np.isfinite(e).all() and np.isfinite(c).all()):
+            raise ValueError("histogram: values must be finite")
+        if e[0] < 0 or (np.diff(e) <= 0).any():
+            raise ValueError("histogram: edges must be >= 0 and strictly increasing")
+        if (c < 0).any() or c.sum() <= 0:
+            raise ValueError("histogram: counts must be >= 0 and not all zero")
+        return cls(
+            tuple(e.tolist()), tuple((c / c.sum()).tolist()), days_per_year, True
+        )
+
+    @property
+    def mean_km(self) -> float:
+        return float(_compile(self)[1][-1])
+
+    @property
+    def fingerprint(self) -> str:
+        """Stable across processes (cache keys / ETags)."""
+        return _fingerprint(self)
+
+
+def parse_trip_distribution(spec: Any) -> TripDistribution | None:
+    """
+    {"histogram": {"edges": [...], "counts": [...]}} | {"samples": [...]} |
+    {"commute_km": 30}, each with optional "days_per_year" (1..366).
+    A JSON string is accepted too. None/{} -> None. Raises ValueError.
+    """
+    if isinstance(spec, str):
+        try:
+            spec = json.loads(spec) if spec.strip() else None
+        except json.JSONDecodeError as e:
+            raise ValueError(f"trips: invalid JSON ({e.msg})") from None
+    if not spec:
+        return None
+    if not isinstance(spec, dict):
+        raise ValueError("trips must be an object")
+
+    try:
+        days = int(spec.get("days_per_year", DEFAULT_DAYS_PER_YEAR))
+    except (TypeError, ValueError):
+        raise ValueError("trips.days_per_year must be an integer") from None
+    if not 1 <= days <= 366:
+        raise ValueError("trips.days_per_year must be within 1..366")
+
+    shapes = [k for k in ("histogram", "samples", "commute_km") if k in spec]
+    if len(shapes) != 1:
+        raise ValueError("trips: give exactly one of histogram, samples, commute_km")
+    try:
+        if "histogram" in spec:
+            h = spec["histogram"]
+            if not isinstance(h, dict):
+                raise ValueError("trips.histogram must be an object")
+            return TripDistribution.from_histogram(
+                h.get("edges"), h.get("counts"), days
+            )
+        if "samples" in spec:
+            return TripDistribution.from_samples(spec["samples"], days)
+        km = float(spec["commute_km"])
+    except (TypeError, ValueError) as e:
+        raise ValueError(str(e) or "trips: numbers expected") from None
+    if not np.isfinite(km) or km < 0:
+        raise ValueError("trips.commute_km must be >= 0")
+    return TripDistribution.commute(km, days)
+
+
+@lru_cache(maxsize=32)
+def _fingerprint(dist: TripDistribution) -> str:
+    return hashlib.sha1(repr(dist).encode("utf-8")).hexdigest()
+
+
+@lru_cache(maxsize=32)
+def _compile(dist: TripDistribution) -> tuple[np.ndarray, ...]:
+    """
+    Knots x_k (starting at 0) with, on [x_k, x_k+1): the survival P(D > x_k),
+    its slope, and F(x_k) = E[min(D, x_k)]. Past the last knot F = mean.
+    """
+    w = np.asarray(dist.weights)
+    pts = np.asarray(dist.points)
+    lead = pts[0] > 0  # prepend a 0 knot (no mass before the first point/edge)
+    knots = np.concatenate(([0.0], pts)) if lead else pts
+    width = np.diff(knots)
+    if dist.histogram:
+        mass = np.concatenate(([0.0], w)) if lead else w  # per segment
+        slope = np.concatenate((-mass / width, [0.0]))
+        surv = np.concatenate(([1.0], 1.0 - np.cumsum(mass)))
+    else:
+        slope = np.zeros(len(knots))
+        surv = 1.0 - np.cumsum(w)  # P(D > p_i)
+        surv = np.concatenate(([1.0], surv)) if lead else surv
+    surv = np.clip(surv, 0.0, 1.0)
+    surv[-1] = 0.0
+    seg = surv[:-1] * width + 0.5 * slope[:-1] * width**2
+    F = np.concatenate(([0.0], np.cumsum(seg)))
+    for a in (knots, surv, slope, F):
+        a.setflags(write=False)
+    return knots, F, surv, slope
+
+
+def expected_electric_km_per_day(
+    ranges: np.ndarray, dist: TripDistribution
+) -> np.ndarray:
+    """E[min(D, range)] for every range (any shape)."""
+    knots, F, surv, slope = _compile(dist)
+    r = np.clip(np.asarray(ranges, dtype=np.float64), 0.0, None)
+    k = np.searchsorted(knots, r, side="right") - 1
+    t = r - knots[k]
+    return F[k] + surv[k] * t + 0.5 * slope[k] * t * t
+
+
+@lru_cache(maxsize=64)
+def _electric_km_year_cached(
+    dist: TripDistribution, ranges: bytes, shape: tuple[int, ...]
+) -> np.ndarray:
+    r = np.frombuffer(ranges, dtype=np.float64).reshape(shape)
+    out = dist.days_per_year * expected_electric_km_per_day(r, dist)
+    out.setflags(write=False)
+    return out
+
+
+def electric_km_year(ranges: np.ndarray, dist: TripDistribution) -> np.ndarray:
+    """
+    Yearly electric km per car (uncapped) for the given electric ranges.
+    Memoized per (cars' ranges, distribution), so repeated listings of the
+    same cars are a lookup.
+    """
+    r = np.ascontiguousarray(ranges, dtype=np.float64)
+    return _electric_km_year_cached(dist, r.tobytes(), r.shape)
+
+
+@lru_cache(maxsize=8)
+def _parse_configured(raw: str) -> TripDistribution | None:
+    return parse_trip_distribution(raw)
+
+
+def configured_trip_distribution() -> TripDistribution | None:
+    """
+    The app-wide distribution from PHEV_TRIP_DISTRIBUTION (JSON), if any.
+    CI-safe: no app context or a malformed value -> None (commute model).
+    """
+    from flask import current_app, has_app_context
+
+    if not has_app_context():
+        return None
+    raw = current_app.config.get("PHEV_TRIP_DISTRIBUTION")
+    if not raw:
+        return None
+    if not isinstance(raw, str):
+        raw = json.dumps(raw, sort_keys=True)
+    try:
+        return _parse_configured(raw)
+    except ValueError as e:
+        current_app.logger.warning("ignoring PHEV_TRIP_DISTRIBUTION: %s", e)
+        return None
@@ -0,0 +1,62 @@
+# backend/utils/versions.py
+from __future__ import annotations
+
+from backend.models.models import DataVersion, db
+
+
+def bump(*keys: str) -> None:
+    """
+    Increment the version of each dataset key inside the caller's transaction,
+    so the bump commits (or rolls back) together with the data it describes.
+    CI-safe: a missing table is ignored (caches then simply never hit).
+    """
+    try:
+        with db.session.begin_nested():
+            for key in keys:
+                row = db.session.get(DataVersion, key)
+                if row is None:
+                    db.session.add(DataVersion(key=key, version=1))
+                else:
+                    row.version = DataVersion.version + 1
+    except Exception:
+        pass
+
+
+def get_versions(*keys: str) -> dict[str, int] | None:
+    """Current versions for `keys` (0 if never bumped); None if unavailable."""
+    try:
+        rows = (
+            db.session.query(DataVersion.key, DataVersion.version)
+            .filter(DataVersion.key.in_(keys))
+            .all()
+        )
+    except Exception:
+        db.session.rollback()
+        return None
+    found = {k: int(v or 0) for k, v in rows}
+    return {k: found.get(k, 0) for k in keys}
+
+
+def set_version(key: str, value: int) -> None:
+    """Pin `key` to `value` inside the caller's transaction (e.g. a generation)."""
+    with db.session.begin_nested():
+        row = db.session.get(DataVersion, key)
+        if row is None:
+            db.session.add(DataVersion(key=key, version=value))
+        else:
+            row.version = value
+
+
+def lock_versions(*keys: str) -> dict[str, int]:
+    """
+    get_versions with the rows locked FOR UPDATE until the caller's transaction
+    ends (no-op lock on SQLite), so writers that bump them serialize behind us.
+    """
+    rows = (
+        db.session.query(DataVersion.key, DataVersion.version)
+        .filter(DataVersion.key.in_(keys))
+        .with_for_update()
+        .all()
+    )
+    found = {k: int(v or 0) for k, v in rows}
+    return {k: found.get(k, 0) for k in keys}
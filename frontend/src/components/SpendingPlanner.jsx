@@ -17,7 +17,8 @@ export default function SpendingPlanner() {
   useEffect(() => {
     async function fetchAll() {
       try {
-        const res = await api.get("/months");
+        // totals only: line items are not rendered here
+        const res = await api.get("/months", { params: { view: "summary" } });
         const sortedMonths = (res.data || []).sort(
           (a, b) => new Date(a.name) - new Date(b.name),
         );
@@ -41,8 +42,10 @@ export default function SpendingPlanner() {
 
   const chartData = useMemo(() => {
     return monthsData.map((m) => {
-      const income = sumAmounts(m.incomes || []);
-      const expenses = sumAmounts(m.expenses || []);
+      const income = Number(m.totalIncome ?? sumAmounts(m.incomes || []));
+      const expenses = Number(
+        m.totalExpenses ?? sumAmounts(m.expenses || []),
+      );
 
       // Match planned purchases by month (yyyy-mm)
       const planned = purchases.filter((p) => {
@@ -19,6 +19,7 @@ for attempt in $(seq 1 50); do
   sleep 0.1
 done
 
-# Force recompute for car TCO then warm the endpoint (bust caches)
+# Force recompute for car TCO then warm the endpoint
+# (/api/cars is cached per cars/prices version; the update above invalidates it)
 curl -fsS -X POST "${BASE_URL}/api/cars/update" || true
-curl -fsS "${BASE_URL}/api/cars?ts=$(date +%s%N)" >/dev/null
+curl -fsS "${BASE_URL}/api/cars" >/dev/null